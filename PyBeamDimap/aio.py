@@ -0,0 +1,175 @@
+# Asyncio interface that opens products in a bounded executor with a shared result cache
+import asyncio
+import collections
+import functools
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from .missions import Sentinel1, Sentinel2
+
+# Number of products kept by the default loader
+DEFAULT_CACHE_SIZE = 64
+
+_default_loader = None
+_default_lock = threading.Lock()
+
+
+class AsyncLoader:
+
+    def __init__(self, max_workers=4, cache_size=DEFAULT_CACHE_SIZE, executor=None):
+        """
+        Opens products without blocking the event loop. Parsing runs in a bounded executor, concurrent requests for
+        the same product share one in-flight parse and opened products are kept in a least recently used cache.
+
+        Cached products are shared between all callers and should be treated as read-only. A product is parsed again
+        when the modification time or size of its file changes.
+
+        :param max_workers: Number of threads parsing products at the same time
+        :param cache_size: Number of products kept in the cache. 0 disables the cache but concurrent requests are still
+            shared.
+        :param executor: Optional concurrent.futures executor used instead of an own thread pool. It is not shut down
+            by `close`.
+        """
+        self.cache_size = cache_size
+        self._executor = executor
+        self._owns_executor = executor is None
+        if executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='PyBeamDimap')
+        self._cache = collections.OrderedDict()
+        self._pending = {}
+        self.hits = 0
+        self.misses = 0
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        self.close()
+
+    async def open(self, cls, path, *args, **kwargs):
+        """
+        Open a product with the given class, e.g. ``await loader.open(Sentinel1, 'S1A.dim', 'SLC')``
+
+        :param cls: Product class such as Sentinel1 or Sentinel2
+        :param path: Path of .dim file
+        :param args: Positional arguments passed to the class after the path
+        :param kwargs: Keyword arguments passed to the class
+        """
+        # Resolving and checking the file can block on slow file systems. It runs in the default executor of the loop
+        # so cache hits do not wait behind the parses in the bounded executor.
+        # get_event_loop returns the running loop inside a coroutine. get_running_loop requires Python 3.7.
+        loop = asyncio.get_event_loop()
+        key = await loop.run_in_executor(None, _cache_key, cls, path, args, kwargs)
+        product = self._cache.get(key)
+        if product is not None:
+            self._cache.move_to_end(key)
+            self.hits += 1
+            return product
+
+        # Parses in flight are stored with their loop because futures cannot be awaited from another loop
+        pending_loop, future = self._pending.get(key, (None, None))
+        if future is None or pending_loop is not loop:
+            self.misses += 1
+            future = loop.run_in_executor(self._executor, functools.partial(cls, path, *args, **kwargs))
+            self._pending[key] = (loop, future)
+            future.add_done_callback(functools.partial(self._store, key))
+        # Cancelling one caller must not cancel the parse shared with the other callers
+        return await asyncio.shield(future)
+
+    async def open_sentinel1(self, path, product, **kwargs) -> Sentinel1:
+        """
+        Open a Sentinel-1 product
+
+        :param path: Path of .dim file
+        :param product: Sentinel-1 product type [SLC, GRD, OCN]
+        :param kwargs: Keyword arguments of :class:`PyBeamDimap.missions.Sentinel1`
+        """
+        return await self.open(Sentinel1, path, product, **kwargs)
+
+    async def open_sentinel2(self, path, product_type, **kwargs) -> Sentinel2:
+        """
+        Open a Sentinel-2 product
+
+        :param path: Path of .dim file
+        :param product_type: Sentinel-2 product type [1C, 2A]
+        :param kwargs: Keyword arguments of :class:`PyBeamDimap.missions.Sentinel2`
+        """
+        return await self.open(Sentinel2, path, product_type, **kwargs)
+
+    def cache_info(self) -> dict:
+        """
+        Dict containing the number of cache hits, misses, cached products and parses in flight
+        """
+        return {'hits': self.hits, 'misses': self.misses, 'size': len(self._cache), 'max_size': self.cache_size,
+                'pending': len(self._pending)}
+
+    def clear(self):
+        """
+        Remove all products from the cache
+        """
+        self._cache.clear()
+
+    def close(self):
+        """
+        Clear the cache and shut down the executor if it was created by the loader
+        """
+        self.clear()
+        if self._owns_executor:
+            self._executor.shutdown(wait=False)
+
+    def _store(self, key, future):
+        if self._pending.get(key, (None, None))[1] is future:
+            del self._pending[key]
+        # Failed parses are not cached so the next request tries again
+        if future.cancelled() or future.exception() is not None or self.cache_size <= 0:
+            return
+        self._cache[key] = future.result()
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+
+def get_loader() -> AsyncLoader:
+    """
+    Loader shared by `open_sentinel1` and `open_sentinel2`. It is created on first use with the default settings.
+    """
+    global _default_loader
+    with _default_lock:
+        if _default_loader is None:
+            _default_loader = AsyncLoader()
+        return _default_loader
+
+
+async def open_sentinel1(path, product, **kwargs) -> Sentinel1:
+    """
+    Open a Sentinel-1 product with the shared loader without blocking the event loop
+
+    :param path: Path of .dim file
+    :param product: Sentinel-1 product type [SLC, GRD, OCN]
+    :param kwargs: Keyword arguments of :class:`PyBeamDimap.missions.Sentinel1`
+    """
+    return await get_loader().open_sentinel1(path, product, **kwargs)
+
+
+async def open_sentinel2(path, product_type, **kwargs) -> Sentinel2:
+    """
+    Open a Sentinel-2 product with the shared loader without blocking the event loop
+
+    :param path: Path of .dim file
+    :param product_type: Sentinel-2 product type [1C, 2A]
+    :param kwargs: Keyword arguments of :class:`PyBeamDimap.missions.Sentinel2`
+    """
+    return await get_loader().open_sentinel2(path, product_type, **kwargs)
+
+
+def _cache_key(cls, path, args, kwargs):
+    # Products are identified by their file and its state so changed files are parsed again
+    path = os.path.realpath(path)
+    try:
+        stat = os.stat(path)
+        state = (stat.st_mtime_ns, stat.st_size)
+    except OSError:
+        # Missing files are not cached because the parse fails
+        state = None
+    return cls, path, state, args, tuple(sorted(kwargs.items()))
@@ -0,0 +1,411 @@
+# Indexed catalog of BEAM-DIMAP products for time-series queries without opening every product
+import re
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from .fingerprint import Fingerprint
+from .reader.footprint import load_footprint
+from .reader.utils import import_pandas, parse_utc
+
+# Catalog columns and their dtypes. Missing integers are stored as -1, missing strings as '' and missing times as NaT.
+CATALOG_COLUMNS = {
+    'path': 'str',
+    'name': 'str',
+    'mission': 'str',
+    'product_type': 'str',
+    'acquisition_mode': 'str',
+    'pass': 'str',
+    'rel_orbit': 'int64',
+    'abs_orbit': 'int64',
+    'slice_num': 'int64',
+    'start_time': 'datetime64[us]',
+    'stop_time': 'datetime64[us]',
+    'min_lon': 'float64',
+    'min_lat': 'float64',
+    'max_lon': 'float64',
+    'max_lat': 'float64',
+    'fingerprint': 'str',
+}
+
+# Columns with a sorted secondary index for binary search range queries
+INDEXED_COLUMNS = ['start_time', 'stop_time', 'rel_orbit', 'abs_orbit', 'slice_num']
+
+# Abstracted metadata attributes read into the catalog
+ABSTRACTED_ATTRIBUTES = {
+    'MISSION': 'mission',
+    'PRODUCT_TYPE': 'product_type',
+    'ACQUISITION_MODE': 'acquisition_mode',
+    'PASS': 'pass',
+    'REL_ORBIT': 'rel_orbit',
+    'ABS_ORBIT': 'abs_orbit',
+    'slice_num': 'slice_num',
+    'first_line_time': 'start_time',
+    'last_line_time': 'stop_time',
+}
+
+
+class Catalog:
+
+    def __init__(self, columns):
+        """
+        Column store of product metadata. Products are kept sorted by start time and the integer and time columns
+        carry a sorted index so range queries are binary searches instead of scans over all products.
+
+        :param columns: Dict of column name and array. Missing columns are filled with missing values.
+        """
+        size = max([len(x) for x in columns.values()], default=0)
+        self._columns = {}
+        for name, dtype in CATALOG_COLUMNS.items():
+            values = columns.get(name)
+            if values is None:
+                values = np.full(size, _missing_value(dtype), dtype=_numpy_dtype(dtype))
+            self._columns[name] = np.asarray(values, dtype=_numpy_dtype(dtype))
+
+        order = np.argsort(self._columns['start_time'], kind='stable')
+        self._columns = {name: values[order] for name, values in self._columns.items()}
+        self._indexes = {name: np.argsort(self._columns[name], kind='stable') for name in INDEXED_COLUMNS}
+        self._sorted = {name: self._columns[name][index] for name, index in self._indexes.items()}
+
+    def __len__(self):
+        return len(self._columns['path'])
+
+    def __getitem__(self, column) -> np.ndarray:
+        return self._columns[column]
+
+    def __repr__(self):
+        return f'Catalog(products={len(self)})'
+
+    @property
+    def columns(self) -> list:
+        """
+        Names of the catalog columns
+        """
+        return list(self._columns)
+
+    @classmethod
+    def from_files(cls, paths, workers=None, fingerprint=False):
+        """
+        Build a catalog by reading the product level metadata of BEAM-DIMAP files. Only the header sections and the
+        top level abstracted metadata attributes are parsed, the rest of each file is skipped.
+
+        :param paths: List of .dim file paths
+        :param workers: Number of threads used to read the files. Default None reads them in the caller.
+        :param fingerprint: If True, the content fingerprint of each product is stored in the fingerprint column.
+            This parses the whole of each file.
+        """
+        paths = list(paths)
+        if workers and workers > 1:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                records = list(executor.map(lambda x: read_catalog_record(x, fingerprint), paths))
+        else:
+            records = [read_catalog_record(x, fingerprint) for x in paths]
+        return cls.from_records(records)
+
+    @classmethod
+    def from_records(cls, records):
+        """
+        Build a catalog from a list of dicts keyed by catalog column
+
+        :param records: List of dicts. Missing keys are stored as missing values.
+        """
+        columns = {}
+        for name, dtype in CATALOG_COLUMNS.items():
+            values = [x.get(name) for x in records]
+            if dtype.startswith('datetime64'):
+                columns[name] = np.array(['NaT' if x is None else x for x in values], dtype=dtype)
+            else:
+                missing = _missing_value(dtype)
+                columns[name] = np.array([missing if x is None else x for x in values], dtype=_numpy_dtype(dtype))
+        return cls(columns)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Load a catalog saved with :func:`save`. The sorted indexes are stored in the file so they are not rebuilt.
+
+        :param path: Path of the .npz file
+        """
+        catalog = cls.__new__(cls)
+        with np.load(path, allow_pickle=False) as data:
+            catalog._columns = {name: data[f'column.{name}'] for name in CATALOG_COLUMNS if f'column.{name}' in data}
+            catalog._indexes = {name: data[f'index.{name}'] for name in INDEXED_COLUMNS}
+        # Columns added after the catalog was saved are filled with missing values
+        size = len(catalog._columns['path'])
+        for name, dtype in CATALOG_COLUMNS.items():
+            if name not in catalog._columns:
+                catalog._columns[name] = np.full(size, _missing_value(dtype), dtype=_numpy_dtype(dtype))
+        catalog._sorted = {name: catalog._columns[name][index] for name, index in catalog._indexes.items()}
+        return catalog
+
+    def save(self, path):
+        """
+        Save the catalog and its indexes into an uncompressed .npz file
+
+        :param path: Output path
+        """
+        arrays = {f'column.{name}': values for name, values in self._columns.items()}
+        arrays.update({f'index.{name}': values for name, values in self._indexes.items()})
+        np.savez(path, **arrays)
+
+    def select(self, positions):
+        """
+        Create a new catalog containing a subset of the products
+
+        :param positions: Array of product positions or boolean mask
+        """
+        return Catalog({name: values[positions] for name, values in self._columns.items()})
+
+    def between(self, column, low=None, high=None) -> np.ndarray:
+        """
+        Find products whose value of an indexed column is within an inclusive range. Returns the sorted product
+        positions.
+
+        :param column: Indexed column, one of start_time, stop_time, rel_orbit, abs_orbit or slice_num
+        :param low: Lower bound. Default None is unbounded.
+        :param high: Upper bound. Default None is unbounded.
+        """
+        if column not in self._indexes:
+            raise ValueError(f'Column "{column}" is not indexed. Indexed columns are {INDEXED_COLUMNS}')
+
+        index = self._indexes[column]
+        values = self._sorted[column]
+        start = 0
+        stop = len(values)
+        if low is not None:
+            start = np.searchsorted(values, np.asarray(low, dtype=values.dtype), side='left')
+        if high is not None:
+            stop = np.searchsorted(values, np.asarray(high, dtype=values.dtype), side='right')
+        return np.sort(index[start:stop])
+
+    def query(self, start=None, stop=None, mission=None, pass_direction=None, rel_orbit=None, abs_orbit=None,
+              product_type=None, bbox=None) -> np.ndarray:
+        """
+        Find products matching all given filters. Returns the sorted product positions.
+
+        :param start: Products acquired at or after this time
+        :param stop: Products acquired at or before this time
+        :param mission: Mission name, e.g. SENTINEL-1B
+        :param pass_direction: ASCENDING or DESCENDING
+        :param rel_orbit: Relative orbit (track) number or (low, high) range
+        :param abs_orbit: Absolute orbit number or (low, high) range
+        :param product_type: Product type, e.g. SLC
+        :param bbox: Products whose footprint bounds intersect the bounding box (min_lon, min_lat, max_lon, max_lat)
+        """
+        positions = None
+        if start is not None or stop is not None:
+            positions = _intersect(positions, self.between('start_time', start, stop))
+        for column, value in [('rel_orbit', rel_orbit), ('abs_orbit', abs_orbit)]:
+            if value is None:
+                continue
+            low, high = value if isinstance(value, (tuple, list)) else (value, value)
+            positions = _intersect(positions, self.between(column, low, high))
+
+        if positions is None:
+            positions = np.arange(len(self))
+        for column, value in [('mission', mission), ('pass', pass_direction), ('product_type', product_type)]:
+            if value is not None:
+                positions = positions[self._columns[column][positions] == value]
+        if bbox is not None:
+            min_x, min_y, max_x, max_y = bbox
+            positions = positions[(self._columns['min_lon'][positions] <= max_x) &
+                                  (self._columns['max_lon'][positions] >= min_x) &
+                                  (self._columns['min_lat'][positions] <= max_y) &
+                                  (self._columns['max_lat'][positions] >= min_y)]
+        return positions
+
+    def group_by(self, *columns) -> dict:
+        """
+        Group products by the values of one or more columns. Returns a dict of value tuple and sorted product
+        positions.
+
+        :param columns: Column names
+        """
+        if not columns:
+            raise ValueError('At least one column is required')
+        return _group([self._columns[x] for x in columns])
+
+    def tracks(self) -> dict:
+        """
+        Group products by (mission, pass, relative orbit)
+        """
+        return self.group_by('mission', 'pass', 'rel_orbit')
+
+    def frames(self, tolerance=0.5) -> dict:
+        """
+        Group products by track and frame. Products of a track belong to the same frame when their footprint centre
+        latitudes fall into the same band of `tolerance` degrees. Returns a dict of
+        (mission, pass, relative orbit, frame latitude) and sorted product positions.
+
+        :param tolerance: Width of the latitude bands in degrees
+        """
+        center = (self._columns['min_lat'] + self._columns['max_lat']) / 2
+        bands = np.round(center / tolerance) * tolerance
+        return _group([self._columns['mission'], self._columns['pass'], self._columns['rel_orbit'], bands])
+
+    def duplicates(self) -> dict:
+        """
+        Find products with the same content fingerprint. Returns a dict of fingerprint and sorted product positions
+        for every fingerprint shared by more than one product. Requires a catalog built with `fingerprint=True`.
+        """
+        groups = {}
+        for position, value in enumerate(self._columns['fingerprint']):
+            if value:
+                groups.setdefault(str(value), []).append(position)
+        return {key: np.array(value) for key, value in groups.items() if len(value) > 1}
+
+    def join(self, other, column='fingerprint') -> tuple:
+        """
+        Hash join of two catalogs on a column, e.g. to find the products of a new delivery that are already in the
+        archive. Returns two arrays with the positions of the matching products in this catalog and in `other`.
+        Missing values never match.
+
+        :param other: Catalog joined with this catalog
+        :param column: Join column
+        """
+        table = {}
+        missing = _missing_value(CATALOG_COLUMNS[column])
+        for position, value in enumerate(other[column].tolist()):
+            table.setdefault(value, []).append(position)
+
+        left = []
+        right = []
+        for position, value in enumerate(self._columns[column].tolist()):
+            if value == missing or value != value:
+                continue
+            for match in table.get(value, ()):
+                left.append(position)
+                right.append(match)
+        return np.array(left, dtype='int64'), np.array(right, dtype='int64')
+
+    def dataframe(self):
+        """
+        Dataframe object containing all catalog columns. Requires pandas.
+        """
+        return import_pandas().DataFrame(self._columns)
+
+
+def read_catalog_record(path, fingerprint=False) -> dict:
+    """
+    Read the catalog columns of a BEAM-DIMAP file. The file is parsed incrementally and parsing stops as soon as the
+    top level abstracted metadata attributes have been read.
+
+    :param path: Path of .dim file
+    :param fingerprint: If True, the whole file is parsed and its content fingerprint is computed from the same parser
+        events
+    """
+    record = {'path': str(path)}
+    depth = 0
+    mdelem_path = []
+    root = None
+    start_time = None
+    stop_time = None
+    hasher = Fingerprint() if fingerprint else None
+
+    for event, element in ET.iterparse(path, events=('start', 'end')):
+        if event == 'start':
+            if root is None:
+                root = element
+            depth += 1
+            if element.tag == 'MDElem':
+                mdelem_path.append(element.attrib.get('name'))
+            if hasher is not None:
+                hasher.start(element.tag, element.attrib)
+            continue
+
+        depth -= 1
+        if hasher is not None:
+            if element.text is not None:
+                hasher.data(element.text)
+            hasher.end(element.tag)
+        if element.tag == 'MDElem':
+            mdelem_path.pop()
+            if mdelem_path == ['metadata'] and element.attrib.get('name') == 'Abstracted_Metadata':
+                if hasher is None:
+                    break
+            if len(mdelem_path) >= 2:
+                # Nested sections are not needed and are released while parsing
+                element.clear()
+        elif element.tag == 'MDATTR' and mdelem_path == ['metadata', 'Abstracted_Metadata']:
+            column = ABSTRACTED_ATTRIBUTES.get(element.attrib.get('name'))
+            if column is not None:
+                record[column] = element.text
+        elif element.tag == 'DATASET_NAME' and depth == 2:
+            record['name'] = element.text
+        elif element.tag == 'PRODUCT_SCENE_RASTER_START_TIME':
+            start_time = element.text
+        elif element.tag == 'PRODUCT_SCENE_RASTER_STOP_TIME':
+            stop_time = element.text
+        elif element.tag in ('Image_Interpretation', 'Masks', 'Image_Display') and depth == 1:
+            element.clear()
+
+    if hasher is not None:
+        record['fingerprint'] = hasher.hexdigest()
+
+    # Parsing stops early so the footprint is computed from the partial tree
+    footprint = None if root is None else load_footprint(root)
+    if footprint is not None:
+        record['min_lon'], record['min_lat'], record['max_lon'], record['max_lat'] = footprint.bounds
+
+    record['start_time'] = parse_utc([record.get('start_time') or start_time])[0]
+    record['stop_time'] = parse_utc([record.get('stop_time') or stop_time])[0]
+    for column in ['rel_orbit', 'abs_orbit', 'slice_num']:
+        if record.get(column) is not None:
+            record[column] = int(record[column])
+    if not record.get('mission'):
+        record['mission'] = _mission_from_name(record.get('name') or '')
+    return record
+
+
+def _group(arrays):
+    # Factorize each array and combine the codes into a single key per product
+    codes = []
+    uniques = []
+    for values in arrays:
+        labels, inverse = np.unique(values, return_inverse=True)
+        uniques.append(labels)
+        codes.append(inverse.ravel())
+
+    keys, inverse = np.unique(np.column_stack(codes), axis=0, return_inverse=True)
+    inverse = inverse.ravel()
+    order = np.argsort(inverse, kind='stable')
+    bounds = np.searchsorted(inverse[order], np.arange(len(keys) + 1))
+
+    groups = {}
+    for idx, key in enumerate(keys):
+        label = tuple(_python_value(uniques[col][code]) for col, code in enumerate(key))
+        groups[label] = order[bounds[idx]:bounds[idx + 1]]
+    return groups
+
+
+def _mission_from_name(name):
+    # Product names start with the mission and satellite, e.g. S1B_IW_SLC or S2B_MSIL1C
+    match = re.match(r'S([12])([A-D])_', name)
+    if match is None:
+        return ''
+    return f'SENTINEL-{match[1]}{match[2]}'
+
+
+def _intersect(positions, other):
+    if positions is None:
+        return other
+    return np.intersect1d(positions, other, assume_unique=True)
+
+
+def _numpy_dtype(dtype):
+    return 'U' if dtype == 'str' else dtype
+
+
+def _missing_value(dtype):
+    if dtype == 'str':
+        return ''
+    if dtype == 'int64':
+        return -1
+    if dtype == 'float64':
+        return np.nan
+    return np.datetime64('NaT')
+
+
+def _python_value(value):
+    return value.item() if isinstance(value, np.generic) else value
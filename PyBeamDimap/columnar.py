@@ -0,0 +1,209 @@
+# Long format metadata tables as typed numpy columns and Arrow record batches
+import numpy as np
+
+from .reader.utils import parse_utc, to_float_array
+
+# Columns of the burst table in the order they are exported
+BURST_COLUMNS = ['swath', 'burst', 'first_line', 'last_line', 'azimuth_start', 'azimuth_stop', 'first_pixel_time',
+                 'last_pixel_time', 'first_valid_pixel_time', 'last_valid_pixel_time', 'first_valid_sample',
+                 'last_valid_sample', 'first_valid_line', 'last_valid_line']
+
+# Geolocation grid point elements of the original product annotation and their column names and MDATTR types
+GEOLOCATION_GRID_XPATH = 'Original_Product_Metadata/annotation/*/product/geolocationGrid/**/geolocationGridPoint'
+GEOLOCATION_GRID_COLUMNS = {
+    'azimuthTime': ('azimuth_time', 'utc'),
+    'slantRangeTime': ('slant_range_time', 'float64'),
+    'line': ('line', 'int64'),
+    'pixel': ('pixel', 'int64'),
+    'latitude': ('latitude', 'float64'),
+    'longitude': ('longitude', 'float64'),
+    'height': ('height', 'float64'),
+    'incidenceAngle': ('incidence_angle', 'float64'),
+    'elevationAngle': ('elevation_angle', 'float64'),
+}
+
+# Column names of the baseline attributes
+BASELINE_COLUMNS = {
+    'Perp Baseline': 'perpendicular',
+    'Temp Baseline': 'temporal',
+    'Modelled Coherence': 'modelled_coherence',
+    'Height of Ambiguity': 'height_of_ambiguity',
+    'Doppler Difference': 'doppler_difference',
+}
+
+
+def columns(product, table) -> dict:
+    """
+    Load a metadata table of a Sentinel-1 product in long format. Returns a dict of equal length typed numpy arrays
+    with one row per observation, e.g. one row per orbit state vector or per Doppler coefficient. Times are
+    datetime64[us] and numbers are float64 or integer arrays. Returns empty columns if the product has no such
+    section. This does not require pandas or pyarrow.
+
+    :param product: Sentinel1 object
+    :param table: Table name, one of orbit_state_vectors, doppler_centroid_coeffs, look_directions, baselines, bursts
+        or geolocation_grid
+    """
+    loader = _TABLES.get(table)
+    if loader is None:
+        raise ValueError(f'Table "{table}" is not valid. Valid tables are {list(_TABLES)}')
+    return loader(product)
+
+
+def record_batch(product, table, name=None):
+    """
+    Build an Arrow record batch of a metadata table. Numeric and time columns are passed to Arrow without copying.
+    The first column `product` is dictionary encoded. Requires pyarrow.
+
+    :param product: Sentinel1 object
+    :param table: Table name. See :func:`columns`.
+    :param name: Value of the product column. Default None uses the dataset name of the product.
+    """
+    pa = _import_pyarrow()
+    data = columns(product, table)
+    size = len(next(iter(data.values())))
+    name = product.dataset_name if name is None else name
+
+    arrays = [pa.DictionaryArray.from_arrays(np.zeros(size, dtype='int32'), pa.array([name], pa.string()))]
+    for values in data.values():
+        arrays.append(pa.array(values, from_pandas=values.dtype.kind == 'M'))
+    return pa.RecordBatch.from_arrays(arrays, ['product'] + list(data))
+
+
+def iter_record_batches(products, table, names=None):
+    """
+    Generate one Arrow record batch per product. Products are only accessed when their batch is generated, so
+    `products` can be a generator that opens the products one by one. Requires pyarrow.
+
+    :param products: Iterable of Sentinel1 objects
+    :param table: Table name. See :func:`columns`.
+    :param names: Optional iterable of product column values in the order of `products`
+    """
+    names = iter(names) if names is not None else None
+    for product in products:
+        yield record_batch(product, table, None if names is None else next(names))
+
+
+def to_arrow(products, table, names=None):
+    """
+    Build an Arrow table of a metadata table of many products. Each product is one chunk of the table so the product
+    arrays are not concatenated or copied. Requires pyarrow.
+
+    :param products: Iterable of Sentinel1 objects
+    :param table: Table name. See :func:`columns`.
+    :param names: Optional iterable of product column values in the order of `products`
+    """
+    pa = _import_pyarrow()
+    batches = list(iter_record_batches(products, table, names))
+    if not batches:
+        raise ValueError('At least one product is required')
+    return pa.Table.from_batches(batches)
+
+
+def _orbit_state_vectors(product):
+    orbit = product.AbstractedMetadata.orbit
+    positions = orbit.positions
+    velocities = orbit.velocities
+    return {
+        'time': orbit.times,
+        'x_pos': positions[:, 0].copy(), 'y_pos': positions[:, 1].copy(), 'z_pos': positions[:, 2].copy(),
+        'x_vel': velocities[:, 0].copy(), 'y_vel': velocities[:, 1].copy(), 'z_vel': velocities[:, 2].copy(),
+    }
+
+
+def _doppler_centroid_coeffs(product):
+    # One row per coefficient of each Doppler polynomial
+    metadata = product.AbstractedMetadata
+    times = []
+    slant_range_times = []
+    coefficients = []
+    values = []
+    for item in (metadata.get_section('doppler_centroid_coeffs') or {}).values():
+        for key, value in item.items():
+            if not key.startswith('coefficient'):
+                continue
+            times.append(item.get('zero_doppler_time'))
+            slant_range_times.append(item.get('slant_range_time'))
+            coefficients.append(int(key.split('.')[-1]) if '.' in key else 1)
+            values.append(value)
+    return {
+        'zero_doppler_time': parse_utc(times),
+        'slant_range_time': to_float_array(slant_range_times),
+        'coefficient': np.array(coefficients, dtype='int32'),
+        'value': to_float_array(values),
+    }
+
+
+def _look_directions(product):
+    metadata = product.AbstractedMetadata
+    items = list((metadata.get_section('look_directions') or {}).values())
+    data = {'time': parse_utc([x.get('time') for x in items])}
+    for key in ['head_lat', 'head_lon', 'tail_lat', 'tail_lon']:
+        data[key] = to_float_array([x.get(key) for x in items])
+    return data
+
+
+def _baselines(product):
+    # One row per acquisition pair with at least one baseline value
+    matrix = product.AbstractedMetadata.baseline_matrix
+    names = [] if matrix is None else [x for x in BASELINE_COLUMNS if x in matrix.names]
+    if matrix is None or not names:
+        data = {'reference_date': np.array([], dtype='datetime64[D]'),
+                'secondary_date': np.array([], dtype='datetime64[D]')}
+        data.update({x: np.array([], dtype='float64') for x in BASELINE_COLUMNS.values()})
+        return data
+
+    values = {BASELINE_COLUMNS[x]: matrix.get_matrix(x) for x in names}
+    valid = np.zeros(values[BASELINE_COLUMNS[names[0]]].shape, dtype=bool)
+    for value in values.values():
+        valid |= ~np.isnan(value)
+    np.fill_diagonal(valid, False)
+    rows, cols = np.nonzero(valid)
+
+    data = {'reference_date': matrix.dates[rows], 'secondary_date': matrix.dates[cols]}
+    for column in BASELINE_COLUMNS.values():
+        value = values.get(column)
+        data[column] = value[rows, cols] if value is not None else np.full(len(rows), np.nan)
+    return data
+
+
+def _bursts(product):
+    index = product.AbstractedMetadata.burst_index
+    return {name: np.asarray(getattr(index, name)) for name in BURST_COLUMNS}
+
+
+def _geolocation_grid(product):
+    # Grid points of all annotation files. Each value is assigned to the grid point preceding it in document order,
+    # so points with a missing field get NaN (NaT for times) instead of shifting the other rows.
+    points = product.query_positions(GEOLOCATION_GRID_XPATH)
+    data = {}
+    for name, (column, data_type) in GEOLOCATION_GRID_COLUMNS.items():
+        path = f'{GEOLOCATION_GRID_XPATH}/{name}'
+        values = product.query(path, data_type)
+        rows = np.searchsorted(points, product.query_positions(path)) - 1
+        if np.array_equal(rows, np.arange(len(points))):
+            data[column] = values
+            continue
+        if values.dtype.kind in 'iu':
+            values = values.astype('float64')
+        filled = np.full(len(points), np.datetime64('NaT') if values.dtype.kind == 'M' else np.nan, dtype=values.dtype)
+        filled[rows] = values
+        data[column] = filled
+    return data
+
+
+_TABLES = {
+    'orbit_state_vectors': _orbit_state_vectors,
+    'doppler_centroid_coeffs': _doppler_centroid_coeffs,
+    'look_directions': _look_directions,
+    'baselines': _baselines,
+    'bursts': _bursts,
+    'geolocation_grid': _geolocation_grid,
+}
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow
+    except ImportError:
+        raise ImportError('The pyarrow package is required for Arrow output. Install it with `pip install pyarrow`.')
+    return pyarrow
@@ -0,0 +1,323 @@
+# Conversion of BEAM-DIMAP documents into plain Python structures, JSON and msgpack
+import json
+import math
+import xml.etree.ElementTree as ET
+
+import numpy as np
+
+from .reader.utils import convert_scalars
+
+# Size of the chunks fed to the parser when converting files
+CHUNK_SIZE = 1 << 20
+
+
+def to_dict(source, typed=False) -> dict:
+    """
+    Convert a BEAM-DIMAP document into nested dicts in a single pass. MDElem and MDATTR elements are keyed by their
+    `name` attribute and other elements by their tag. MDATTR elements become dicts with the `value`, `type` and `unit`
+    (when present) of the attribute. Elements with the same key in one parent are collected in a list in document
+    order. XML attributes of other elements are stored with an `@` prefix.
+
+    :param source: Path or binary file object of a .dim file, a parsed ElementTree element or a product object
+    :param typed: If True, numeric MDATTR values are converted to int or float and utc values to ISO 8601 strings
+    """
+    builder = _DictBuilder(typed)
+    return _run(source, builder)
+
+
+def to_json(source, output=None, typed=False, indent=None):
+    """
+    Convert a BEAM-DIMAP document into JSON. Returns the JSON string if `output` is None.
+
+    :param source: Path or binary file object of a .dim file, a parsed ElementTree element or a product object
+    :param output: Optional path or text file object the JSON is written to
+    :param typed: If True, numeric MDATTR values are converted to numbers
+    :param indent: Indentation passed to json.dump
+    """
+    data = to_dict(source, typed)
+    if output is None:
+        return json.dumps(data, indent=indent)
+    if hasattr(output, 'write'):
+        json.dump(data, output, indent=indent)
+    else:
+        with open(output, 'w') as f:
+            json.dump(data, f, indent=indent)
+
+
+def to_msgpack(source, output=None, typed=False):
+    """
+    Convert a BEAM-DIMAP document into msgpack. Requires the optional `msgpack` package. Returns the bytes if `output`
+    is None.
+
+    :param source: Path or binary file object of a .dim file, a parsed ElementTree element or a product object
+    :param output: Optional path or binary file object the msgpack data is written to
+    :param typed: If True, numeric MDATTR values are converted to numbers
+    """
+    msgpack = _import_msgpack()
+    data = msgpack.packb(to_dict(source, typed))
+    if output is None:
+        return data
+    _write_bytes(output, data)
+
+
+def iter_records(source, typed=False):
+    """
+    Stream the values of a BEAM-DIMAP document as flat records. One record is yielded for each MDATTR element and
+    each element containing text, as a dict with the `path` of names (or tags) from the document root, the `value`
+    and for MDATTR elements the `type` and `unit`. Files are parsed in chunks and records are yielded as soon as they
+    are parsed, so neither the XML tree nor the full output is ever held in memory. Trees and products are replayed
+    element by element, so only the output is streamed.
+
+    :param source: Path or binary file object of a .dim file, a parsed ElementTree element or a product object
+    :param typed: If True, numeric MDATTR values are converted to numbers
+    """
+    records = []
+    builder = _RecordBuilder(typed, records.append)
+    for _ in parse_events(source, builder):
+        yield from records
+        records.clear()
+    yield from records
+
+
+def write_records(source, output, output_format='jsonl', typed=False) -> int:
+    """
+    Stream the records of :func:`iter_records` to a file as JSON lines or as consecutive msgpack objects. Returns the
+    number of records written.
+
+    :param source: Path or binary file object of a .dim file, a parsed ElementTree element or a product object
+    :param output: Path or file object. JSON lines are written to text files and msgpack to binary files.
+    :param output_format: Output format [jsonl, msgpack]
+    :param typed: If True, numeric MDATTR values are converted to numbers
+    """
+    if output_format == 'jsonl':
+        encode, mode = (lambda x: json.dumps(x) + '\n'), 'w'
+    elif output_format == 'msgpack':
+        encode, mode = _import_msgpack().Packer().pack, 'wb'
+    else:
+        raise ValueError(f'Output format "{output_format}" is not valid')
+
+    if not hasattr(output, 'write'):
+        with open(output, mode) as f:
+            return write_records(source, f, output_format, typed)
+
+    count = 0
+    for record in iter_records(source, typed):
+        output.write(encode(record))
+        count += 1
+    return count
+
+
+def convert_value(text, data_type):
+    """
+    Convert an MDATTR text value into a JSON compatible Python value using the MDATTR type. Numbers become int or
+    float, utc values become ISO 8601 strings and other types are returned unchanged. Values that cannot be converted
+    are returned unchanged.
+
+    :param text: MDATTR text
+    :param data_type: MDATTR type such as float64, int32, utc or ascii
+    """
+    value = convert_scalars([text], [data_type])[0]
+    if isinstance(value, float) and not math.isfinite(value):
+        # Non-finite values have no JSON representation
+        return text.strip()
+    if isinstance(value, np.datetime64):
+        return str(value)
+    return value
+
+
+class _DictBuilder:
+    # Parser target building the nested dicts of `to_dict` from the start, data and end events
+
+    def __init__(self, typed):
+        self.typed = typed
+        # Each frame holds the tag, attributes, child dict and text parts of an open element
+        self._stack = [[None, {}, {}, []]]
+
+    def start(self, tag, attrib):
+        self._stack[-1][3] = []
+        self._stack.append([tag, attrib, None, []])
+
+    def data(self, data):
+        self._stack[-1][3].append(data)
+
+    def end(self, tag):
+        tag, attrib, children, text = self._stack.pop()
+        text = ''.join(text) if text else None
+
+        if tag == 'MDATTR':
+            key = attrib.get('name')
+            value = {'value': convert_value(text, attrib.get('type')) if self.typed else text,
+                     'type': attrib.get('type')}
+            if attrib.get('unit') is not None:
+                value['unit'] = attrib['unit']
+        elif tag == 'MDElem':
+            key = attrib.get('name')
+            value = children or {}
+        else:
+            key = tag
+            text = text.strip() if text is not None else None
+            if children is None and not attrib:
+                value = text or None
+            else:
+                value = {f'@{name}': item for name, item in attrib.items()}
+                if children:
+                    value.update(children)
+                elif text:
+                    value['#text'] = text
+
+        parent = self._stack[-1]
+        if parent[2] is None:
+            parent[2] = {}
+        _insert(parent[2], key, value)
+
+    def close(self):
+        return self._stack[0][2]
+
+
+class _RecordBuilder:
+    # Parser target emitting one flat record per value instead of building the output
+
+    def __init__(self, typed, emit):
+        self.typed = typed
+        self.emit = emit
+        self._path = []
+        self._text = []
+        self._attrib = None
+        self._leaf = False
+
+    def start(self, tag, attrib):
+        name = attrib.get('name') if tag in ('MDElem', 'MDATTR') else tag
+        self._path.append(name if name is not None else tag)
+        self._text = []
+        self._attrib = attrib
+        # Only elements without children produce records
+        self._leaf = True
+
+    def data(self, data):
+        self._text.append(data)
+
+    def end(self, tag):
+        path = '/'.join(self._path)
+        self._path.pop()
+        if not self._leaf:
+            return
+        self._leaf = False
+        text = ''.join(self._text) if self._text else None
+        self._text = []
+        if tag == 'MDATTR':
+            data_type = self._attrib.get('type')
+            record = {'path': path, 'value': convert_value(text, data_type) if self.typed else text,
+                      'type': data_type}
+            if self._attrib.get('unit') is not None:
+                record['unit'] = self._attrib['unit']
+            self.emit(record)
+        elif text is not None and text.strip():
+            self.emit({'path': path, 'value': text.strip()})
+
+    def close(self):
+        return None
+
+
+def _insert(container, key, value):
+    # Repeated keys are collected in a list
+    if key not in container:
+        container[key] = value
+        return
+    existing = container[key]
+    if isinstance(existing, _Repeated):
+        existing.append(value)
+    else:
+        container[key] = _Repeated([existing, value])
+
+
+class _Repeated(list):
+    # List of elements sharing a key. Distinguishes collected duplicates from list values.
+    pass
+
+
+def _run(source, builder):
+    for _ in parse_events(source, builder):
+        pass
+    return _plain(builder.close())
+
+
+def _plain(data):
+    # Replace the internal list subclass so the output only contains built-in types
+    if isinstance(data, dict):
+        return {key: _plain(value) for key, value in data.items()}
+    if isinstance(data, _Repeated):
+        return [_plain(x) for x in data]
+    return data
+
+
+def parse_events(source, target):
+    """
+    Drive a parser target with the start, data and end events of a document. Files are parsed in chunks and
+    already parsed trees are replayed. The generator yields after each parsed chunk of a file and after each replayed
+    element of a tree so callers can consume the output of the target while parsing.
+
+    :param source: Path or binary file object of a .dim file, a parsed ElementTree element or a product object
+    :param target: Object with the start, data and end methods of an XMLParser target
+    """
+    if hasattr(source, '_metadata'):
+        if source._metadata is None:
+            raise ValueError('Product cannot be converted after the XML tree was released')
+        source = source._metadata
+
+    if hasattr(source, 'tag'):
+        yield from _replay(source, target)
+        return
+
+    parser = ET.XMLParser(target=target)
+    if hasattr(source, 'read'):
+        f = source
+    else:
+        f = open(source, 'rb')
+    try:
+        while True:
+            chunk = f.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            parser.feed(chunk)
+            yield
+        parser.close()
+        yield
+    finally:
+        if f is not source:
+            f.close()
+
+
+def _replay(root, target):
+    # Generate the parser events of an already parsed tree and yield after the end event of each element
+    target.start(root.tag, root.attrib)
+    if root.text is not None:
+        target.data(root.text)
+    stack = [(root, iter(root))]
+    while stack:
+        element, children = stack[-1]
+        child = next(children, None)
+        if child is None:
+            stack.pop()
+            target.end(element.tag)
+            yield
+            continue
+        target.start(child.tag, child.attrib)
+        if child.text is not None:
+            target.data(child.text)
+        stack.append((child, iter(child)))
+
+
+def _import_msgpack():
+    try:
+        import msgpack
+    except ImportError:
+        raise ImportError('The msgpack package is required for msgpack output. Install it with `pip install msgpack`.')
+    return msgpack
+
+
+def _write_bytes(output, data):
+    if hasattr(output, 'write'):
+        output.write(data)
+    else:
+        with open(output, 'wb') as f:
+            f.write(data)
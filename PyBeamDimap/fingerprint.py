@@ -0,0 +1,107 @@
+# Content fingerprints of BEAM-DIMAP products for finding copies of the same product
+import hashlib
+import posixpath
+
+from .export import parse_events
+
+# Elements that differ between copies of the same product and are left out of the fingerprint
+VOLATILE_ELEMENTS = {'DATASET_NAME', 'DATASET_PRODUCER_NAME'}
+
+# MDATTR elements that record when a product was processed
+VOLATILE_ATTRIBUTES = {'PROC_TIME', 'processingTime'}
+
+# Field markers of the canonical form. XML 1.0 does not allow these characters in names, attributes or text.
+_START = b'\x00'
+_ATTRIBUTE = b'\x01'
+_VALUE = b'\x02'
+_TEXT = b'\x03'
+_END = b'\x04'
+
+
+class Fingerprint:
+
+    def __init__(self):
+        """
+        Incremental content hash of a BEAM-DIMAP document. It is an XMLParser target, so the fingerprint is computed
+        from the parser events while the file is read and no tree is needed.
+
+        The canonical form covers the tag, sorted attributes and stripped text of every element. Volatile fields are
+        left out: the dataset name and producer, PROC_TIME and processingTime attributes and the file paths of the
+        processing graph. Band file paths are reduced to their file names. Copies of a product that were renamed,
+        moved or written again therefore have the same fingerprint.
+        """
+        self._hash = hashlib.sha256()
+        # Each frame holds the canonical start of the element until it is known to be a leaf or a container, whether
+        # the element is skipped and whether it is part of the processing graph
+        self._stack = []
+        self._text = []
+
+    def start(self, tag, attrib):
+        parent = self._stack[-1] if self._stack else None
+        if parent is not None and parent[0] is not None:
+            # The parent has children so its start is written now
+            self._hash.update(parent[0])
+            parent[0] = None
+
+        name = attrib.get('name')
+        skip = ((parent is not None and parent[1]) or tag in VOLATILE_ELEMENTS or
+                (tag == 'MDATTR' and name in VOLATILE_ATTRIBUTES))
+        graph = (parent is not None and parent[2]) or (tag == 'MDElem' and name == 'Processing_Graph')
+        header = None if skip else _START + tag.encode() + _attributes(tag, attrib)
+        self._stack.append([header, skip, graph, tag == 'MDATTR' and name])
+        self._text = []
+
+    def data(self, data):
+        self._text.append(data)
+
+    def end(self, tag):
+        header, skip, graph, attribute = self._stack.pop()
+        text = ''.join(self._text).strip() if self._text else ''
+        self._text = []
+        if skip:
+            return
+        if header is None:
+            self._hash.update(_END)
+        elif not (graph and attribute and _is_graph_path(attribute, text)):
+            self._hash.update(header + _TEXT + text.encode() + _END)
+
+    def close(self) -> str:
+        return self.hexdigest()
+
+    def hexdigest(self) -> str:
+        """
+        Fingerprint of the events received so far as a hexadecimal SHA-256 digest
+        """
+        return self._hash.hexdigest()
+
+
+def fingerprint(source) -> str:
+    """
+    Compute the content fingerprint of a BEAM-DIMAP document in a single streaming pass. See :class:`Fingerprint`
+    for the fields that are ignored.
+
+    :param source: Path or binary file object of a .dim file, a parsed ElementTree element or a product object
+    """
+    target = Fingerprint()
+    for _ in parse_events(source, target):
+        pass
+    return target.close()
+
+
+def _attributes(tag, attrib):
+    items = []
+    for key, value in sorted(attrib.items()):
+        if tag == 'DATA_FILE_PATH' and key == 'href':
+            # Band files are stored in a directory named after the product
+            value = posixpath.basename(value.replace('\\', '/'))
+        items.append(_ATTRIBUTE + key.encode() + _VALUE + value.encode())
+    return b''.join(items)
+
+
+def _is_graph_path(name, text):
+    # Read and Write nodes store the input and output paths. Source products are node ids or file paths.
+    if name == 'file':
+        return True
+    if name.startswith('sourceProduct'):
+        return text.startswith('file:') or '/' in text or '\\' in text
+    return False
@@ -0,0 +1,224 @@
+# Zero doppler (range-doppler) geocoding of Sentinel-1 pixels using the orbit and timing in the abstracted metadata
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+# WGS84 ellipsoid
+WGS84_A = 6378137.0
+WGS84_B = 6356752.314245179
+WGS84_E2 = 1 - (WGS84_B / WGS84_A) ** 2
+WGS84_EP2 = (WGS84_A / WGS84_B) ** 2 - 1
+
+
+def geodetic_to_ecef(lat, lon, height=0.0) -> np.ndarray:
+    """
+    Convert WGS84 geodetic coordinates into ECEF coordinates. Returns an array with a trailing axis of size 3.
+
+    :param lat: Array of latitudes in degrees
+    :param lon: Array of longitudes in degrees
+    :param height: Array of ellipsoid heights in metres
+    """
+    lat = np.radians(np.asarray(lat, dtype='float64'))
+    lon = np.radians(np.asarray(lon, dtype='float64'))
+    height = np.asarray(height, dtype='float64')
+
+    n = WGS84_A / np.sqrt(1 - WGS84_E2 * np.sin(lat) ** 2)
+    x = (n + height) * np.cos(lat) * np.cos(lon)
+    y = (n + height) * np.cos(lat) * np.sin(lon)
+    z = (n * (1 - WGS84_E2) + height) * np.sin(lat)
+    return np.stack(np.broadcast_arrays(x, y, z), axis=-1)
+
+
+def ecef_to_geodetic(xyz) -> tuple:
+    """
+    Convert ECEF coordinates into WGS84 geodetic coordinates using Bowring's method. Returns a tuple of
+    (lat, lon, height) arrays with latitude and longitude in degrees.
+
+    :param xyz: Array with a trailing axis of size 3
+    """
+    xyz = np.asarray(xyz, dtype='float64')
+    x, y, z = xyz[..., 0], xyz[..., 1], xyz[..., 2]
+    p = np.hypot(x, y)
+    lon = np.arctan2(y, x)
+
+    # Two Bowring iterations are accurate to well below a millimetre for points near the Earth surface
+    beta = np.arctan2(z * WGS84_A, p * WGS84_B)
+    for _ in range(2):
+        lat = np.arctan2(z + WGS84_EP2 * WGS84_B * np.sin(beta) ** 3, p - WGS84_E2 * WGS84_A * np.cos(beta) ** 3)
+        beta = np.arctan2(WGS84_B * np.sin(lat), WGS84_A * np.cos(lat))
+
+    n = WGS84_A / np.sqrt(1 - WGS84_E2 * np.sin(lat) ** 2)
+    height = p * np.cos(lat) + z * np.sin(lat) - n * (1 - WGS84_E2 * np.sin(lat) ** 2)
+    return np.degrees(lat), np.degrees(lon), height
+
+
+class RangeDopplerGeocoder:
+
+    def __init__(self, abstracted_metadata, workers=None, chunk_size=262144):
+        """
+        Class that geolocates Sentinel-1 pixels by solving the zero doppler, slant range and ellipsoid equations with
+        vectorized Newton iterations. Large inputs are split into chunks that can be solved in a thread pool. The orbit
+        is not extrapolated, targets with an azimuth time outside the span of the orbit state vectors return NaN.
+
+        :param abstracted_metadata: AbstractedMetadata object of the product
+        :param workers: Number of threads used to solve the chunks. Default None solves all chunks in the caller.
+        :param chunk_size: Number of points per chunk
+        """
+        self._orbit = abstracted_metadata.orbit
+        if len(self._orbit) == 0:
+            raise ValueError('Geocoding requires orbit state vectors in the abstracted metadata')
+
+        self.timing = abstracted_metadata.timing
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self.right_looking = abstracted_metadata.get_attribute('antenna_pointing') != 'left'
+
+    def pixel_to_ecef(self, lines, pixels, heights=0.0) -> np.ndarray:
+        """
+        Geolocate image pixels. Returns ECEF coordinates with a trailing axis of size 3.
+
+        :param lines: Array of line numbers
+        :param pixels: Array of pixel numbers
+        :param heights: Array of target heights above the WGS84 ellipsoid in metres
+        """
+        lines, pixels, heights = np.broadcast_arrays(np.asarray(lines, dtype='float64'),
+                                                     np.asarray(pixels, dtype='float64'),
+                                                     np.asarray(heights, dtype='float64'))
+        seconds = self._orbit.to_seconds(self.timing.line_to_time(lines))
+        slant_range = self.timing.pixel_to_slant_range(pixels, lines)
+        return self._map_chunks(self._solve_target, seconds, slant_range, heights)
+
+    def pixel_to_geodetic(self, lines, pixels, heights=0.0) -> tuple:
+        """
+        Geolocate image pixels. Returns a tuple of (lat, lon, height) arrays.
+
+        :param lines: Array of line numbers
+        :param pixels: Array of pixel numbers
+        :param heights: Array of target heights above the WGS84 ellipsoid in metres
+        """
+        return ecef_to_geodetic(self.pixel_to_ecef(lines, pixels, heights))
+
+    def time_range_to_ecef(self, azimuth_time, slant_range, heights=0.0) -> np.ndarray:
+        """
+        Geolocate targets given by zero doppler azimuth time and slant range. Returns ECEF coordinates with a trailing
+        axis of size 3.
+
+        :param azimuth_time: Array of zero doppler azimuth times
+        :param slant_range: Array of one-way slant ranges in metres
+        :param heights: Array of target heights above the WGS84 ellipsoid in metres
+        """
+        seconds, slant_range, heights = np.broadcast_arrays(self._orbit.to_seconds(azimuth_time),
+                                                            np.asarray(slant_range, dtype='float64'),
+                                                            np.asarray(heights, dtype='float64'))
+        return self._map_chunks(self._solve_target, seconds, slant_range, heights)
+
+    def ecef_to_pixel(self, xyz) -> tuple:
+        """
+        Find the image position of ECEF targets. Returns a tuple of (lines, pixels) arrays.
+
+        :param xyz: Array with a trailing axis of size 3
+        """
+        seconds, slant_range = self._ecef_to_seconds_range(xyz)
+        lines = (seconds - self._orbit.to_seconds(self.timing.first_line_time)) / self.timing.line_time_interval
+        return lines, self.timing.slant_range_to_pixel(slant_range, lines)
+
+    def geodetic_to_pixel(self, lat, lon, heights=0.0) -> tuple:
+        """
+        Find the image position of geodetic targets. Returns a tuple of (lines, pixels) arrays.
+
+        :param lat: Array of latitudes in degrees
+        :param lon: Array of longitudes in degrees
+        :param heights: Array of target heights above the WGS84 ellipsoid in metres
+        """
+        return self.ecef_to_pixel(geodetic_to_ecef(lat, lon, heights))
+
+    def ecef_to_time_range(self, xyz) -> tuple:
+        """
+        Find the zero doppler azimuth time and one-way slant range of ECEF targets. Returns a tuple of
+        (azimuth_time, slant_range) arrays.
+
+        :param xyz: Array with a trailing axis of size 3
+        """
+        seconds, slant_range = self._ecef_to_seconds_range(xyz)
+        return self._orbit.from_seconds(seconds), slant_range
+
+    def _ecef_to_seconds_range(self, xyz):
+        xyz = np.asarray(xyz, dtype='float64')
+        shape = xyz.shape[:-1]
+        x, y, z = self._map_chunks(lambda a, b, c: self._solve_zero_doppler(np.stack([a, b, c], axis=-1)),
+                                   xyz[..., 0], xyz[..., 1], xyz[..., 2], out_size=3).reshape(-1, 3).T
+        return x.reshape(shape), y.reshape(shape)
+
+    def _map_chunks(self, func, *arrays, out_size=3):
+        shape = arrays[0].shape
+        flat = [np.ravel(x) for x in arrays]
+        size = flat[0].size
+        bounds = list(range(0, size, self.chunk_size)) or [0]
+
+        def run(start):
+            return func(*[x[start:start + self.chunk_size] for x in flat])
+
+        if self.workers and self.workers > 1 and len(bounds) > 1:
+            # Numpy releases the GIL in the heavy array operations so chunks can be solved in threads
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                results = list(executor.map(run, bounds))
+        else:
+            results = [run(x) for x in bounds]
+
+        return np.concatenate(results).reshape(shape + (out_size,))
+
+    def _solve_target(self, seconds, slant_range, heights, iterations=10, tolerance=1e-4):
+        # Targets outside the span of the orbit state vectors cannot be geolocated without extrapolating the orbit
+        inside = self._orbit.in_span(seconds)
+        if not inside.all():
+            target = np.full(seconds.shape + (3,), np.nan)
+            if inside.any():
+                target[inside] = self._solve_target(seconds[inside], slant_range[inside], heights[inside], iterations,
+                                                    tolerance)
+            return target
+
+        positions, velocities = self._orbit._interpolate_seconds(seconds)
+        a = WGS84_A + heights
+        b = WGS84_B + heights
+
+        target = self._initial_target(positions, velocities, slant_range, heights)
+        for _ in range(iterations):
+            delta = target - positions
+            residuals = np.stack([
+                np.einsum('ij,ij->i', delta, velocities),
+                np.einsum('ij,ij->i', delta, delta) - slant_range ** 2,
+                (target[:, 0] ** 2 + target[:, 1] ** 2) / a ** 2 + target[:, 2] ** 2 / b ** 2 - 1,
+            ], axis=-1)
+            jacobian = np.stack([
+                velocities,
+                2 * delta,
+                np.stack([2 * target[:, 0] / a ** 2, 2 * target[:, 1] / a ** 2, 2 * target[:, 2] / b ** 2], axis=-1),
+            ], axis=1)
+            step = np.linalg.solve(jacobian, -residuals[..., None])[..., 0]
+            target = target + step
+            if np.max(np.abs(step), initial=0) < tolerance:
+                break
+
+        return target
+
+    def _initial_target(self, positions, velocities, slant_range, heights):
+        # Point at the given slant range in the zero doppler plane, assuming a spherical earth with the local radius
+        distance = np.linalg.norm(positions, axis=-1)
+        nadir = -positions / distance[:, None]
+        look = np.cross(velocities, positions)
+        look /= np.linalg.norm(look, axis=-1)[:, None]
+        if not self.right_looking:
+            look = -look
+
+        lat = np.arcsin(positions[:, 2] / distance)
+        radius = np.hypot(WGS84_A ** 2 * np.cos(lat), WGS84_B ** 2 * np.sin(lat)) / \
+            np.hypot(WGS84_A * np.cos(lat), WGS84_B * np.sin(lat)) + heights
+        cos_look = np.clip((distance ** 2 + slant_range ** 2 - radius ** 2) / (2 * distance * slant_range), -1, 1)
+        sin_look = np.sqrt(1 - cos_look ** 2)
+        return positions + slant_range[:, None] * (cos_look[:, None] * nadir + sin_look[:, None] * look)
+
+    def _solve_zero_doppler(self, xyz):
+        seconds = self._orbit.zero_doppler_seconds(xyz, initial=self._orbit.to_seconds(self.timing.first_line_time))
+        positions, _ = self._orbit._interpolate_seconds(seconds)
+        slant_range = np.linalg.norm(xyz - positions, axis=-1)
+        return np.stack([seconds, slant_range, np.zeros_like(seconds)], axis=-1)
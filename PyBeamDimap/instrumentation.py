@@ -0,0 +1,237 @@
+# Opt-in timing and memory instrumentation of the parse phases and section loaders
+import functools
+import threading
+import time
+import tracemalloc
+
+# Reports that are currently recording. Loaders only do extra work when this list is not empty.
+_reports = []
+_lock = threading.Lock()
+
+# Nesting depth of the phases running in each thread
+_state = threading.local()
+
+
+class PhaseRecord:
+    __slots__ = ('name', 'depth', 'wall_time', 'elements', 'allocated')
+
+    def __init__(self, name, depth):
+        """
+        Measurement of one parse phase or section loader
+
+        :param name: Phase name, e.g. parse or abstracted_metadata.burst_boundary
+        :param depth: Nesting depth of the phase. Phases with a larger depth ran inside the previous phase.
+        """
+        self.name = name
+        self.depth = depth
+        self.wall_time = 0.0
+        self.elements = 0
+        self.allocated = None
+
+    def __repr__(self):
+        return f'PhaseRecord(name={self.name!r}, wall_time={self.wall_time:.6f}, elements={self.elements})'
+
+    def to_dict(self) -> dict:
+        """
+        Dict containing the name, depth, wall time in seconds, number of XML elements and net allocated bytes
+        """
+        return {'name': self.name, 'depth': self.depth, 'wall_time': self.wall_time, 'elements': self.elements,
+                'allocated': self.allocated}
+
+
+class Report:
+
+    def __init__(self, callback=None, memory=False):
+        """
+        Collects the phase records measured while it is enabled. Records are stored in the order the phases started.
+
+        :param callback: Optional function called with each PhaseRecord when its phase finishes
+        :param memory: If True, the net allocated bytes of each phase are measured with tracemalloc
+        """
+        self.callback = callback
+        self.memory = memory
+        self.records = []
+        self._started_tracing = False
+
+    def __len__(self):
+        return len(self.records)
+
+    def totals(self) -> dict:
+        """
+        Summed measurements per phase name. Returns a dict of phase name to a dict with the number of calls, wall
+        time, elements and allocated bytes.
+        """
+        totals = {}
+        for record in self.records:
+            total = totals.setdefault(record.name, {'calls': 0, 'wall_time': 0.0, 'elements': 0, 'allocated': None})
+            total['calls'] += 1
+            total['wall_time'] += record.wall_time
+            total['elements'] += record.elements
+            if record.allocated is not None:
+                total['allocated'] = (total['allocated'] or 0) + record.allocated
+        return totals
+
+    def to_dict(self) -> dict:
+        """
+        Machine readable report containing all records and the totals per phase
+        """
+        return {'records': [x.to_dict() for x in self.records], 'totals': self.totals()}
+
+    def dataframe(self):
+        """
+        Dataframe object with one row per phase record. Requires pandas.
+        """
+        from .reader.utils import import_pandas
+        return import_pandas().DataFrame([x.to_dict() for x in self.records],
+                                         columns=['name', 'depth', 'wall_time', 'elements', 'allocated'])
+
+
+def enable(callback=None, memory=False) -> Report:
+    """
+    Start recording the parse phases and section loaders of all products opened from now on. Recording is process
+    wide and products can be opened in several threads. Returns the Report that receives the records until `disable`
+    is called with it.
+
+    :param callback: Optional function called with each PhaseRecord when its phase finishes, e.g. to forward the
+        measurements to a metrics system
+    :param memory: If True, the net allocated bytes of each phase are measured with tracemalloc. This slows down
+        parsing considerably.
+    """
+    report = Report(callback, memory)
+    with _lock:
+        if memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            report._started_tracing = True
+        _reports.append(report)
+    return report
+
+
+def disable(report):
+    """
+    Stop recording into a report
+
+    :param report: Report returned by `enable`
+    """
+    with _lock:
+        if report in _reports:
+            _reports.remove(report)
+        if report._started_tracing:
+            tracemalloc.stop()
+            report._started_tracing = False
+
+
+def is_enabled() -> bool:
+    """
+    Check if any report is recording
+    """
+    return bool(_reports)
+
+
+class record:
+
+    def __init__(self, callback=None, memory=False):
+        """
+        Context manager that records the phases run inside the block and returns the Report
+
+        Example::
+
+            with instrumentation.record() as report:
+                Sentinel1('stack.dim', 'SLC')
+            print(report.totals())
+
+        :param callback: Optional function called with each PhaseRecord when its phase finishes
+        :param memory: If True, the net allocated bytes of each phase are measured with tracemalloc
+        """
+        self._callback = callback
+        self._memory = memory
+        self._report = None
+
+    def __enter__(self) -> Report:
+        self._report = enable(self._callback, self._memory)
+        return self._report
+
+    def __exit__(self, *args):
+        disable(self._report)
+
+
+class phase:
+    __slots__ = ('name', 'metadata', 'xpath', 'record', 'start', 'memory')
+
+    def __init__(self, name, metadata=None, xpath=None):
+        """
+        Context manager that measures a block of code as one phase. Nothing is measured when no report is recording.
+        The record is returned by the context manager (None when disabled) so the element count can be set by the
+        caller.
+
+        :param name: Phase name
+        :param metadata: Optional ElementTree element used to count the elements of the phase
+        :param xpath: XPath of the section below `metadata` whose elements are counted
+        """
+        self.name = name
+        self.metadata = metadata
+        self.xpath = xpath
+        self.record = None
+
+    def __enter__(self):
+        if not _reports:
+            return None
+
+        depth = getattr(_state, 'depth', 0)
+        self.record = PhaseRecord(self.name, depth)
+        if self.metadata is not None:
+            self.record.elements = count_elements(self.metadata, self.xpath)
+        with _lock:
+            for report in _reports:
+                report.records.append(self.record)
+        _state.depth = depth + 1
+
+        self.memory = tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else None
+        self.start = time.perf_counter()
+        return self.record
+
+    def __exit__(self, *args):
+        if self.record is None:
+            return
+        self.record.wall_time = time.perf_counter() - self.start
+        if self.memory is not None and tracemalloc.is_tracing():
+            self.record.allocated = tracemalloc.get_traced_memory()[0] - self.memory
+        _state.depth -= 1
+
+        with _lock:
+            reports = list(_reports)
+        for report in reports:
+            if report.callback is not None:
+                report.callback(self.record)
+
+
+def instrumented(name, xpath=None):
+    """
+    Decorator that measures a section loader method as one phase. The elements of `xpath` below the `_metadata`
+    attribute of the instance are counted. When no report is recording the method is called directly.
+
+    :param name: Phase name
+    :param xpath: XPath of the section read by the loader
+    """
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(self, *args, **kwargs):
+            if not _reports:
+                return function(self, *args, **kwargs)
+            with phase(name, getattr(self, '_metadata', None), xpath):
+                return function(self, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def count_elements(element, xpath=None) -> int:
+    """
+    Count the XML elements of a section including the section element itself. Returns 0 if the section is missing.
+
+    :param element: ElementTree element
+    :param xpath: Optional XPath of the section below `element`
+    """
+    if xpath is not None:
+        element = element.find(xpath)
+    if element is None:
+        return 0
+    return sum(1 for _ in element.iter())
@@ -1,38 +1,59 @@
 from PyBeamDimap.reader.core import BeamDimap
 
+from .instrumentation import phase
 from .reader.abstracted_metadata import AbstractedMetadata
 from .reader.processing_graph import ProcessingGraph
 from .reader.core import ImageInterpretation
+from .reader.slave_metadata import SlaveMetadata
 
 
 class Sentinel1(BeamDimap):
 
-    def __init__(self, metadata: str, product):
+    def __init__(self, metadata: str, product, compact=False, keep_tree=True):
         """
         Read and extracty data from Sentinel-1 BEAM-DIMAP files (.dim)
 
         :param metadata: Path of .dim file
         :param product: Sentinel-1 product type [SLC, GRD, OCN]
+        :param compact: If True, the XML is parsed into compact read-only nodes instead of an ElementTree
+        :param keep_tree: If False, the parsed XML is dropped once all sections are extracted
         """
-        super().__init__(metadata, 'SENTINEL-1')
+        super().__init__(metadata, 'SENTINEL-1', compact)
         self.mission = self._metadata.findall(".//MDATTR[@name='MISSION']")[0].text
 
         # Abstracted metadata sections
-        self.AbstractedMetadata = AbstractedMetadata(self._metadata, product)
+        with phase('abstracted_metadata'):
+            self.AbstractedMetadata = AbstractedMetadata(self._metadata, product)
         self.ProcessingGraph = ProcessingGraph(self._metadata, product)
         self.ImageInterpretation = ImageInterpretation(self._metadata)
+        self.SlaveMetadata = SlaveMetadata(self._metadata)
+
+        if not keep_tree:
+            self.release_tree()
+
+    def release_tree(self):
+        """
+        Extract all data that is loaded on demand and drop the parsed XML tree. Products keep working without the tree
+        but use less memory, which allows many products to be kept open at once.
+        """
+        self.AbstractedMetadata._release()
+        self.ProcessingGraph._release()
+        self.SlaveMetadata._release()
+        super().release_tree()
 
 
 class Sentinel2(BeamDimap):
 
-    def __init__(self, metadata: str, product_type: str):
+    def __init__(self, metadata: str, product_type: str, compact=False, keep_tree=True):
         """
         Read and extracty data from Sentinel-2 BEAM-DIMAP files (.dim)
 
         :param metadata: Path of .dim file
         :param product_type: Sentinel-2 product type [1C, 2A]
+        :param compact: If True, the XML is parsed into compact read-only nodes instead of an ElementTree
+        :param keep_tree: If False, the parsed XML is dropped once all sections are extracted
         """
-        super().__init__(metadata, product_type)
+        super().__init__(metadata, product_type, compact)
 
         # Verify processing level is valid
         self._verify_product_type()
@@ -40,6 +61,16 @@ class Sentinel2(BeamDimap):
         self.mission = self._get_mission()
         self.ProcessingGraph = ProcessingGraph(self._metadata, product_type)
 
+        if not keep_tree:
+            self.release_tree()
+
+    def release_tree(self):
+        """
+        Extract all data that is loaded on demand and drop the parsed XML tree
+        """
+        self.ProcessingGraph._release()
+        super().release_tree()
+
     def _verify_product_type(self):
         valid = ['1C', '2A']
         if self._processing_level not in valid:
@@ -0,0 +1,227 @@
+# Interferometric pair selection (small baseline networks) over stacks of acquisitions
+import numpy as np
+
+from .geocoding import RangeDopplerGeocoder
+from .reader.utils import expand_ranges
+
+
+class PairNetwork:
+
+    def __init__(self, times, perpendicular, names=None):
+        """
+        Acquisitions of a stack with their perpendicular baselines relative to a common reference. Baselines of any
+        pair are derived from these values so all pairs can be evaluated with array operations.
+
+        Acquisitions are sorted by time. Pairs are returned as (i, j) positions with i acquired before j.
+
+        :param times: Array of acquisition times
+        :param perpendicular: Array of perpendicular baselines in metres relative to a common reference acquisition
+        :param names: Optional list of acquisition names
+        """
+        times = np.asarray(times, dtype='datetime64[us]')
+        perpendicular = np.asarray(perpendicular, dtype='float64')
+        if times.shape != perpendicular.shape:
+            raise ValueError('Number of times does not match the number of perpendicular baselines')
+        if names is None:
+            names = [str(x.astype('datetime64[D]')) for x in times]
+        elif len(names) != len(times):
+            raise ValueError('Number of names does not match the number of acquisitions')
+
+        order = np.argsort(times, kind='stable')
+        self._times = times[order]
+        self._perpendicular = perpendicular[order]
+        self._names = [names[x] for x in order]
+
+    def __len__(self):
+        return len(self._times)
+
+    @property
+    def times(self) -> np.ndarray:
+        """
+        Sorted acquisition times
+        """
+        return self._times
+
+    @property
+    def perpendicular(self) -> np.ndarray:
+        """
+        Perpendicular baseline of each acquisition relative to the common reference in metres
+        """
+        return self._perpendicular
+
+    @property
+    def names(self) -> list:
+        """
+        Acquisition names in time order
+        """
+        return list(self._names)
+
+    @classmethod
+    def from_baseline_matrix(cls, baseline_matrix, reference=0):
+        """
+        Create a network from the Baselines section of a coregistered stack
+
+        :param baseline_matrix: BaselineMatrix object, e.g. `AbstractedMetadata.baseline_matrix`
+        :param reference: Matrix index of the acquisition used as common reference
+        """
+        row = baseline_matrix.perpendicular[reference].copy()
+        # Fall back to the reversed pair when a reference row entry is missing
+        missing = np.isnan(row)
+        row[missing] = -baseline_matrix.perpendicular[missing, reference]
+        row[reference] = 0.0
+        return cls(baseline_matrix.dates, row)
+
+    @classmethod
+    def from_stack(cls, product, line=None, pixel=None):
+        """
+        Create a network from the orbits of a coregistered Sentinel-1 stack. The perpendicular baseline of each
+        secondary acquisition is computed at one ground point from the zero doppler satellite positions. The sign
+        follows the SNAP Baselines section.
+
+        :param product: Sentinel1 object of a stack with Slave_Metadata
+        :param line: Line of the ground point. Default None uses the centre of the scene.
+        :param pixel: Pixel of the ground point. Default None uses the centre of the scene.
+        """
+        metadata = product.AbstractedMetadata
+        timing = metadata.timing
+        line = timing.num_lines / 2 if line is None else line
+        pixel = timing.num_samples / 2 if pixel is None else pixel
+        height = float(metadata.get_attribute('avg_scene_height'))
+        target = RangeDopplerGeocoder(metadata).pixel_to_ecef(line, pixel, height).reshape(1, 3)
+
+        reference_position, reference_velocity = _zero_doppler_state(metadata.orbit, target)
+        look = target[0] - reference_position
+        look /= np.linalg.norm(look)
+        normal = np.cross(look, reference_velocity)
+        normal /= np.linalg.norm(normal)
+
+        times = [timing.first_line_time]
+        perpendicular = [0.0]
+        names = [metadata.get_attribute('PRODUCT')]
+        for acquisition in product.SlaveMetadata:
+            orbit = acquisition.orbit_state_vectors
+            if len(orbit) == 0:
+                continue
+            position, _ = _zero_doppler_state(orbit, target)
+            times.append(acquisition.first_line_time)
+            perpendicular.append(float(np.dot(position - reference_position, normal)))
+            names.append(acquisition.name)
+
+        # Stacks can carry a copy of the reference acquisition in Slave_Metadata
+        times, first = np.unique(np.array(times, dtype='datetime64[us]'), return_index=True)
+        return cls(times, np.array(perpendicular)[first], [names[x] for x in first])
+
+    def temporal_baselines(self, pairs) -> np.ndarray:
+        """
+        Temporal baseline of pairs in days
+
+        :param pairs: Array of shape (pairs, 2) containing acquisition positions
+        """
+        pairs = np.asarray(pairs, dtype='int64').reshape(-1, 2)
+        delta = self._times[pairs[:, 1]] - self._times[pairs[:, 0]]
+        return delta.astype('int64') / 86400e6
+
+    def perpendicular_baselines(self, pairs) -> np.ndarray:
+        """
+        Perpendicular baseline of pairs in metres
+
+        :param pairs: Array of shape (pairs, 2) containing acquisition positions
+        """
+        pairs = np.asarray(pairs, dtype='int64').reshape(-1, 2)
+        return self._perpendicular[pairs[:, 1]] - self._perpendicular[pairs[:, 0]]
+
+    def select(self, max_temporal=None, max_perpendicular=None, min_temporal=None, max_neighbours=None,
+               connected=True) -> np.ndarray:
+        """
+        Select interferometric pairs. Candidates are generated from a sliding window over the time sorted
+        acquisitions so only pairs within the temporal limit are ever evaluated. Returns an array of shape (pairs, 2)
+        sorted by the first and second acquisition.
+
+        :param max_temporal: Maximum temporal baseline in days
+        :param max_perpendicular: Maximum absolute perpendicular baseline in metres
+        :param min_temporal: Minimum temporal baseline in days
+        :param max_neighbours: Maximum number of following acquisitions each acquisition is paired with
+        :param connected: If True, pairs between consecutive acquisitions are added where needed so every
+            acquisition is connected to the network
+        """
+        size = len(self)
+        if size < 2:
+            return np.empty((0, 2), dtype='int64')
+
+        # Last acquisition each acquisition can be paired with
+        positions = np.arange(size)
+        stop = np.full(size, size, dtype='int64')
+        if max_temporal is not None:
+            limit = self._times + np.timedelta64(int(round(max_temporal * 86400e6)), 'us')
+            stop = np.searchsorted(self._times, limit, side='right')
+        if max_neighbours is not None:
+            stop = np.minimum(stop, positions + 1 + max_neighbours)
+
+        count = np.maximum(stop - positions - 1, 0)
+        first = np.repeat(positions, count)
+        second = expand_ranges(positions + 1, count)
+        pairs = np.column_stack([first, second])
+
+        mask = np.ones(len(pairs), dtype=bool)
+        if max_perpendicular is not None:
+            mask &= np.abs(self.perpendicular_baselines(pairs)) <= max_perpendicular
+        if min_temporal is not None:
+            mask &= self.temporal_baselines(pairs) >= min_temporal
+        pairs = pairs[mask]
+
+        if connected:
+            pairs = self._connect(pairs)
+        return pairs
+
+    def components(self, pairs) -> np.ndarray:
+        """
+        Label the connected components of a network. Returns the component label of each acquisition, where the label
+        is the position of the earliest acquisition of the component.
+
+        :param pairs: Array of shape (pairs, 2) containing acquisition positions
+        """
+        pairs = np.asarray(pairs, dtype='int64').reshape(-1, 2)
+        labels = np.arange(len(self))
+        # Propagate the smallest label over the edges until nothing changes
+        while len(pairs):
+            updated = labels.copy()
+            np.minimum.at(updated, pairs[:, 0], labels[pairs[:, 1]])
+            np.minimum.at(updated, pairs[:, 1], labels[pairs[:, 0]])
+            # Pointer jumping shortens long chains
+            updated = updated[updated]
+            if np.array_equal(updated, labels):
+                break
+            labels = updated
+        return labels
+
+    def _connect(self, pairs):
+        labels = self.components(pairs)
+        if np.all(labels == labels[0]):
+            return pairs
+
+        # Bridge components with pairs between consecutive acquisitions. The few bridges are merged with a small
+        # union-find so no redundant bridges are added.
+        parent = {int(x): int(x) for x in np.unique(labels)}
+
+        def find(x):
+            while parent[x] != x:
+                parent[x] = parent[parent[x]]
+                x = parent[x]
+            return x
+
+        bridges = []
+        for idx in np.flatnonzero(labels[:-1] != labels[1:]):
+            a, b = find(int(labels[idx])), find(int(labels[idx + 1]))
+            if a != b:
+                parent[max(a, b)] = min(a, b)
+                bridges.append((idx, idx + 1))
+
+        pairs = np.vstack([pairs, np.array(bridges, dtype='int64').reshape(-1, 2)])
+        return pairs[np.lexsort((pairs[:, 1], pairs[:, 0]))]
+
+
+def _zero_doppler_state(orbit, target):
+    seconds = orbit.zero_doppler_seconds(target)
+    positions, velocities = orbit._interpolate_seconds(seconds)
+    return positions[0], velocities[0]
+
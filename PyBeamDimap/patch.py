@@ -0,0 +1,197 @@
+# Streaming rewrite of BEAM-DIMAP documents that replaces the values of selected elements
+import itertools
+import os
+import re
+import shutil
+import tempfile
+from xml.parsers import expat
+
+from .reader.query import SEPARATOR, compile_path
+
+# Size of the chunks read from the source file
+CHUNK_SIZE = 1 << 20
+
+# Start tag of an element. Attribute values are quoted and cannot contain `<`, but they can contain `>`.
+START_TAG = re.compile(rb'<[^\s/>]+(?:\s+[^\s=/>]+\s*=\s*(?:"[^"]*"|\'[^\']*\'))*\s*(/?)>')
+
+# Name path of the metadata section. Paths below it can also be given relative to it, as in `BeamDimap.query`.
+METADATA_PATH = ['Dataset_Sources', 'metadata']
+
+
+def patch(source, edits, output=None) -> dict:
+    """
+    Replace the values of elements of a BEAM-DIMAP file in a single streaming pass. Only the text of the matched
+    elements changes, all other bytes are copied verbatim. The result is written to a temporary file next to the
+    output which then replaces the output, so readers never see a partially written file.
+
+    Edits are keyed by name paths. MDElem and MDATTR elements are named by their `name` attribute and other elements
+    by their tag. Paths start below the document root, e.g. `Image_Interpretation/Spectral_Band_Info/BAND_DESCRIPTION`,
+    and paths of metadata attributes can also start below the metadata section, e.g. `Abstracted_Metadata/PASS`. The
+    wildcards of :func:`PyBeamDimap.reader.core.BeamDimap.query` are supported. A single value is written to all
+    matching elements and a list of values is written to the matching elements in document order.
+
+    Example: ``patch('S1A.dim', {'Abstracted_Metadata/PASS': 'ASCENDING'})``
+
+    :param source: Path of .dim file
+    :param edits: Dict of name path and new value or list of new values
+    :param output: Optional path of the patched file. Default None replaces the source file.
+    :return: Dict of name path and number of patched elements
+    """
+    output = source if output is None else output
+    patcher = _Patcher(edits)
+    directory, name = os.path.split(os.path.abspath(output))
+    fd, temp_path = tempfile.mkstemp(prefix=f'.{name}.', suffix='.tmp', dir=directory)
+    try:
+        with os.fdopen(fd, 'wb') as f, open(source, 'rb') as src:
+            patcher.run(src, f)
+            f.flush()
+            os.fsync(f.fileno())
+        shutil.copymode(source, temp_path)
+        os.replace(temp_path, output)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+    return patcher.counts()
+
+
+class _Edit:
+    __slots__ = ('path', 'compiled', 'values', 'count')
+
+    def __init__(self, path, value):
+        self.path = path
+        self.compiled = compile_path(path)
+        self.values = value
+        self.count = 0
+
+    def next_value(self):
+        if isinstance(self.values, (list, tuple)):
+            if self.count >= len(self.values):
+                raise ValueError(f'Path "{self.path}" matches more than {len(self.values)} elements')
+            value = self.values[self.count]
+        else:
+            value = self.values
+        self.count += 1
+        return '' if value is None else str(value)
+
+    def check(self):
+        if self.count == 0:
+            raise ValueError(f'Path "{self.path}" not found')
+        if isinstance(self.values, (list, tuple)) and self.count != len(self.values):
+            raise ValueError(f'Path "{self.path}" matches {self.count} elements but {len(self.values)} values were '
+                             f'given')
+
+
+class _Patcher:
+
+    def __init__(self, edits):
+        # Edits are grouped by the name their paths end with so most elements are not matched against any path
+        self._edits = [_Edit(path, value) for path, value in edits.items()]
+        self._by_leaf = {}
+        self._wildcards = []
+        for edit in self._edits:
+            if edit.compiled.leaf is None:
+                self._wildcards.append(edit)
+            else:
+                self._by_leaf.setdefault(edit.compiled.leaf, []).append(edit)
+
+        self._parser = None
+        self._output = None
+        self._encoding = 'utf-8'
+        self._names = []
+        self._buffer = bytearray()
+        self._offset = 0
+        # Position of the last reported element. Bytes before it can be written because no later event refers to them.
+        self._last = 0
+        self._match = None
+
+    def run(self, src, output):
+        self._output = output
+        self._parser = parser = expat.ParserCreate()
+        parser.XmlDeclHandler = self._declaration
+        parser.StartElementHandler = self._start
+        parser.EndElementHandler = self._end
+        while True:
+            chunk = src.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            self._buffer += chunk
+            parser.Parse(chunk, False)
+            self._copy(self._last if self._match is None else self._match[1])
+        parser.Parse(b'', True)
+        self._copy(self._offset + len(self._buffer))
+        for edit in self._edits:
+            edit.check()
+
+    def counts(self) -> dict:
+        return {x.path: x.count for x in self._edits}
+
+    def _declaration(self, version, encoding, standalone):
+        if encoding:
+            self._encoding = encoding
+
+    def _start(self, tag, attrib):
+        position = self._parser.CurrentByteIndex
+        self._last = position
+        if self._match is not None:
+            raise ValueError(f'Element "{self._match[0].path}" contains child elements and cannot be patched')
+        name = attrib.get('name', tag) if tag in ('MDElem', 'MDATTR') else tag
+        self._names.append(name)
+        if len(self._names) < 2:
+            return
+
+        edit = self._find_edit(name)
+        if edit is not None:
+            self._match = (edit, position)
+
+    def _end(self, tag):
+        position = self._parser.CurrentByteIndex
+        self._last = position
+        self._names.pop()
+        if self._match is None:
+            return
+
+        edit, start = self._match
+        self._match = None
+        value = edit.next_value().replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+        value = value.encode(self._encoding, 'xmlcharrefreplace')
+        tag_match = START_TAG.match(self._buffer, start - self._offset)
+        tag_end = self._offset + tag_match.end()
+        start_tag = tag_match.group(0)
+        if tag_match.group(1):
+            # Empty elements such as <BAND_DESCRIPTION /> are written with a start and end tag
+            start_tag = start_tag[:-2].rstrip()
+            self._copy(start)
+            self._output.write(start_tag + b'>' + value + b'</' + tag.encode(self._encoding) + b'>')
+            self._skip(tag_end)
+        else:
+            self._copy(tag_end)
+            self._output.write(value)
+            self._skip(position)
+
+    def _find_edit(self, name):
+        candidates = self._by_leaf.get(name)
+        if candidates is None and not self._wildcards:
+            return None
+        path = SEPARATOR.join(self._names[1:])
+        relative = None
+        if self._names[1:3] == METADATA_PATH and len(self._names) > 3:
+            relative = SEPARATOR.join(self._names[3:])
+        for edit in itertools.chain(candidates or (), self._wildcards):
+            match = edit.compiled.regex.fullmatch
+            if match(path) or (relative is not None and match(relative)):
+                return edit
+        return None
+
+    def _copy(self, position):
+        # Write the buffered bytes before an absolute position
+        size = position - self._offset
+        if size > 0:
+            self._output.write(self._buffer[:size])
+            self._skip(position)
+
+    def _skip(self, position):
+        # Drop the buffered bytes before an absolute position without writing them
+        size = position - self._offset
+        if size > 0:
+            del self._buffer[:size]
+            self._offset = position
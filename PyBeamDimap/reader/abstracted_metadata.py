@@ -1,7 +1,27 @@
 import re
 # import xml.etree.ElementTree as ET
 
-import pandas as pd
+import numpy as np
+
+from ..instrumentation import instrumented
+from .baselines import BaselineMatrix
+from .burst_index import BurstIndex
+from .orbit import OrbitStateVectors
+from .srgr import SrgrCoefficients
+from .timing import RadarTiming, load_subsampling
+from .utils import ABSTRACTED_METADATA_XPATH, convert_scalars, import_pandas, to_float_array
+
+
+# Columns of the abstracted metadata dataframe
+DATAFRAME_COLUMNS = ['Name', 'Value', 'Type', 'Description']
+
+# Repeated sections that are returned by `get_section`
+SECTIONS = ['orbit_state_vectors', 'orbit_offsets', 'srgr_coeffs', 'look_directions', 'doppler_centroid_coeffs',
+            'baselines']
+
+
+def _section_xpath(name):
+    return f'{ABSTRACTED_METADATA_XPATH}/MDElem[@name="{name}"]'
 
 
 class AbstractedMetadata:
@@ -14,32 +34,77 @@ class AbstractedMetadata:
         :param product: Sentinel-1 Product type
         """
         self._metadata = metadata
-        self._target_xpath = './/MDElem[@name="Abstracted_Metadata"]'
-        # Dataframe does not include nested elements in the abstracted metadata section
-        self._dataframe = self._load_dataframe()
+        self._target_xpath = ABSTRACTED_METADATA_XPATH
+        # Attributes do not include nested elements in the abstracted metadata section
+        self._attributes = self._load_attributes()
+        # Position of each attribute name. Repeated names resolve to their first element.
+        self._positions = {}
+        for idx, name in enumerate(self._attributes['Name']):
+            self._positions.setdefault(name, idx)
+        self._record = None
+        # Sections are stored as dicts and converted into dataframes when first accessed
+        self._dataframes = {}
         self._product = product
         self._orbit_state_vectors = self._load_orbit_state_vectors()
+        self._orbit = self._load_orbit()
         self._doppler_centroid_coeffs = self._load_doppler_centroid_coeffs()
         self._baselines = self._load_baselines()
+        self._baseline_matrix = self._load_baseline_matrix()
         self._srgr_coeffs = self._load_srgr_coeffs()
+        self._srgr = self._load_srgr()
         self._look_directions = self._load_look_direction_list()
         self._esd_measurement = EsdMeasurement(self._metadata, self._product)
         self._burst_boundary = self._load_burst_boundary()
+        self._burst_index = BurstIndex(self._metadata)
         self._orbit_offsets = self._load_orbit_offsets()
+        self._timing = None
+        self._subsampling = None
 
     @property
-    def dataframe(self) -> pd.DataFrame:
+    def dataframe(self):
         """
-        Dataframe object containing all non-nested abstracted metadata elements
+        Dataframe object containing all non-nested abstracted metadata elements. Requires pandas.
         """
-        return self._dataframe
+        return self._get_dataframe('dataframe', {x: self._attributes[x] for x in DATAFRAME_COLUMNS})
 
     @property
     def burst_boundary(self):
         """
         Dataframe object containing burst boundary data
         """
-        return self._burst_boundary
+        return self._get_dataframe('burst_boundary', self._burst_boundary)
+
+    @property
+    def attributes(self) -> dict:
+        """
+        Dict of name and text value of all non-nested abstracted metadata elements. Unlike `dataframe` this does not
+        require pandas.
+        """
+        return dict(zip(reversed(self._attributes['Name']), reversed(self._attributes['Value'])))
+
+    @property
+    def record(self) -> 'AttributeRecord':
+        """
+        Typed record of all non-nested abstracted metadata elements. Values are converted using their MDATTR type and
+        the record is cheap to pickle.
+        """
+        if self._record is None:
+            names = self._attributes['Name']
+            positions = [self._positions[x] for x in dict.fromkeys(names)]
+            self._record = AttributeRecord(
+                tuple(names[x] for x in positions),
+                tuple(convert_scalars([self._attributes['Value'][x] for x in positions],
+                                      [self._attributes['Type'][x] for x in positions])),
+                tuple(self._attributes['Type'][x] for x in positions),
+                tuple(self._attributes['Unit'][x] for x in positions))
+        return self._record
+
+    @property
+    def burst_index(self) -> BurstIndex:
+        """
+        Burst index with typed burst timing, line ranges, valid sample ranges and boundary polygons per swath and burst
+        """
+        return self._burst_index
 
     @property
     def EsdMeasurement(self):
@@ -49,65 +114,147 @@ class AbstractedMetadata:
         return self._esd_measurement
 
     @property
-    def orbit_state_vectors(self) -> pd.DataFrame:
+    def orbit_state_vectors(self):
         """
         Dataframe object containing orbit state vectors
         """
-        return self._orbit_state_vectors
+        return self._get_dataframe('orbit_state_vectors', self._orbit_state_vectors)
 
     @property
-    def orbit_offsets(self) -> pd.DataFrame:
+    def orbit(self) -> OrbitStateVectors:
+        """
+        Typed orbit state vectors with times, positions and velocities as numpy arrays
+        """
+        return self._orbit
+
+    @property
+    def orbit_offsets(self):
         """
         Dataframe object contaning orbit offsets
         """
-        return self._orbit_offsets
+        return self._get_dataframe('orbit_offsets', self._orbit_offsets)
 
     @property
-    def srgr_coeffs(self) -> pd.DataFrame:
+    def srgr_coeffs(self):
         """
         Dataframe object containing slant range to ground range (SRGR) coefficients
         """
-        return self._srgr_coeffs
+        return self._get_dataframe('srgr_coeffs', self._srgr_coeffs)
+
+    @property
+    def srgr(self) -> SrgrCoefficients:
+        """
+        Typed SRGR polynomials with vectorized ground range and slant range conversion
+        """
+        return self._srgr
 
     @property
-    def look_directions(self) -> pd.DataFrame:
+    def timing(self) -> RadarTiming:
+        """
+        Timing model converting image lines and pixels to azimuth time and slant range. It is created when first
+        accessed.
+        """
+        if self._timing is None:
+            self._timing = RadarTiming(self)
+        return self._timing
+
+    @property
+    def look_directions(self):
         """
         Dataframe object containing look direction data
         """
-        return self._look_directions
+        return self._get_dataframe('look_directions', self._look_directions)
 
     @property
-    def doppler_centroid_coeffs(self) -> pd.DataFrame:
+    def doppler_centroid_coeffs(self):
         """
         Dataframe object containing doppler centroid coefficients
         """
-        return self._doppler_centroid_coeffs
+        return self._get_dataframe('doppler_centroid_coeffs', self._doppler_centroid_coeffs)
 
     @property
-    def baselines(self) -> pd.DataFrame:
+    def baselines(self):
         """
         Dataframe object containing baseline data between two image acquisitions
         """
-        return self._baselines
+        return self._get_dataframe('baselines', self._baselines)
+
+    @property
+    def baseline_matrix(self) -> BaselineMatrix:
+        """
+        Baselines between all acquisition pairs as typed N x N matrices indexed by acquisition date
+        """
+        return self._baseline_matrix
 
     def get_attribute(self, name, attribute_type='Value') -> str:
         """
         Load XML attribute from abstracted metadata section. Does not include nested sections.
 
         :param name: Element to search for in abstracted metadata
-        :param attribute_type: Accepted attribute types are [Name, Value, Type, Description]
+        :param attribute_type: Accepted attribute types are [Name, Value, Type, Unit, Description]
         """
-        attr_type = attribute_type.title()
-        output = self._dataframe[self._dataframe['Name'] == name][attr_type]
-
-        if len(output) == 0:
+        values = self._attributes[attribute_type.title()]
+        idx = self._positions.get(name)
+        if idx is None:
             raise ValueError(f'Element "{name}" not found in abstracted metadata')
+        return values[idx]
+
+    def get_attributes(self, names, typed=True) -> dict:
+        """
+        Load the values of many elements of the abstracted metadata section in one call. Returns a dict of name and
+        value in the order of `names`.
 
-        output = list(output)[0]
+        :param names: List of element names
+        :param typed: If True, values are converted using their MDATTR type. Integers and floats become int and float
+            and utc times become datetime64[us] scalars. If False, the texts are returned.
+        """
+        positions = [self._positions.get(x) for x in names]
+        missing = [name for name, idx in zip(names, positions) if idx is None]
+        if missing:
+            raise ValueError(f'Elements {missing} not found in abstracted metadata')
 
-        return output
+        values = [self._attributes['Value'][x] for x in positions]
+        if typed:
+            values = convert_scalars(values, [self._attributes['Type'][x] for x in positions])
+        return dict(zip(names, values))
 
-    def _load_dataframe(self):
+    def get_section(self, name) -> dict:
+        """
+        Load the rows of a repeated section without pandas. Returns a dict of row name and dict of attribute name and
+        text in document order, or None if the section is missing.
+
+        :param name: Section name [orbit_state_vectors, orbit_offsets, srgr_coeffs, look_directions,
+            doppler_centroid_coeffs, baselines]
+        """
+        if name not in SECTIONS:
+            raise ValueError(f'Section "{name}" is not valid')
+        data = getattr(self, f'_{name}')
+        if data is None:
+            return None
+        return {key: dict(row) for key, row in data.items()}
+
+    def _get_dataframe(self, key, data):
+        if data is None:
+            return None
+        df = self._dataframes.get(key)
+        if df is None:
+            df = import_pandas().DataFrame(data)
+            self._dataframes[key] = df
+        return df
+
+    def _get_subsampling(self):
+        if self._subsampling is None:
+            self._subsampling = load_subsampling(self._metadata)
+        return self._subsampling
+
+    def _release(self):
+        self._get_subsampling()
+        self._esd_measurement._metadata = None
+        self._burst_index._metadata = None
+        self._metadata = None
+
+    @instrumented('abstracted_metadata.attributes', ABSTRACTED_METADATA_XPATH)
+    def _load_attributes(self):
         name_list = []
         text_list = []
         type_list = []
@@ -133,11 +280,11 @@ class AbstractedMetadata:
                 text = item.text
             text_list.append(text)
 
-        data = {'Name': name_list, 'Value': text_list, 'Type': type_list, 'Description': desc_list}
-        return pd.DataFrame(data)
+        return {'Name': name_list, 'Value': text_list, 'Type': type_list, 'Unit': unit_list, 'Description': desc_list}
 
+    @instrumented('abstracted_metadata.burst_boundary', _section_xpath('BurstBoundary'))
     def _load_burst_boundary(self):
-        elem = self._metadata.findall('.//MDElem[@name="Abstracted_Metadata"]/MDElem[@name="BurstBoundary"]/*')
+        elem = self._metadata.findall(f'{self._target_xpath}/MDElem[@name="BurstBoundary"]/*')
         if len(elem) == 0:
             return
 
@@ -156,9 +303,10 @@ class AbstractedMetadata:
                     if '    ' in text:
                         text = None
                     burst_boundary_data[col_name][data.attrib['name']] = text
-        return pd.DataFrame(burst_boundary_data)
+        return burst_boundary_data
 
-    def _load_orbit_state_vectors(self, out_type_as_dataframe=True):
+    @instrumented('abstracted_metadata.orbit_state_vectors', _section_xpath('Orbit_State_Vectors'))
+    def _load_orbit_state_vectors(self):
         elem = self._metadata.findall(f'{self._target_xpath}/MDElem[@name="Orbit_State_Vectors"]')[0]
         if len(elem) == 0:
             return
@@ -172,37 +320,42 @@ class AbstractedMetadata:
                 vector_data[item.attrib['name']] = item.text
             vector[vector_elem.attrib['name']] = vector_data
 
-        if out_type_as_dataframe is True:
-            return pd.DataFrame(vector)
-        else:
-            return vector
+        return vector
+
+    @instrumented('abstracted_metadata.orbit', _section_xpath('Orbit_State_Vectors'))
+    def _load_orbit(self):
+        return OrbitStateVectors(self._metadata.find(f'{self._target_xpath}/MDElem[@name="Orbit_State_Vectors"]'))
 
     # Slant Range to Ground Range (SRGR)
+    @instrumented('abstracted_metadata.srgr_coeffs', _section_xpath('SRGR_Coefficients'))
     def _load_srgr_coeffs(self):
-        elem = self._metadata.findall('.//MDElem[@name="Abstracted_Metadata"]/MDElem[@name="SRGR_Coefficients"]/*')
+        elem = self._metadata.findall(f'{self._target_xpath}/MDElem[@name="SRGR_Coefficients"]/*')
         if len(elem) == 0:
             return
 
         srgr_coeffs = []
-        for idx in range(1, len(elem) + 1):
-            coef_list = self._metadata.findall(
-                f'.//MDElem[@name="Abstracted_Metadata"]/MDElem[@name="SRGR_Coefficients"]/MDElem[@name="srgr_coef_list.{idx}"]')
-
-            for coef_data in coef_list:
-                coef_dict = {}
-                coef_dict['element'] = f'srgr_coef_list.{idx}'
-                for item in coef_data:
-                    if '    ' not in item.text:
-                        coef_dict[item.attrib['name']] = item.text
-                    else:
-                        coef_dict['srgr_coef'] = list(item)[0].text
-                srgr_coeffs.append(coef_dict)
-        if not srgr_coeffs:
+        for coef_data in elem:
+            coef_dict = {'element': coef_data.attrib['name']}
+            for item in coef_data:
+                if item.tag == 'MDATTR':
+                    coef_dict[item.attrib['name']] = item.text
+                else:
+                    # Each coefficient of the polynomial is nested in its own element
+                    for coef in item:
+                        coef_dict[item.attrib['name']] = coef.text
+            srgr_coeffs.append(coef_dict)
+
+        return srgr_coeffs
+
+    @instrumented('abstracted_metadata.srgr', _section_xpath('SRGR_Coefficients'))
+    def _load_srgr(self):
+        elem = self._metadata.find(f'{self._target_xpath}/MDElem[@name="SRGR_Coefficients"]')
+        if elem is None or len(elem) == 0:
             return
-        else:
-            return pd.DataFrame(srgr_coeffs)
+        return SrgrCoefficients(elem)
 
-    def _load_doppler_centroid_coeffs(self, out_type_as_dataframe=True):
+    @instrumented('abstracted_metadata.doppler_centroid_coeffs', _section_xpath('Doppler_Centroid_Coefficients'))
+    def _load_doppler_centroid_coeffs(self):
         elem = self._metadata.findall(f'{self._target_xpath}/MDElem[@name="Doppler_Centroid_Coefficients"]')[0]
         if len(elem) == 0:
             return
@@ -220,12 +373,10 @@ class AbstractedMetadata:
                         coeffs_data[coeff_list.attrib['name']] = coeff_nest.text
             coeffs[coeff_elem.attrib['name']] = coeffs_data
 
-        if out_type_as_dataframe is True:
-            return pd.DataFrame(coeffs)
-        else:
-            return coeffs
+        return coeffs
 
-    def _load_baselines(self, out_type_as_dataframe=True):
+    @instrumented('abstracted_metadata.baselines', _section_xpath('Baselines'))
+    def _load_baselines(self):
         elem = self._metadata.findall(f'{self._target_xpath}/MDElem[@name="Baselines"]')
         if len(elem) == 0:
             return
@@ -245,13 +396,18 @@ class AbstractedMetadata:
                     baseline_data['Secondary Date'] = secondary_date
                     baselines[reference_date] = baseline_data
 
-        if out_type_as_dataframe is True:
-            return pd.DataFrame(baselines)
-        else:
-            return baselines
+        return baselines
+
+    @instrumented('abstracted_metadata.baseline_matrix', _section_xpath('Baselines'))
+    def _load_baseline_matrix(self):
+        elem = self._metadata.find(f'{self._target_xpath}/MDElem[@name="Baselines"]')
+        if elem is None or len(elem) == 0:
+            return
+        return BaselineMatrix(elem)
 
+    @instrumented('abstracted_metadata.look_directions', _section_xpath('Look_Direction_List'))
     def _load_look_direction_list(self):
-        elem = self._metadata.findall('.//MDElem[@name="Abstracted_Metadata"]/MDElem[@name="Look_Direction_List"]/*')
+        elem = self._metadata.findall(f'{self._target_xpath}/MDElem[@name="Look_Direction_List"]/*')
         if len(elem) == 0:
             return
 
@@ -261,10 +417,11 @@ class AbstractedMetadata:
             for data in item:
                 look_direction_data[item.attrib['name']][data.attrib['name']] = data.text
 
-        return pd.DataFrame(look_direction_data)
+        return look_direction_data
 
+    @instrumented('abstracted_metadata.orbit_offsets', _section_xpath('Orbit_Offsets'))
     def _load_orbit_offsets(self):
-        elem = self._metadata.findall('.//MDElem[@name="Abstracted_Metadata"]/MDElem[@name="Orbit_Offsets"]/*')
+        elem = self._metadata.findall(f'{self._target_xpath}/MDElem[@name="Orbit_Offsets"]/*')
         if len(elem) == 0:
             return
 
@@ -274,7 +431,88 @@ class AbstractedMetadata:
             for data in ds:
                 orbit_offsets[ds.attrib['name']][data.attrib['name']] = data.text
 
-        return pd.DataFrame(orbit_offsets)
+        return orbit_offsets
+
+
+class AttributeRecord:
+    __slots__ = ('_names', '_values', '_types', '_units', '_positions')
+
+    def __init__(self, names, values, types, units):
+        """
+        Read-only typed record of the abstracted metadata attributes. Values can be read by name with
+        ``record['radar_frequency']`` or as attributes with ``record.radar_frequency``. The record only holds tuples
+        so it is small when pickled.
+
+        :param names: Tuple of attribute names
+        :param values: Tuple of typed values ordered as `names`
+        :param types: Tuple of MDATTR types ordered as `names`
+        :param units: Tuple of units ordered as `names`
+        """
+        self._names = names
+        self._values = values
+        self._types = types
+        self._units = units
+        self._positions = {name: idx for idx, name in enumerate(names)}
+
+    def __reduce__(self):
+        # The name positions are rebuilt when unpickled
+        return AttributeRecord, (self._names, self._values, self._types, self._units)
+
+    def __repr__(self):
+        return f'AttributeRecord({len(self._names)} attributes)'
+
+    def __len__(self):
+        return len(self._names)
+
+    def __iter__(self):
+        return iter(self._names)
+
+    def __contains__(self, name):
+        return name in self._positions
+
+    def __getitem__(self, name):
+        idx = self._positions.get(name)
+        if idx is None:
+            raise KeyError(name)
+        return self._values[idx]
+
+    def __getattr__(self, name):
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(f'Record has no attribute "{name}"') from None
+
+    def get(self, name, default=None):
+        """
+        Load the value of an attribute
+
+        :param name: Attribute name
+        :param default: Value returned when the attribute is missing
+        """
+        idx = self._positions.get(name)
+        return default if idx is None else self._values[idx]
+
+    def get_type(self, name) -> str:
+        """
+        Load the MDATTR type of an attribute
+
+        :param name: Attribute name
+        """
+        return self._types[self._positions[name]]
+
+    def get_unit(self, name) -> str:
+        """
+        Load the unit of an attribute
+
+        :param name: Attribute name
+        """
+        return self._units[self._positions[name]]
+
+    def to_dict(self) -> dict:
+        """
+        Dict of attribute name and typed value
+        """
+        return dict(zip(self._names, self._values))
 
 
 class EsdMeasurement:
@@ -286,15 +524,13 @@ class EsdMeasurement:
 
         self._metadata = metadata
         self._product = product
-        self._data = self._load_esd_measurement()
+        self._data, self._shifts = self._load_esd_measurement()
         if self._data is not None:
             self.images = [x for x in self._data.keys()]
+            self.parameters = list(dict.fromkeys(x for image in self._data.values() for x in image))
         else:
             self.images = None
-        self.parameters = self._metadata.findall(
-                f'.//MDElem[@name="Abstracted_Metadata"]/MDElem[@name="ESD Measurement"]/*/*')
-        if self.parameters is not None:
-            self.parameters = [x.attrib['name'] for x in self.parameters]
+            self.parameters = None
 
     def dataframe(self, image=None, param=None, verbose=True):
         """
@@ -304,15 +540,12 @@ class EsdMeasurement:
         :param param: Parameter to check. Default will use first parameter in the ESD measurement metadata
         """
         # Check if element exists
-        elem = self._metadata.findall(
-                f'.//MDElem[@name="Abstracted_Metadata"]/MDElem[@name="ESD Measurement"]/*/*')
-        if len(elem) == 0:
+        if not self.parameters:
             return
 
         if param is None:
             # Get first parameter as default
-            param = self._metadata.findall(
-                f'.//MDElem[@name="Abstracted_Metadata"]/MDElem[@name="ESD Measurement"]/*/*')[0].attrib['name']
+            param = self.parameters[0]
         if image is None:
             # Get first image as default
             image = self.images[0]
@@ -321,29 +554,100 @@ class EsdMeasurement:
             print('Parameter is', param)
 
         data = self._data[image][param]
-        df = pd.DataFrame(data)
+        df = import_pandas().DataFrame(data)
 
         return df
 
-    def _load_esd_measurement(self):
-        elem = self._metadata.findall('.//MDElem[@name="Abstracted_Metadata"]/MDElem[@name="ESD Measurement"]/*')
-        if len(elem) == 0:
-            return
+    def shifts(self) -> dict:
+        """
+        Load all ESD measurements at once in long format. Returns a dict of equal length numpy arrays with the keys
+        `image`, `parameter`, `swath`, `burst`, `quantity` and `value`. Measurements that are not burst specific have a
+        burst number of -1.
+        """
+        return {key: value.copy() for key, value in self._shifts.items()}
+
+    def get_array(self, quantity='azimuthShift') -> np.ndarray:
+        """
+        Load an ESD quantity as a dense array indexed by (image, parameter, swath, burst). The axes follow `images`,
+        `parameters`, `swaths` and `bursts`. Missing measurements are NaN.
 
-        image_list = []
-        for image in list(elem):
-            image_list.append(image.attrib['name'])
+        :param quantity: Measured quantity, e.g. azimuthShift or rangeShift
+        """
+        images, parameters, swaths, bursts = self.images or [], self.parameters or [], self.swaths, self.bursts
+        output = np.full((len(images), len(parameters), len(swaths), len(bursts)), np.nan)
+
+        mask = self._shifts['quantity'] == quantity
+        output[_label_positions(images, self._shifts['image'][mask]),
+               _label_positions(parameters, self._shifts['parameter'][mask]),
+               _label_positions(swaths, self._shifts['swath'][mask]),
+               _label_positions(bursts, self._shifts['burst'][mask])] = self._shifts['value'][mask]
+        return output
+
+    @property
+    def swaths(self) -> np.ndarray:
+        """
+        Sorted swath names of the ESD measurements
+        """
+        return np.unique(self._shifts['swath'])
+
+    @property
+    def bursts(self) -> np.ndarray:
+        """
+        Sorted burst numbers of the ESD measurements. Measurements that are not burst specific use -1.
+        """
+        return np.unique(self._shifts['burst'])
+
+    @instrumented('abstracted_metadata.esd_measurement', _section_xpath('ESD Measurement'))
+    def _load_esd_measurement(self):
+        elem = self._metadata.find(_section_xpath('ESD Measurement'))
+        columns = {'image': [], 'parameter': [], 'swath': [], 'burst': [], 'quantity': [], 'value': []}
+        if elem is None or len(elem) == 0:
+            return None, _esd_arrays(columns)
 
         esd_measurements = {}
-        for image in image_list:
-            elem = self._metadata.findall(f'.//MDElem[@name="Abstracted_Metadata"]/MDElem[@name="ESD Measurement"]/MDElem[@name="{image}"]/*')
-            for param in elem:
-                swath_data = {}
-                for swath in param:
-                    shift_data = {}
-                    for data in swath:
-                        shift_data[data.attrib['name']] = data.text
-                    swath_data[swath.attrib['name']] = shift_data
-            esd_measurements[image] = {param.attrib['name']: swath_data}
-
-        return esd_measurements
+        for image in elem.findall('MDElem'):
+            image_data = {}
+            for param in image.findall('MDElem'):
+                param_data = {}
+                for swath in param.findall('MDElem'):
+                    # Swath elements contain the overall shifts and optionally one element per burst
+                    entries = [(swath.attrib['name'], -1, swath)]
+                    for burst in swath.findall('MDElem'):
+                        number = re.search(r'\d+', burst.attrib['name'])
+                        entries.append((f'{burst.attrib["name"]}_{swath.attrib["name"]}',
+                                        int(number[0]) if number else -1, burst))
+
+                    for key, number, entry in entries:
+                        shift_data = {}
+                        for data in entry.findall('MDATTR'):
+                            shift_data[data.attrib['name']] = data.text
+                            columns['image'].append(image.attrib['name'])
+                            columns['parameter'].append(param.attrib['name'])
+                            columns['swath'].append(swath.attrib['name'])
+                            columns['burst'].append(number)
+                            columns['quantity'].append(data.attrib['name'])
+                            columns['value'].append(data.text)
+                        if shift_data:
+                            param_data[key] = shift_data
+                image_data[param.attrib['name']] = param_data
+            esd_measurements[image.attrib['name']] = image_data
+
+        return esd_measurements, _esd_arrays(columns)
+
+
+def _esd_arrays(columns):
+    return {
+        'image': np.array(columns['image'], dtype=str),
+        'parameter': np.array(columns['parameter'], dtype=str),
+        'swath': np.array(columns['swath'], dtype=str),
+        'burst': np.array(columns['burst'], dtype='int64'),
+        'quantity': np.array(columns['quantity'], dtype=str),
+        'value': to_float_array(columns['value']),
+    }
+
+
+def _label_positions(labels, values):
+    # Map each value to the position of its label using one dict lookup per unique value
+    lookup = {x: idx for idx, x in enumerate(labels)}
+    unique, inverse = np.unique(values, return_inverse=True)
+    return np.array([lookup[x] for x in unique], dtype='int64')[inverse]
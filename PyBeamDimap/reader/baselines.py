@@ -0,0 +1,165 @@
+import re
+
+import numpy as np
+
+from .utils import parse_date
+
+# Baseline attributes and the property names they are exposed as
+BASELINE_ATTRIBUTES = {
+    'Perp Baseline': 'perpendicular',
+    'Temp Baseline': 'temporal',
+    'Modelled Coherence': 'modelled_coherence',
+    'Height of Ambiguity': 'height_of_ambiguity',
+    'Doppler Difference': 'doppler_difference',
+}
+
+
+class BaselineMatrix:
+
+    def __init__(self, element):
+        """
+        Class containing all baselines of the Baselines section as dense N x N matrices. The matrices are indexed by
+        acquisition date where row i is the reference (master) and column j is the secondary (slave) acquisition.
+        Missing pairs are NaN.
+
+        :param element: Baselines MDElem element
+        """
+        self._dates, self._names, self._matrices = self._load_baseline_matrix(element)
+        self._positions = {str(date): idx for idx, date in enumerate(self._dates)}
+
+    def __len__(self):
+        return len(self._dates)
+
+    @property
+    def dates(self) -> np.ndarray:
+        """
+        Sorted acquisition dates used as row and column index of the matrices
+        """
+        return self._dates
+
+    @property
+    def names(self) -> list:
+        """
+        Names of the baseline attributes available as matrices
+        """
+        return list(self._names)
+
+    @property
+    def perpendicular(self) -> np.ndarray:
+        """
+        Perpendicular baseline matrix in metres
+        """
+        return self.get_matrix('Perp Baseline')
+
+    @property
+    def temporal(self) -> np.ndarray:
+        """
+        Temporal baseline matrix in days
+        """
+        return self.get_matrix('Temp Baseline')
+
+    @property
+    def modelled_coherence(self) -> np.ndarray:
+        """
+        Modelled coherence matrix
+        """
+        return self.get_matrix('Modelled Coherence')
+
+    @property
+    def height_of_ambiguity(self) -> np.ndarray:
+        """
+        Height of ambiguity matrix in metres
+        """
+        return self.get_matrix('Height of Ambiguity')
+
+    @property
+    def doppler_difference(self) -> np.ndarray:
+        """
+        Doppler centroid difference matrix in Hz
+        """
+        return self.get_matrix('Doppler Difference')
+
+    def get_matrix(self, name) -> np.ndarray:
+        """
+        Load the N x N matrix of a baseline attribute
+
+        :param name: Baseline attribute name, e.g. `Perp Baseline`
+        """
+        if name not in self._names:
+            raise ValueError(f'Baseline attribute "{name}" not found in baselines')
+        return self._matrices[self._names.index(name)]
+
+    def get_index(self, date) -> int:
+        """
+        Get the matrix index of an acquisition date
+
+        :param date: Acquisition date as datetime64, ISO string (2019-09-02) or DIMAP string (02Sep2019)
+        """
+        key = str(parse_date([date])[0])
+        if key not in self._positions:
+            raise ValueError(f'Date "{date}" not found in baselines')
+        return self._positions[key]
+
+    def select_pairs(self, max_perpendicular=None, max_temporal=None, min_coherence=None,
+                     include_reverse=False) -> np.ndarray:
+        """
+        Select acquisition pairs whose baselines satisfy all given thresholds. Returns an array of shape (pairs, 2)
+        containing the reference and secondary matrix indices of each pair.
+
+        :param max_perpendicular: Maximum absolute perpendicular baseline in metres
+        :param max_temporal: Maximum absolute temporal baseline in days
+        :param min_coherence: Minimum modelled coherence
+        :param include_reverse: If True, both (i, j) and (j, i) are returned. Default only returns pairs where i < j.
+        """
+        size = len(self._dates)
+        mask = ~np.eye(size, dtype=bool)
+        if not include_reverse:
+            mask &= np.triu(np.ones((size, size), dtype=bool))
+
+        if max_perpendicular is not None:
+            mask &= np.abs(self.perpendicular) <= max_perpendicular
+        if max_temporal is not None:
+            mask &= np.abs(self.temporal) <= max_temporal
+        if min_coherence is not None:
+            mask &= self.modelled_coherence >= min_coherence
+
+        return np.argwhere(mask)
+
+    @staticmethod
+    def _load_baseline_matrix(element):
+        re_pattern = r'\d{2}...\d{4}'
+        names = None
+        pairs = []
+        values = []
+
+        for reference in list(element):
+            reference_date = re.search(re_pattern, reference.attrib['name'])[0]
+            for secondary in reference:
+                secondary_date = re.search(re_pattern, secondary.attrib['name'])[0]
+                if names is None:
+                    names = [x.attrib['name'] for x in secondary]
+                pairs.append((reference_date, secondary_date))
+                values.append([x.text for x in secondary])
+
+        if not pairs:
+            return np.array([], dtype='datetime64[D]'), [], np.empty((0, 0, 0))
+
+        date_strings = sorted(set(x for pair in pairs for x in pair))
+        dates = parse_date(date_strings)
+        order = np.argsort(dates, kind='stable')
+        date_strings = [date_strings[x] for x in order]
+        dates = dates[order]
+        positions = {date: idx for idx, date in enumerate(date_strings)}
+        size = len(date_strings)
+
+        rows = np.array([positions[x[0]] for x in pairs], dtype='int64')
+        cols = np.array([positions[x[1]] for x in pairs], dtype='int64')
+        values = np.array(values, dtype='float64')
+
+        # Some stacks repeat reference elements. The first occurrence of a pair is kept.
+        _, first = np.unique(rows * size + cols, return_index=True)
+
+        matrices = np.full((len(names), size, size), np.nan)
+        matrices[:, rows[first], cols[first]] = values[first].T
+
+        return dates, names, matrices
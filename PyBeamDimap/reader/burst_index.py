@@ -0,0 +1,403 @@
+import numpy as np
+
+from ..instrumentation import instrumented
+from .utils import (ABSTRACTED_METADATA_XPATH, METADATA_XPATH, import_pandas, mjd2000_to_datetime64, parse_utc,
+                    points_in_polygon, to_float_array)
+
+
+class BurstIndex:
+
+    def __init__(self, metadata):
+        """
+        Class that indexes the TOPS bursts of Sentinel-1 SLC products. Burst data is taken from the `BurstBoundary`
+        section of the abstracted metadata and completed with the `swathTiming` burst list of the original product
+        annotation. Each burst is one row in the typed arrays of this class.
+
+        Line numbers are debursted lines of the `BurstBoundary` section, in which the bursts of a swath are merged
+        without their overlap. Products without this section use the line numbers of the original SLC swath, in which
+        the bursts follow each other with `linesPerBurst` lines each. See :attr:`debursted`.
+
+        :param metadata: ElementTree object containing parsed .dim data
+        """
+        self._metadata = metadata
+        self._debursted = False
+        self._data = self._load_burst_index()
+
+        # Sort order used by the vectorized lookups. Bursts are grouped per swath and sorted by first line within
+        # each swath.
+        self._swath_names = sorted(set(str(x) for x in self._data['swath']))
+        self._swath_codes = np.array([self._swath_names.index(x) for x in self._data['swath']], dtype='int64')
+        self._order = np.lexsort((self._data['first_line'], self._swath_codes))
+
+    def __len__(self):
+        return len(self._data['swath'])
+
+    @property
+    def debursted(self) -> bool:
+        """
+        True if line numbers are debursted lines of the `BurstBoundary` section, False if they are lines of the
+        original SLC swath
+        """
+        return self._debursted
+
+    @property
+    def swaths(self) -> list:
+        """
+        Names of the swaths available in the burst index
+        """
+        return list(self._swath_names)
+
+    @property
+    def swath(self) -> np.ndarray:
+        """
+        Swath name of each burst
+        """
+        return self._data['swath']
+
+    @property
+    def burst(self) -> np.ndarray:
+        """
+        Burst number of each burst within its swath
+        """
+        return self._data['burst']
+
+    @property
+    def first_line(self) -> np.ndarray:
+        """
+        First line of each burst. See :attr:`debursted` for the line numbering.
+        """
+        return self._data['first_line']
+
+    @property
+    def last_line(self) -> np.ndarray:
+        """
+        Last line of each burst. See :attr:`debursted` for the line numbering.
+        """
+        return self._data['last_line']
+
+    @property
+    def azimuth_start(self) -> np.ndarray:
+        """
+        Zero doppler azimuth time of the first line of each burst
+        """
+        return self._data['azimuth_start']
+
+    @property
+    def azimuth_stop(self) -> np.ndarray:
+        """
+        Zero doppler azimuth time of the last line of each burst
+        """
+        return self._data['azimuth_stop']
+
+    @property
+    def first_pixel_time(self) -> np.ndarray:
+        """
+        Slant range time of the first pixel of each burst
+        """
+        return self._data['first_pixel_time']
+
+    @property
+    def last_pixel_time(self) -> np.ndarray:
+        """
+        Slant range time of the last pixel of each burst
+        """
+        return self._data['last_pixel_time']
+
+    @property
+    def first_valid_pixel_time(self) -> np.ndarray:
+        """
+        Slant range time of the first valid pixel of each burst
+        """
+        return self._data['first_valid_pixel_time']
+
+    @property
+    def last_valid_pixel_time(self) -> np.ndarray:
+        """
+        Slant range time of the last valid pixel of each burst
+        """
+        return self._data['last_valid_pixel_time']
+
+    @property
+    def first_valid_sample(self) -> np.ndarray:
+        """
+        First valid sample of each burst. Value is -1 if the original product annotation is not available.
+        """
+        return self._data['first_valid_sample']
+
+    @property
+    def last_valid_sample(self) -> np.ndarray:
+        """
+        Last valid sample of each burst. Value is -1 if the original product annotation is not available.
+        """
+        return self._data['last_valid_sample']
+
+    @property
+    def first_valid_line(self) -> np.ndarray:
+        """
+        First valid line of each burst relative to the burst start. Value is -1 if the original product annotation is
+        not available.
+        """
+        return self._data['first_valid_line']
+
+    @property
+    def last_valid_line(self) -> np.ndarray:
+        """
+        Last valid line of each burst relative to the burst start. Value is -1 if the original product annotation is
+        not available.
+        """
+        return self._data['last_valid_line']
+
+    @property
+    def polygons(self) -> np.ndarray:
+        """
+        Array of shape (bursts, points, 2) containing the closed (lon, lat) boundary polygon of each burst. Missing
+        points are padded with NaN.
+        """
+        return self._data['polygons']
+
+    def dataframe(self):
+        """
+        Generate a Pandas dataframe of the burst index with one row per burst. Polygons are not included. Requires
+        pandas.
+        """
+        return import_pandas().DataFrame({key: value for key, value in self._data.items() if key != 'polygons'})
+
+    def find_lines(self, lines, swath) -> np.ndarray:
+        """
+        Find the bursts containing the given lines. Returns the burst index position of each line or -1 if the line is
+        not inside a burst. Lines use the numbering of :attr:`first_line`, see :attr:`debursted`.
+
+        :param lines: Array of line numbers
+        :param swath: Swath name of the lines. Can be a single name or an array with one swath name per line.
+        """
+        lines = np.asarray(lines, dtype='float64')
+        codes = self._query_swath_codes(swath, lines.shape)
+        return self._find(self._data['first_line'], self._data['last_line'], lines, codes)
+
+    def find_times(self, times, swath) -> np.ndarray:
+        """
+        Find the bursts containing the given zero doppler azimuth times. Returns the burst index position of each time
+        or -1 if the time is not inside a burst. Times inside the overlap of two bursts are assigned to the later burst.
+
+        :param times: Array of azimuth times. Anything accepted by numpy as datetime64 can be used.
+        :param swath: Swath name of the times. Can be a single name or an array with one swath name per time.
+        """
+        times = np.asarray(times, dtype='datetime64[us]').astype('int64')
+        codes = self._query_swath_codes(swath, times.shape)
+        start = self._data['azimuth_start'].astype('int64')
+        stop = self._data['azimuth_stop'].astype('int64')
+        return self._find(start, stop, times, codes)
+
+    def find_points(self, lon, lat) -> np.ndarray:
+        """
+        Find the bursts whose boundary polygon contains the given points. Returns the burst index position of each
+        point or -1 if the point is outside all bursts. Points inside overlapping bursts are assigned to the burst
+        that comes first in the index.
+
+        :param lon: Array of longitudes
+        :param lat: Array of latitudes
+        """
+        lon = np.asarray(lon, dtype='float64')
+        lat = np.asarray(lat, dtype='float64')
+        output = np.full(lon.shape, -1, dtype='int64')
+
+        for idx, polygon in enumerate(self._data['polygons']):
+            polygon = polygon[~np.isnan(polygon).any(axis=1)]
+            if len(polygon) < 3:
+                continue
+            # Only test points without a burst that are inside the bounding box of the polygon
+            candidates = (output == -1) & \
+                         (lon >= polygon[:, 0].min()) & (lon <= polygon[:, 0].max()) & \
+                         (lat >= polygon[:, 1].min()) & (lat <= polygon[:, 1].max())
+            if not candidates.any():
+                continue
+            inside = points_in_polygon(lon[candidates], lat[candidates], polygon)
+            output[np.flatnonzero(candidates)[inside]] = idx
+
+        return output
+
+    def _query_swath_codes(self, swath, shape):
+        if isinstance(swath, str):
+            if swath not in self._swath_names:
+                raise ValueError(f'Swath "{swath}" not found in burst index')
+            return np.full(shape, self._swath_names.index(swath), dtype='int64')
+
+        swath = np.asarray(swath)
+        names, inverse = np.unique(swath, return_inverse=True)
+        lookup = np.array([self._swath_names.index(x) if x in self._swath_names else -1 for x in names],
+                          dtype='int64')
+        return lookup[inverse].reshape(shape)
+
+    def _find(self, start, stop, values, codes):
+        output = np.full(values.shape, -1, dtype='int64')
+        if len(self) == 0:
+            return output
+
+        # Bursts of each swath are contiguous in the sort order so searching each swath segment is a searchsorted
+        # on the sorted start values
+        sorted_codes = self._swath_codes[self._order]
+        sorted_start = start[self._order]
+        for code in np.unique(codes):
+            if code < 0:
+                continue
+            mask = codes == code
+            lo, hi = np.searchsorted(sorted_codes, [code, code + 1])
+            pos = np.searchsorted(sorted_start[lo:hi], values[mask], side='right') - 1
+            valid = pos >= 0
+            burst = self._order[lo + np.clip(pos, 0, None)]
+            valid &= values[mask] <= stop[burst]
+            output[mask] = np.where(valid, burst, -1)
+
+        return output
+
+    @instrumented('burst_index', f'{ABSTRACTED_METADATA_XPATH}/MDElem[@name="BurstBoundary"]')
+    def _load_burst_index(self):
+        data = self._load_burst_boundary()
+        bursts = self._load_burst_list()
+
+        if data is None:
+            data = bursts
+        else:
+            self._debursted = True
+            # Complete the burst boundary with the valid sample ranges of the swath timing annotation
+            for idx, (swath, burst) in enumerate(zip(data['swath'], data['burst'])):
+                match = np.flatnonzero((bursts['swath'] == swath) & (bursts['burst'] == burst))
+                if len(match) == 0:
+                    continue
+                for key in ['first_valid_sample', 'last_valid_sample', 'first_valid_line', 'last_valid_line']:
+                    data[key][idx] = bursts[key][match[0]]
+
+        return data
+
+    def _load_burst_boundary(self):
+        elem = self._metadata.findall(f'{ABSTRACTED_METADATA_XPATH}/MDElem[@name="BurstBoundary"]/*')
+        if len(elem) == 0:
+            return
+
+        rows = []
+        for swath in elem:
+            for burst in swath.findall('MDElem'):
+                attributes = {x.attrib['name']: x.text for x in burst.findall('MDATTR')}
+                first_points = _boundary_points(burst.find('MDElem[@name="FirstLineBoundaryPoints"]'))
+                last_points = _boundary_points(burst.find('MDElem[@name="LastLineBoundaryPoints"]'))
+                rows.append((swath.attrib['name'], int(burst.attrib['name'].replace('Burst', '')), attributes,
+                             first_points + last_points[::-1]))
+
+        if not rows:
+            return
+
+        data = _empty_burst_data(len(rows), max(len(x[3]) for x in rows) + 1)
+        data['swath'] = np.array([x[0] for x in rows])
+        data['burst'] = np.array([x[1] for x in rows], dtype='int32')
+        data['first_line'] = to_float_array([x[2].get('FirstLineDeburst') for x in rows])
+        data['last_line'] = to_float_array([x[2].get('LastLineDeburst') for x in rows])
+        data['azimuth_start'] = mjd2000_to_datetime64(to_float_array([x[2].get('FirstLineTime') for x in rows]))
+        data['azimuth_stop'] = mjd2000_to_datetime64(to_float_array([x[2].get('LastLineTime') for x in rows]))
+        for key, name in [('first_pixel_time', 'FirstPixelTime'), ('last_pixel_time', 'LastPixelTime'),
+                          ('first_valid_pixel_time', 'FirstValidPixelTime'),
+                          ('last_valid_pixel_time', 'LastValidPixelTime')]:
+            data[key] = to_float_array([x[2].get(name) for x in rows])
+
+        for idx, (_, _, _, points) in enumerate(rows):
+            if points:
+                # Close the ring so that consecutive points form the polygon edges
+                ring = np.array(points + points[:1], dtype='float64')
+                data['polygons'][idx, :len(ring)] = ring
+
+        return data
+
+    def _load_burst_list(self):
+        annotations = self._metadata.findall(f'{METADATA_XPATH}/MDElem[@name="Original_Product_Metadata"]'
+                                             f'/MDElem[@name="annotation"]/*/MDElem[@name="product"]')
+
+        rows = []
+        for product in annotations:
+            swath = product.find('MDElem[@name="adsHeader"]/MDATTR[@name="swath"]')
+            timing = product.find('MDElem[@name="swathTiming"]')
+            interval = product.find('.//MDElem[@name="imageInformation"]/MDATTR[@name="azimuthTimeInterval"]')
+            if swath is None or timing is None:
+                continue
+            lines_per_burst = int(_attribute_text(timing, 'linesPerBurst') or 0)
+            for number, burst in enumerate(timing.findall('MDElem[@name="burstList"]/MDElem[@name="burst"]')):
+                first_valid = _integer_list(burst, 'firstValidSample')
+                last_valid = _integer_list(burst, 'lastValidSample')
+                valid_lines = np.flatnonzero(first_valid >= 0)
+                rows.append({
+                    'swath': swath.text,
+                    'burst': number,
+                    'first_line': number * lines_per_burst,
+                    'last_line': (number + 1) * lines_per_burst - 1,
+                    'azimuth_start': _attribute_text(burst, 'azimuthTime'),
+                    'azimuth_interval': float(interval.text) if interval is not None else np.nan,
+                    'lines_per_burst': lines_per_burst,
+                    'first_valid_sample': first_valid[valid_lines].min() if len(valid_lines) else -1,
+                    'last_valid_sample': last_valid[valid_lines].max() if len(valid_lines) else -1,
+                    'first_valid_line': valid_lines[0] if len(valid_lines) else -1,
+                    'last_valid_line': valid_lines[-1] if len(valid_lines) else -1,
+                })
+
+        data = _empty_burst_data(len(rows), 0)
+        if not rows:
+            return data
+
+        data['swath'] = np.array([x['swath'] for x in rows])
+        data['burst'] = np.array([x['burst'] for x in rows], dtype='int32')
+        data['first_line'] = np.array([x['first_line'] for x in rows], dtype='float64')
+        data['last_line'] = np.array([x['last_line'] for x in rows], dtype='float64')
+        data['azimuth_start'] = parse_utc([x['azimuth_start'] for x in rows])
+        duration = np.array([(x['lines_per_burst'] - 1) * x['azimuth_interval'] for x in rows], dtype='float64')
+        data['azimuth_stop'] = data['azimuth_start'] + np.round(duration * 1e6).astype('timedelta64[us]')
+        for key in ['first_valid_sample', 'last_valid_sample', 'first_valid_line', 'last_valid_line']:
+            data[key] = np.array([x[key] for x in rows], dtype='int32')
+
+        return data
+
+
+def _empty_burst_data(size, points):
+    return {
+        'swath': np.empty(size, dtype='<U4'),
+        'burst': np.zeros(size, dtype='int32'),
+        'first_line': np.full(size, np.nan),
+        'last_line': np.full(size, np.nan),
+        'azimuth_start': np.full(size, np.datetime64('NaT'), dtype='datetime64[us]'),
+        'azimuth_stop': np.full(size, np.datetime64('NaT'), dtype='datetime64[us]'),
+        'first_pixel_time': np.full(size, np.nan),
+        'last_pixel_time': np.full(size, np.nan),
+        'first_valid_pixel_time': np.full(size, np.nan),
+        'last_valid_pixel_time': np.full(size, np.nan),
+        'first_valid_sample': np.full(size, -1, dtype='int32'),
+        'last_valid_sample': np.full(size, -1, dtype='int32'),
+        'first_valid_line': np.full(size, -1, dtype='int32'),
+        'last_valid_line': np.full(size, -1, dtype='int32'),
+        'polygons': np.full((size, points, 2), np.nan),
+    }
+
+
+def _attribute_text(elem, name):
+    attribute = elem.find(f'MDATTR[@name="{name}"]')
+    if attribute is None:
+        return
+    return attribute.text
+
+
+def _integer_list(elem, name):
+    # Annotation arrays are either stored directly as an MDATTR or wrapped in an MDElem of the same name
+    text = _attribute_text(elem, name)
+    if text is None:
+        nested = elem.find(f'MDElem[@name="{name}"]')
+        text = _attribute_text(nested, name) if nested is not None else None
+    if not text:
+        return np.array([], dtype='int64')
+    return np.array(text.split(), dtype='int64')
+
+
+def _boundary_points(elem):
+    if elem is None:
+        return []
+    points = []
+    for point in elem.findall('MDElem[@name="BoundaryPoint"]'):
+        lat = _attribute_text(point, 'lat')
+        lon = _attribute_text(point, 'lon')
+        points.append((float(lon), float(lat)))
+    return points
+
@@ -1,22 +1,37 @@
 # Reader file handles all functions related to reading and parsing BEAM-DIMAP files
+import os
 import xml.etree.ElementTree as ET
 
-from .abstracted_metadata import AbstractedMetadata
+from ..export import to_dict
+from ..fingerprint import fingerprint
+from ..instrumentation import count_elements, instrumented, phase
+from ..patch import patch
+from .diff import diff_elements, hash_subtrees
+from .footprint import load_footprint
+from .query import MetadataIndex
+from .tree import parse_compact
 
 
 class BeamDimap:
 
-    def __init__(self, metadata: str, processing_level: str):
+    def __init__(self, metadata: str, processing_level: str, compact=False):
         """
         Class that handles BEAM-DIMAP data that is present in all missions. This is intended for BEAM-DIMAP files only
         and not the raw ZIP files of the Sentinel satellites. This is meant to be subclassed by the Sentinel classes in
         missions.py
 
         :param metadata: Path of BEAM-DIMAP (.dim) file
+        :param compact: If True, the XML is parsed into compact read-only nodes instead of an ElementTree
         """
         # Load metadata
-        tree = ET.parse(metadata)
-        self._metadata = tree.getroot()
+        self._path = metadata
+        with phase('parse') as record:
+            if compact:
+                self._metadata = parse_compact(metadata)
+            else:
+                self._metadata = ET.parse(metadata).getroot()
+        if record is not None:
+            record.elements = count_elements(self._metadata)
 
         self._processing_level = processing_level
 
@@ -28,6 +43,126 @@ class BeamDimap:
         self.metadata_version = self._metadata.findall('.//METADATA_FORMAT')[0].attrib['version']
         self.dataset_name = self._metadata.findall('.//DATASET_NAME')[0].text
         self.crs = self._get_crs()
+        with phase('footprint'):
+            self.footprint = load_footprint(self._metadata)
+        self._index = None
+        self._hashes = None
+        self._fingerprint = None
+
+    def query(self, path, data_type=None, infer=True):
+        """
+        Load the values of all metadata attributes (MDATTR) matching a name path as a typed array. Paths are MDElem and
+        MDATTR names separated by `/` starting below the metadata section. A `*` within a name matches any characters
+        and a `**` segment matches any number of nested elements. Values are returned in document order.
+
+        Example: ``dimap.query('Original_Product_Metadata/annotation/*/product/geolocationGrid/**/latitude')``
+
+        :param path: Name path
+        :param data_type: MDATTR type used instead of the type of the first match, e.g. float64 or utc
+        :param infer: If True, ascii values are returned as integers, floats or times when all values can be converted
+        """
+        return self._get_index().values(path, data_type, infer)
+
+    def query_paths(self, path) -> list:
+        """
+        Load the full name paths of all metadata elements matching a name path
+
+        :param path: Name path
+        """
+        return self._get_index().paths(path)
+
+    def query_positions(self, path):
+        """
+        Load the positions of all metadata elements matching a name path in document order. Positions of different
+        paths can be compared, e.g. to find the parent element of each match.
+
+        :param path: Name path
+        """
+        return self._get_index().find(path)
+
+    def diff(self, other, xpath=None) -> list:
+        """
+        Compare the metadata of this product (old) against another product (new). Returns a list of Difference objects
+        with the path, type of change (added, removed or changed) and the old and new values of every attribute that
+        differs. Subtree hashes of each product are computed once and identical subtrees are skipped, so repeated
+        comparisons only visit the parts of the documents that changed.
+
+        :param other: Product to compare against
+        :param xpath: Optional XPath of the element that is compared in both products, e.g. the metadata section
+            `./Dataset_Sources/MDElem[@name="metadata"]`. Default None compares the whole document.
+        """
+        old = self._get_hashes()
+        new = other._get_hashes()
+        old_root = self._metadata if xpath is None else self._metadata.find(xpath)
+        new_root = other._metadata if xpath is None else other._metadata.find(xpath)
+        if old_root is None or new_root is None:
+            raise ValueError(f'Element "{xpath}" is missing in one of the products')
+        return diff_elements(old_root, new_root, old, new)
+
+    def fingerprint(self) -> str:
+        """
+        Content fingerprint of the product that ignores volatile fields such as the dataset name, processing times and
+        the file paths of the processing graph. Copies of the same product have the same fingerprint. The value is
+        equal to the fingerprint computed from the file by :func:`PyBeamDimap.fingerprint.fingerprint`.
+
+        The fingerprint is computed from the parsed tree on the first call, or when the tree is released, and is kept
+        for the lifetime of the product.
+        """
+        if self._fingerprint is None:
+            self._fingerprint = fingerprint(self._metadata)
+        return self._fingerprint
+
+    def to_dict(self, typed=False) -> dict:
+        """
+        Convert the whole BEAM-DIMAP document into nested dicts. See :func:`PyBeamDimap.export.to_dict` for the format.
+
+        :param typed: If True, numeric MDATTR values are converted to int or float and utc values to ISO 8601 strings
+        """
+        if self._metadata is None:
+            raise ValueError('Metadata cannot be converted after the XML tree was released')
+        return to_dict(self._metadata, typed)
+
+    def patch(self, edits, output=None) -> dict:
+        """
+        Replace metadata values in the .dim file of this product in a single streaming pass. Untouched bytes are copied
+        verbatim and the file is replaced atomically. See :func:`PyBeamDimap.patch.patch` for the name paths. This
+        object is not updated, open the product again to read the patched values.
+
+        Example: ``dimap.patch({'Abstracted_Metadata/PASS': 'ASCENDING'})``
+
+        :param edits: Dict of name path and new value or list of new values
+        :param output: Optional path of the patched file. Default None replaces the file of this product.
+        :return: Dict of name path and number of patched elements
+        """
+        if not isinstance(self._path, (str, bytes, os.PathLike)):
+            raise ValueError('Only products opened from a file path can be patched')
+        return patch(self._path, edits, output)
+
+    def release_tree(self):
+        """
+        Extract all data that is loaded on demand and drop the parsed XML tree. Products keep working without the tree
+        but use less memory, which allows many products to be kept open at once.
+        """
+        self.ImageInterpretation._release()
+        self.fingerprint()
+        self._metadata = None
+        self._hashes = None
+
+    def _get_index(self):
+        # The index is built on first use and is kept when the tree is released
+        if self._index is None:
+            if self._metadata is None:
+                raise ValueError('Metadata cannot be queried after the XML tree was released')
+            self._index = MetadataIndex(self._metadata)
+        return self._index
+
+    def _get_hashes(self):
+        # Subtree hashes are computed on the first comparison and reused by later ones
+        if self._hashes is None:
+            if self._metadata is None:
+                raise ValueError('Metadata cannot be compared after the XML tree was released')
+            self._hashes = hash_subtrees(self._metadata)
+        return self._hashes
 
     def _get_crs(self):
         crs = self._metadata.findall('.//Coordinate_Reference_System/WKT')
@@ -55,6 +190,10 @@ class ImageInterpretation:
         """
         return self._bands_data
 
+    def _release(self):
+        self._metadata = None
+
+    @instrumented('image_interpretation', './Image_Interpretation')
     def _load_image_interpretation(self):
         bands = self._metadata.findall('.//Image_Interpretation/Spectral_Band_Info')
         bands_children = [list(x) for x in bands]
@@ -75,18 +214,9 @@ class ImageInterpretation:
         :param attribute: Name of specific attribute to load. If None then it will load all attributes for the band.
         :return: Dict containing band specific information
         """
-        # Get spectral bands element
-        band_element = self._metadata.findall('.//Image_Interpretation/Spectral_Band_Info')
-
-        # Load elements
-        band_list = []
-        for idx in range(len(band_element)):
-            # Loop through band indices
-            band_elem = self._metadata.findall(f".//Image_Interpretation/Spectral_Band_Info[BAND_INDEX='{idx}']")[0]
-            band_data = {}
-            for band in band_elem:
-                band_data[band.tag] = band.text
-            band_list.append(band_data)
+        # Bands are stored in band index order
+        bands = {x.get('BAND_INDEX'): x for x in self._bands_data}
+        band_list = [dict(bands[str(idx)]) for idx in range(len(self._bands_data))]
 
         if band_index is None:
             if attribute is None:
@@ -0,0 +1,158 @@
+# Structural comparison of BEAM-DIMAP documents using hashes of their subtrees
+import hashlib
+
+ADDED = 'added'
+REMOVED = 'removed'
+CHANGED = 'changed'
+
+# Separators of the hashed fields. XML 1.0 does not allow these characters in names, attributes or text.
+_ATTRIBUTE = b'\x00'
+_VALUE = b'\x01'
+_TEXT = b'\x02'
+
+
+class Difference:
+    __slots__ = ('path', 'change', 'old', 'new')
+
+    def __init__(self, path, change, old, new):
+        """
+        One difference between two documents
+
+        :param path: Path of MDElem and MDATTR names (tags for other elements) below the compared element. XML
+            attributes are appended as `@name`. Repeated names in one parent are suffixed with their index, e.g.
+            Spectral_Band_Info[2].
+        :param change: Type of change [added, removed, changed]
+        :param old: Value in the old document. None if the value was added.
+        :param new: Value in the new document. None if the value was removed.
+        """
+        self.path = path
+        self.change = change
+        self.old = old
+        self.new = new
+
+    def __repr__(self):
+        return f'Difference({self.path!r}, {self.change!r}, old={self.old!r}, new={self.new!r})'
+
+    def __eq__(self, other):
+        if not isinstance(other, Difference):
+            return NotImplemented
+        return self.to_dict() == other.to_dict()
+
+    def to_dict(self) -> dict:
+        return {'path': self.path, 'change': self.change, 'old': self.old, 'new': self.new}
+
+
+def hash_subtrees(element) -> dict:
+    """
+    Hash every subtree of a document. The hash of an element covers its tag, attributes, stripped text and the hashes
+    of its children in order, so two subtrees are identical when their hashes are equal. Returns a dict of element to
+    digest.
+
+    :param element: ElementTree element or compact node
+    """
+    hashes = {}
+    _hash(element, hashes)
+    return hashes
+
+
+def diff_elements(old, new, old_hashes=None, new_hashes=None) -> list:
+    """
+    Compare two elements and return the list of differences between their attributes. Children are matched by their
+    MDElem or MDATTR name (tag for other elements) and subtrees with equal hashes are skipped without being visited,
+    so the cost depends on the number of differences and not on the size of the documents.
+
+    :param old: Element of the old document
+    :param new: Element of the new document
+    :param old_hashes: Subtree hashes of the old document from `hash_subtrees`. Computed if not given.
+    :param new_hashes: Subtree hashes of the new document from `hash_subtrees`. Computed if not given.
+    """
+    if old_hashes is None:
+        old_hashes = hash_subtrees(old)
+    if new_hashes is None:
+        new_hashes = hash_subtrees(new)
+    differences = []
+    _diff(old, new, '', old_hashes, new_hashes, differences)
+    return differences
+
+
+def _hash(element, hashes):
+    digest = hashlib.blake2b(element.tag.encode(), digest_size=16)
+    for key, value in sorted(element.items()):
+        digest.update(_ATTRIBUTE + key.encode() + _VALUE + value.encode())
+    digest.update(_TEXT + _text(element).encode())
+    for child in element:
+        digest.update(_hash(child, hashes))
+    hashes[element] = result = digest.digest()
+    return result
+
+
+def _diff(old, new, path, old_hashes, new_hashes, differences):
+    if old_hashes[old] == new_hashes[new]:
+        return
+
+    old_attrib = old.attrib
+    new_attrib = new.attrib
+    for key in {**old_attrib, **new_attrib}:
+        if key == 'name' or old_attrib.get(key) == new_attrib.get(key):
+            continue
+        change = ADDED if key not in old_attrib else REMOVED if key not in new_attrib else CHANGED
+        differences.append(Difference(_join(path, f'@{key}'), change, old_attrib.get(key), new_attrib.get(key)))
+
+    old_children = _children(old)
+    new_children = _children(new)
+    if not old_children and not new_children:
+        if _text(old) != _text(new):
+            differences.append(Difference(path, CHANGED, _text(old), _text(new)))
+        return
+
+    for key, (child, segment) in old_children.items():
+        other = new_children.get(key)
+        if other is None:
+            _report(child, _join(path, segment), REMOVED, differences)
+        else:
+            _diff(child, other[0], _join(path, segment), old_hashes, new_hashes, differences)
+    for key, (child, segment) in new_children.items():
+        if key not in old_children:
+            _report(child, _join(path, segment), ADDED, differences)
+
+
+def _report(element, path, change, differences):
+    # All values of an added or removed subtree are reported
+    if not len(element):
+        text = _text(element)
+        old, new = (None, text) if change == ADDED else (text, None)
+        differences.append(Difference(path, change, old, new))
+        return
+    for key, (child, segment) in _children(element).items():
+        _report(child, _join(path, segment), change, differences)
+
+
+def _children(element):
+    # Children keyed by name and occurrence. Segments of repeated names contain their index.
+    counts = {}
+    for child in element:
+        name = _name(child)
+        counts[name] = counts.get(name, 0) + 1
+
+    children = {}
+    seen = {}
+    for child in element:
+        name = _name(child)
+        index = seen.get(name, 0)
+        seen[name] = index + 1
+        children[(name, index)] = (child, f'{name}[{index}]' if counts[name] > 1 else name)
+    return children
+
+
+def _name(element):
+    if element.tag in ('MDElem', 'MDATTR'):
+        return element.get('name', element.tag)
+    return element.tag
+
+
+def _text(element):
+    return element.text.strip() if element.text else ''
+
+
+def _join(path, segment):
+    return f'{path}/{segment}' if path else segment
@@ -0,0 +1,212 @@
+import re
+
+import numpy as np
+
+from .utils import ABSTRACTED_METADATA_XPATH, points_in_polygon
+
+# Corner attributes of the abstracted metadata in ring order
+CORNER_NAMES = ['first_near', 'first_far', 'last_far', 'last_near']
+
+# Points sampled along each raster edge when the footprint is computed from a projected raster
+EDGE_POINTS = 8
+
+
+class Footprint:
+
+    def __init__(self, polygon):
+        """
+        Footprint polygon of a product in WGS84 longitude and latitude
+
+        :param polygon: Array of shape (vertices, 2) containing (lon, lat) vertices. The ring is closed if needed.
+        """
+        polygon = np.asarray(polygon, dtype='float64')
+        if len(polygon) and not np.array_equal(polygon[0], polygon[-1]):
+            polygon = np.vstack([polygon, polygon[:1]])
+        self._polygon = polygon
+
+    def __repr__(self):
+        return f'Footprint(bounds={self.bounds})'
+
+    @property
+    def polygon(self) -> np.ndarray:
+        """
+        Array of shape (vertices, 2) containing the closed (lon, lat) ring
+        """
+        return self._polygon
+
+    @property
+    def bounds(self) -> tuple:
+        """
+        Bounding box as (min_lon, min_lat, max_lon, max_lat)
+        """
+        return (float(self._polygon[:, 0].min()), float(self._polygon[:, 1].min()),
+                float(self._polygon[:, 0].max()), float(self._polygon[:, 1].max()))
+
+    @property
+    def wkt(self) -> str:
+        """
+        Footprint as a WKT polygon
+        """
+        return 'POLYGON ((' + ', '.join(f'{x} {y}' for x, y in self._polygon) + '))'
+
+    def contains(self, lon, lat) -> np.ndarray:
+        """
+        Test which points are inside the footprint
+
+        :param lon: Array of longitudes
+        :param lat: Array of latitudes
+        """
+        return points_in_polygon(lon, lat, self._polygon)
+
+    def intersects_bbox(self, bbox) -> bool:
+        """
+        Test if the footprint intersects a bounding box
+
+        :param bbox: Bounding box as (min_lon, min_lat, max_lon, max_lat)
+        """
+        min_x, min_y, max_x, max_y = bbox
+        bounds = self.bounds
+        if bounds[0] > max_x or bounds[2] < min_x or bounds[1] > max_y or bounds[3] < min_y:
+            return False
+
+        # A vertex of one shape inside the other
+        x, y = self._polygon[:, 0], self._polygon[:, 1]
+        if np.any((x >= min_x) & (x <= max_x) & (y >= min_y) & (y <= max_y)):
+            return True
+        if np.any(self.contains([min_x, max_x, max_x, min_x], [min_y, min_y, max_y, max_y])):
+            return True
+
+        # Otherwise the shapes only intersect if an edge of the footprint crosses an edge of the box
+        box = np.array([[min_x, min_y], [max_x, min_y], [max_x, max_y], [min_x, max_y], [min_x, min_y]])
+        return bool(np.any(_segments_intersect(self._polygon[:-1, None], self._polygon[1:, None],
+                                               box[None, :-1], box[None, 1:])))
+
+
+def load_footprint(metadata):
+    """
+    Extract the footprint of a product. Sentinel-1 products use the corner coordinates of the abstracted metadata.
+    Other products use the raster extent and the image to model transform of the Geoposition section, which supports
+    geographic and transverse mercator (e.g. UTM) coordinate reference systems. Returns None if no footprint can be
+    derived.
+
+    :param metadata: ElementTree object containing parsed .dim data
+    """
+    polygon = _load_corner_polygon(metadata)
+    if polygon is None:
+        polygon = _load_raster_polygon(metadata)
+    if polygon is None:
+        return None
+    return Footprint(polygon)
+
+
+def transverse_mercator_to_geodetic(easting, northing, central_meridian, scale_factor=0.9996,
+                                    false_easting=500000.0, false_northing=0.0, latitude_of_origin=0.0) -> tuple:
+    """
+    Convert WGS84 transverse mercator coordinates into longitude and latitude using the series expansion of Snyder
+    (USGS Professional Paper 1395). Returns a tuple of (lon, lat) arrays in degrees.
+
+    :param easting: Array of eastings in metres
+    :param northing: Array of northings in metres
+    :param central_meridian: Central meridian in degrees
+    :param scale_factor: Scale factor at the central meridian
+    :param false_easting: False easting in metres
+    :param false_northing: False northing in metres
+    :param latitude_of_origin: Latitude of origin in degrees
+    """
+    a = 6378137.0
+    e2 = 0.0066943799901413165
+    ep2 = e2 / (1 - e2)
+
+    x = np.asarray(easting, dtype='float64') - false_easting
+    m0 = _meridian_arc(np.radians(latitude_of_origin), a, e2)
+    m = m0 + (np.asarray(northing, dtype='float64') - false_northing) / scale_factor
+
+    # Footpoint latitude
+    mu = m / (a * (1 - e2 / 4 - 3 * e2 ** 2 / 64 - 5 * e2 ** 3 / 256))
+    e1 = (1 - np.sqrt(1 - e2)) / (1 + np.sqrt(1 - e2))
+    phi1 = mu + (3 * e1 / 2 - 27 * e1 ** 3 / 32) * np.sin(2 * mu) + \
+        (21 * e1 ** 2 / 16 - 55 * e1 ** 4 / 32) * np.sin(4 * mu) + \
+        (151 * e1 ** 3 / 96) * np.sin(6 * mu) + (1097 * e1 ** 4 / 512) * np.sin(8 * mu)
+
+    c1 = ep2 * np.cos(phi1) ** 2
+    t1 = np.tan(phi1) ** 2
+    n1 = a / np.sqrt(1 - e2 * np.sin(phi1) ** 2)
+    r1 = a * (1 - e2) / (1 - e2 * np.sin(phi1) ** 2) ** 1.5
+    d = x / (n1 * scale_factor)
+
+    lat = phi1 - (n1 * np.tan(phi1) / r1) * (
+        d ** 2 / 2 - (5 + 3 * t1 + 10 * c1 - 4 * c1 ** 2 - 9 * ep2) * d ** 4 / 24 +
+        (61 + 90 * t1 + 298 * c1 + 45 * t1 ** 2 - 252 * ep2 - 3 * c1 ** 2) * d ** 6 / 720)
+    lon = (d - (1 + 2 * t1 + c1) * d ** 3 / 6 +
+           (5 - 2 * c1 + 28 * t1 - 3 * c1 ** 2 + 8 * ep2 + 24 * t1 ** 2) * d ** 5 / 120) / np.cos(phi1)
+
+    return central_meridian + np.degrees(lon), np.degrees(lat)
+
+
+def _meridian_arc(phi, a, e2):
+    return a * ((1 - e2 / 4 - 3 * e2 ** 2 / 64 - 5 * e2 ** 3 / 256) * phi -
+                (3 * e2 / 8 + 3 * e2 ** 2 / 32 + 45 * e2 ** 3 / 1024) * np.sin(2 * phi) +
+                (15 * e2 ** 2 / 256 + 45 * e2 ** 3 / 1024) * np.sin(4 * phi) -
+                (35 * e2 ** 3 / 3072) * np.sin(6 * phi))
+
+
+def _load_corner_polygon(metadata):
+    section = metadata.find(ABSTRACTED_METADATA_XPATH)
+    if section is None:
+        return None
+
+    values = {x.attrib.get('name'): x.text for x in section if x.tag == 'MDATTR'}
+    try:
+        polygon = [(float(values[f'{x}_long']), float(values[f'{x}_lat'])) for x in CORNER_NAMES]
+    except (KeyError, TypeError, ValueError):
+        return None
+
+    # Products without geolocation carry zero or 99999 placeholders
+    polygon = np.array(polygon)
+    if not np.all(np.isfinite(polygon)) or np.any(np.abs(polygon[:, 1]) > 90) or not np.any(polygon):
+        return None
+    return polygon
+
+
+def _load_raster_polygon(metadata):
+    transform = metadata.find('./Geoposition/IMAGE_TO_MODEL_TRANSFORM')
+    ncols = metadata.find('./Raster_Dimensions/NCOLS')
+    nrows = metadata.find('./Raster_Dimensions/NROWS')
+    wkt = metadata.find('./Coordinate_Reference_System/WKT')
+    if transform is None or ncols is None or nrows is None or wkt is None:
+        return None
+
+    # Affine transform ordered as in java.awt.geom.AffineTransform: m00, m10, m01, m11, m02, m12
+    m00, m10, m01, m11, m02, m12 = [float(x) for x in transform.text.split(',')]
+    width, height = float(ncols.text), float(nrows.text)
+
+    steps = np.linspace(0, 1, EDGE_POINTS, endpoint=False)
+    cols = np.concatenate([steps * width, np.full(EDGE_POINTS, width), (1 - steps) * width, np.zeros(EDGE_POINTS)])
+    rows = np.concatenate([np.zeros(EDGE_POINTS), steps * height, np.full(EDGE_POINTS, height), (1 - steps) * height])
+    x = m00 * cols + m01 * rows + m02
+    y = m10 * cols + m11 * rows + m12
+
+    wkt = wkt.text.strip()
+    if wkt.startswith('GEOGCS'):
+        return np.stack([x, y], axis=-1)
+    if 'Transverse_Mercator' in wkt:
+        parameters = {name: float(value) for name, value in
+                      re.findall(r'PARAMETER\["([^"]+)",\s*([-\d.Ee+]+)\]', wkt)}
+        lon, lat = transverse_mercator_to_geodetic(
+            x, y, parameters.get('central_meridian', 0.0), parameters.get('scale_factor', 1.0),
+            parameters.get('false_easting', 0.0), parameters.get('false_northing', 0.0),
+            parameters.get('latitude_of_origin', 0.0))
+        return np.stack([lon, lat], axis=-1)
+    return None
+
+
+def _segments_intersect(p1, p2, q1, q2):
+    # Proper or touching intersection of segment p1-p2 with segment q1-q2 using orientation tests
+    def cross(o, a, b):
+        return (a[..., 0] - o[..., 0]) * (b[..., 1] - o[..., 1]) - (a[..., 1] - o[..., 1]) * (b[..., 0] - o[..., 0])
+
+    d1 = cross(q1, q2, p1)
+    d2 = cross(q1, q2, p2)
+    d3 = cross(p1, p2, q1)
+    d4 = cross(p1, p2, q2)
+    return (d1 * d2 <= 0) & (d3 * d4 <= 0)
@@ -0,0 +1,155 @@
+import numpy as np
+
+from .utils import parse_utc
+
+POSITION_NAMES = ['x_pos', 'y_pos', 'z_pos']
+VELOCITY_NAMES = ['x_vel', 'y_vel', 'z_vel']
+
+
+class OrbitStateVectors:
+
+    def __init__(self, element):
+        """
+        Class containing typed orbit state vectors of an `Orbit_State_Vectors` metadata element
+
+        :param element: `Orbit_State_Vectors` MDElem element. An empty orbit is created if None.
+        """
+        self._times, self._positions, self._velocities = self._load_orbit_state_vectors(element)
+
+    def __len__(self):
+        return len(self._times)
+
+    @property
+    def times(self) -> np.ndarray:
+        """
+        UTC time of each orbit state vector
+        """
+        return self._times
+
+    @property
+    def positions(self) -> np.ndarray:
+        """
+        Array of shape (vectors, 3) containing the ECEF satellite position in metres
+        """
+        return self._positions
+
+    @property
+    def velocities(self) -> np.ndarray:
+        """
+        Array of shape (vectors, 3) containing the ECEF satellite velocity in metres per second
+        """
+        return self._velocities
+
+    def interpolate(self, times, order=8) -> tuple:
+        """
+        Interpolate satellite position and velocity at arbitrary times using Lagrange polynomials over the nearest
+        orbit state vectors. Returns a tuple of (positions, velocities) with a trailing axis of size 3. Times outside
+        the span of the orbit state vectors are not extrapolated and return NaN.
+
+        :param times: Array of UTC times. Anything accepted by numpy as datetime64 can be used.
+        :param order: Number of orbit state vectors used for each interpolation
+        """
+        seconds = self.to_seconds(times)
+        positions, velocities = self._interpolate_seconds(seconds, order)
+        outside = ~self.in_span(seconds)
+        positions[outside] = np.nan
+        velocities[outside] = np.nan
+        return positions, velocities
+
+    def in_span(self, seconds) -> np.ndarray:
+        """
+        Check which times lie between the first and last orbit state vector. Returns a boolean array.
+
+        :param seconds: Array of seconds relative to the first orbit state vector
+        """
+        span = (self._times[-1] - self._times[0]).astype('int64') / 1e6
+        seconds = np.asarray(seconds, dtype='float64')
+        return (seconds >= 0) & (seconds <= span)
+
+    def to_seconds(self, times) -> np.ndarray:
+        """
+        Convert times into float64 seconds relative to the first orbit state vector
+
+        :param times: Array of UTC times. Anything accepted by numpy as datetime64 can be used.
+        """
+        if len(self) == 0:
+            raise ValueError('No orbit state vectors available')
+        delta = np.asarray(times, dtype='datetime64[ns]') - self._times[0]
+        return delta.astype('int64') / 1e9
+
+    def from_seconds(self, seconds) -> np.ndarray:
+        """
+        Convert float64 seconds relative to the first orbit state vector into datetime64[us] times
+
+        :param seconds: Array of seconds
+        """
+        microseconds = np.round(np.asarray(seconds, dtype='float64') * 1e6).astype('int64')
+        return self._times[0] + microseconds.astype('timedelta64[us]')
+
+    def zero_doppler_seconds(self, xyz, initial=None, iterations=20, tolerance=1e-7) -> np.ndarray:
+        """
+        Find the zero doppler time of ECEF targets, i.e. the time where the line of sight is perpendicular to the
+        satellite velocity, with vectorized Newton iterations. Returns float64 seconds relative to the first orbit
+        state vector. Targets whose zero doppler time lies outside the span of the orbit state vectors return NaN.
+
+        :param xyz: Array of shape (targets, 3) containing ECEF coordinates
+        :param initial: Initial time in seconds. Default None starts in the middle of the orbit.
+        :param iterations: Maximum number of Newton iterations
+        :param tolerance: Stop when the largest time update in seconds is below this value
+        """
+        xyz = np.asarray(xyz, dtype='float64').reshape(-1, 3)
+        if initial is None:
+            initial = self.to_seconds(self._times[-1]) / 2
+        seconds = np.full(len(xyz), initial, dtype='float64')
+        for _ in range(iterations):
+            positions, velocities = self._interpolate_seconds(seconds)
+            # Acceleration from a finite difference of the interpolated velocity
+            _, next_velocities = self._interpolate_seconds(seconds + 1e-3)
+            acceleration = (next_velocities - velocities) / 1e-3
+            delta = xyz - positions
+            doppler = np.einsum('ij,ij->i', delta, velocities)
+            derivative = np.einsum('ij,ij->i', delta, acceleration) - np.einsum('ij,ij->i', velocities, velocities)
+            step = doppler / derivative
+            seconds = seconds - step
+            if np.max(np.abs(step), initial=0) < tolerance:
+                break
+        seconds[~self.in_span(seconds)] = np.nan
+        return seconds
+
+    def _interpolate_seconds(self, seconds, order=8):
+        seconds = np.asarray(seconds, dtype='float64')
+        nodes = (self._times - self._times[0]).astype('int64') / 1e6
+        order = min(order, len(nodes))
+
+        # Window of the `order` nearest state vectors for each time
+        start = np.clip(np.searchsorted(nodes, seconds) - order // 2, 0, len(nodes) - order)
+        window = start[..., None] + np.arange(order)
+        node_times = nodes[window]
+
+        weights = np.ones(node_times.shape)
+        for j in range(order):
+            for k in range(order):
+                if j != k:
+                    weights[..., j] *= (seconds - node_times[..., k]) / (node_times[..., j] - node_times[..., k])
+
+        positions = np.einsum('...m,...mc->...c', weights, self._positions[window])
+        velocities = np.einsum('...m,...mc->...c', weights, self._velocities[window])
+        return positions, velocities
+
+    @staticmethod
+    def _load_orbit_state_vectors(element):
+        vectors = [] if element is None else element.findall('MDElem')
+        if not vectors:
+            return np.array([], dtype='datetime64[us]'), np.empty((0, 3)), np.empty((0, 3))
+
+        # All orbit vectors share the same attribute layout so the attribute positions are only looked up once
+        names = [x.attrib.get('name') for x in vectors[0]]
+        time_idx = names.index('time')
+        position_idx = [names.index(x) for x in POSITION_NAMES]
+        velocity_idx = [names.index(x) for x in VELOCITY_NAMES]
+
+        texts = [[x.text for x in vector] for vector in vectors]
+        values = np.array([[row[idx] for idx in position_idx + velocity_idx] for row in texts], dtype='float64')
+        times = parse_utc([row[time_idx] for row in texts])
+
+        return times, values[:, :3], values[:, 3:]
@@ -1,8 +1,13 @@
+from ..instrumentation import instrumented
+from .utils import METADATA_XPATH
+
+
 class ProcessingGraph:
 
     def __init__(self, metadata, product):
         self._metadata = metadata
         self._product = product
+        self._nodes = None
 
     def get_processing_graph(self, node_index=None, operator=None) -> dict:
         """
@@ -11,19 +16,52 @@ class ProcessingGraph:
         :param node_index: Load processing history for a specific node
         :param operator: Load a specific operator
         """
-        # Get parameters
+        if self._nodes is None:
+            self._nodes = self._load_nodes()
+        # Copy the cached nodes so callers can change the output
+        node_list = [dict(x, sources=None if x['sources'] is None else dict(x['sources']),
+                          parameters=dict(x['parameters'])) for x in self._nodes]
+
+        if node_index is None:
+            if operator is None:
+                return node_list
+            else:
+                output_dict = {}
+                for node in node_list:
+                    output_dict[node['node']] = node[operator]
+                return output_dict
+
+        else:
+            if operator is None:
+                return node_list[node_index]
+            else:
+                return node_list[node_index][operator]
+
+    def _release(self):
+        if self._nodes is None:
+            self._nodes = self._load_nodes()
+        self._metadata = None
+
+    @instrumented('processing_graph', f'{METADATA_XPATH}/MDElem[@name="Processing_Graph"]')
+    def _load_nodes(self):
         node_list = []
         # Loop through nodes
         for idx, child in enumerate(self._metadata.findall(".//MDElem[@name='Processing_Graph']/*")):
             node_data = {'node': f'node.{idx}'}
+            sources = []
+            parameters = []
             # Loop through elements in each node
-            for grandchild in list(child):
+            for grandchild in child:
+                if grandchild.tag == 'MDElem':
+                    if grandchild.get('name') == 'sources':
+                        sources = list(grandchild)
+                    elif grandchild.get('name') == 'parameters':
+                        parameters = list(grandchild)
                 if grandchild.text is not None:
                     if grandchild.text.rstrip():
                         node_data[grandchild.attrib['name']] = grandchild.text.rstrip()
 
             # Get sources
-            sources = self._metadata.findall(f".//MDElem[@name='node.{idx}']/MDElem[@name='sources']/*")
             if not sources:
                 sources_dict = None
             else:
@@ -32,29 +70,13 @@ class ProcessingGraph:
                     sources_dict[source.attrib['name']] = source.text
             node_data['sources'] = sources_dict
 
-            param_elem = self._metadata.findall(
-                f".//MDElem[@name='Processing_Graph']/MDElem[@name='node.{idx}']/MDElem[@name='parameters']/*")
             # Save parameters in node
             node_parameters = {}
-            for param in param_elem:
+            for param in parameters:
                 node_parameters[param.attrib['name']] = param.text
             node_data['parameters'] = node_parameters
             node_list.append(node_data)
-
-        if node_index is None:
-            if operator is None:
-                return node_list
-            else:
-                output_dict = {}
-                for node in node_list:
-                    output_dict[node['node']] = node[operator]
-                return output_dict
-
-        else:
-            if operator is None:
-                return node_list[node_index]
-            else:
-                return node_list[node_index][operator]
+        return node_list
 
 
 if __name__ == '__main__':
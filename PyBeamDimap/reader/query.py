@@ -0,0 +1,187 @@
+# Path-addressed queries over the MDElem and MDATTR names of the metadata section
+import functools
+import re
+
+import numpy as np
+
+from .utils import METADATA_XPATH, convert_values, parse_utc
+
+# Joins the element names of a path in the index. Element names never contain control characters.
+SEPARATOR = '\x1f'
+
+# DIMAP (02-SEP-2019 07:57:47.909601) or ISO (2019-09-02T07:57:47.909601) times
+TIME_PATTERN = re.compile(r'\d{2}-[A-Za-z]{3}-\d{4} \d|\d{4}-\d{2}-\d{2}T\d')
+
+
+class CompiledPath:
+    __slots__ = ('path', 'regex', 'leaf')
+
+    def __init__(self, path):
+        """
+        Name path compiled into a regular expression over the joined element names of the index. Paths are element
+        names separated by `/`. A `*` within a name matches any characters of one name, `?` matches one character and
+        a `**` segment matches any number of nested elements.
+
+        :param path: Name path, e.g. Original_Product_Metadata/annotation/*/product/geolocationGrid/**/latitude
+        """
+        segments = [x for x in path.strip('/').split('/') if x]
+        if not segments:
+            raise ValueError(f'Invalid metadata path "{path}"')
+
+        parts = []
+        globstar = False
+        for segment in segments:
+            if segment == '**':
+                globstar = True
+                continue
+            if parts:
+                parts.append(f'{SEPARATOR}(?:[^{SEPARATOR}]*{SEPARATOR})*' if globstar else SEPARATOR)
+            elif globstar:
+                parts.append(f'(?:[^{SEPARATOR}]*{SEPARATOR})*')
+            parts.append(''.join(f'[^{SEPARATOR}]*' if x == '*' else f'[^{SEPARATOR}]' if x == '?' else re.escape(x)
+                                 for x in segment))
+            globstar = False
+        if globstar:
+            parts.append(f'(?:{SEPARATOR}[^{SEPARATOR}]*)*' if parts else '.*')
+
+        self.path = path
+        self.regex = re.compile(''.join(parts), re.DOTALL)
+        # Paths ending with a plain name only need to be tested against index entries with that name
+        last = segments[-1]
+        self.leaf = None if '*' in last or '?' in last else last
+
+    def __repr__(self):
+        return f'CompiledPath({self.path!r})'
+
+
+@functools.lru_cache(maxsize=256)
+def compile_path(path) -> CompiledPath:
+    """
+    Compile a name path. Compiled paths are cached so repeated queries do not compile the path again.
+
+    :param path: Name path
+    """
+    return CompiledPath(path)
+
+
+class MetadataIndex:
+
+    def __init__(self, metadata, xpath=METADATA_XPATH):
+        """
+        Flat index of all MDElem and MDATTR elements of the metadata section. Each element is stored with the path of
+        element names leading to it so name paths can be matched without walking the XML tree.
+
+        :param metadata: ElementTree object containing parsed .dim data
+        :param xpath: XPath of the section that is indexed
+        """
+        self._paths = []
+        self._attribute = []
+        self._types = []
+        self._units = []
+        self._texts = []
+        self._leaves = {}
+        self._matches = {}
+
+        section = metadata.find(xpath)
+        if section is not None:
+            self._build(section)
+
+    def __len__(self):
+        return len(self._paths)
+
+    def find(self, path) -> np.ndarray:
+        """
+        Find the index positions of the elements matching a name path. Positions are in document order.
+
+        :param path: Name path
+        """
+        positions = self._matches.get(path)
+        if positions is None:
+            compiled = compile_path(path)
+            if compiled.leaf is None:
+                candidates = range(len(self._paths))
+            else:
+                candidates = self._leaves.get(compiled.leaf, ())
+            match = compiled.regex.fullmatch
+            positions = np.array([x for x in candidates if match(self._paths[x])], dtype='int64')
+            self._matches[path] = positions
+        return positions
+
+    def paths(self, path) -> list:
+        """
+        Load the full name paths of the elements matching a name path
+
+        :param path: Name path
+        """
+        return [self._paths[x].replace(SEPARATOR, '/') for x in self.find(path)]
+
+    def values(self, path, data_type=None, infer=True) -> np.ndarray:
+        """
+        Load the values of the MDATTR elements matching a name path as a typed array. The array type follows the
+        MDATTR `type` attribute of the first match, e.g. float64, utc (datetime64[us]) or ascii (str).
+
+        :param path: Name path
+        :param data_type: MDATTR type used instead of the type of the first match
+        :param infer: If True, ascii values are returned as integers, floats or times when all values can be converted.
+            The original product annotation stores all values as ascii.
+        """
+        positions = [x for x in self.find(path) if self._attribute[x]]
+        if data_type is None:
+            data_type = next((self._types[x] for x in positions if self._types[x]), None)
+        values = [self._texts[x] for x in positions]
+        if infer and data_type == 'ascii':
+            return _infer_values(values)
+        return convert_values(values, data_type)
+
+    def units(self, path) -> list:
+        """
+        Load the units of the MDATTR elements matching a name path
+
+        :param path: Name path
+        """
+        return [self._units[x] for x in self.find(path) if self._attribute[x]]
+
+    def _build(self, section):
+        # Depth first walk with one child iterator per open element so positions follow the document order
+        stack = [(iter(section), '')]
+        while stack:
+            children, prefix = stack[-1]
+            child = next(children, None)
+            if child is None:
+                stack.pop()
+                continue
+            name = child.get('name')
+            if name is None:
+                continue
+
+            path = f'{prefix}{SEPARATOR}{name}' if prefix else name
+            self._leaves.setdefault(name, []).append(len(self._paths))
+            self._paths.append(path)
+            if child.tag == 'MDATTR':
+                self._attribute.append(True)
+                self._types.append(child.get('type'))
+                self._units.append(child.get('unit'))
+                self._texts.append(child.text)
+            else:
+                self._attribute.append(False)
+                self._types.append(None)
+                self._units.append(None)
+                self._texts.append(None)
+                stack.append((iter(child), path))
+
+
+def _infer_values(values):
+    texts = [x.strip() for x in values if x is not None and x.strip()]
+    if not texts:
+        return convert_values(values, 'ascii')
+    try:
+        # Integers fall back to floats when any value is not an integer
+        return convert_values(values, 'int64')
+    except ValueError:
+        pass
+    if all(TIME_PATTERN.match(x) for x in texts):
+        try:
+            return parse_utc(values)
+        except ValueError:
+            pass
+    return convert_values(values, 'ascii')
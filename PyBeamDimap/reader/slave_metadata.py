@@ -0,0 +1,196 @@
+import numpy as np
+
+from ..instrumentation import phase
+from .orbit import OrbitStateVectors
+from .utils import SLAVE_METADATA_XPATH, convert_values, parse_utc
+
+
+class AttributeLayout:
+
+    def __init__(self, attributes):
+        """
+        Attribute layout shared by abstracted metadata copies. Secondary acquisitions of a stack carry the same
+        attributes in the same order so the names, types, units and descriptions are stored once per layout instead of
+        once per acquisition.
+
+        :param attributes: List of MDATTR elements
+        """
+        self.names = tuple(x.attrib.get('name') for x in attributes)
+        self.types = tuple(x.attrib.get('type') for x in attributes)
+        self.units = tuple(x.attrib.get('unit') for x in attributes)
+        self.descriptions = tuple(x.attrib.get('desc') for x in attributes)
+        self.positions = {name: idx for idx, name in enumerate(self.names)}
+
+
+class SecondaryAcquisition:
+
+    def __init__(self, name, element, layout, values):
+        """
+        Metadata of one secondary acquisition in the Slave_Metadata section of a coregistered stack
+
+        :param name: Name of the acquisition element, e.g. 20190914_Orb_14Sep2019
+        :param element: MDElem element of the acquisition
+        :param layout: AttributeLayout shared with the other acquisitions
+        :param values: List of attribute values ordered by the layout
+        """
+        self.name = name
+        self._element = element
+        self._layout = layout
+        self._values = values
+        self._orbit_state_vectors = None
+
+    @property
+    def attributes(self) -> dict:
+        """
+        Dict containing all non-nested attributes of the acquisition
+        """
+        return dict(zip(self._layout.names, self._values))
+
+    @property
+    def first_line_time(self) -> np.datetime64:
+        """
+        First zero doppler azimuth time of the acquisition
+        """
+        return parse_utc([self.get_attribute('first_line_time')])[0]
+
+    @property
+    def last_line_time(self) -> np.datetime64:
+        """
+        Last zero doppler azimuth time of the acquisition
+        """
+        return parse_utc([self.get_attribute('last_line_time')])[0]
+
+    @property
+    def orbit_state_vectors(self) -> OrbitStateVectors:
+        """
+        Typed orbit state vectors of the acquisition. These are only loaded when first accessed.
+        """
+        if self._orbit_state_vectors is None:
+            self._orbit_state_vectors = OrbitStateVectors(self._element.find('MDElem[@name="Orbit_State_Vectors"]'))
+        return self._orbit_state_vectors
+
+    def get_attribute(self, name, attribute_type='Value') -> str:
+        """
+        Load attribute of the acquisition. Does not include nested sections.
+
+        :param name: Attribute to search for
+        :param attribute_type: Accepted attribute types are [Value, Type, Unit, Description]
+        """
+        idx = self._layout.positions.get(name)
+        if idx is None:
+            raise ValueError(f'Element "{name}" not found in metadata of "{self.name}"')
+
+        attr_type = attribute_type.title()
+        if attr_type == 'Value':
+            return self._values[idx]
+        elif attr_type == 'Type':
+            return self._layout.types[idx]
+        elif attr_type == 'Unit':
+            return self._layout.units[idx]
+        elif attr_type == 'Description':
+            return self._layout.descriptions[idx]
+        else:
+            raise ValueError(f'Attribute type "{attribute_type}" is not valid')
+
+
+class SlaveMetadata:
+
+    def __init__(self, metadata):
+        """
+        Class for handling the Slave_Metadata section of coregistered Sentinel-1 stacks. The acquisitions are only
+        materialized when they are accessed.
+
+        :param metadata: ElementTree object containing parsed .dim data
+        """
+        self._metadata = metadata
+        self._elements = {}
+        self._layouts = {}
+        self._acquisitions = {}
+
+        section = self._metadata.find(SLAVE_METADATA_XPATH)
+        self.master_bands = None
+        if section is not None:
+            with phase('slave_metadata', section):
+                for child in section:
+                    if child.tag == 'MDElem':
+                        self._elements[child.attrib['name']] = child
+                    elif child.attrib.get('name') == 'Master_bands' and child.text:
+                        self.master_bands = child.text.split()
+
+    def __len__(self):
+        return len(self._elements)
+
+    def __iter__(self):
+        for name in self._elements:
+            yield self.get_acquisition(name)
+
+    @property
+    def acquisitions(self) -> list:
+        """
+        Names of the secondary acquisitions
+        """
+        return list(self._elements)
+
+    @property
+    def first_line_times(self) -> np.ndarray:
+        """
+        First zero doppler azimuth time of each secondary acquisition
+        """
+        return self.get_column('first_line_time')
+
+    def get_acquisition(self, name):
+        """
+        Load metadata of a secondary acquisition
+
+        :param name: Name of the acquisition or its position in the section
+        """
+        if isinstance(name, int):
+            name = self.acquisitions[name]
+        if name not in self._elements:
+            raise ValueError(f'Acquisition "{name}" not found in slave metadata')
+
+        acquisition = self._acquisitions.get(name)
+        if acquisition is None:
+            acquisition = self._load_acquisition(name)
+            self._acquisitions[name] = acquisition
+        return acquisition
+
+    def _release(self):
+        # Materialize all acquisitions and their orbits so the elements can be dropped
+        for acquisition in self:
+            acquisition.orbit_state_vectors
+            acquisition._element = None
+        self._elements = dict.fromkeys(self._elements)
+        self._metadata = None
+
+    def get_column(self, name) -> np.ndarray:
+        """
+        Load an attribute for all secondary acquisitions as a typed array. Acquisitions without the attribute are
+        returned as missing values.
+
+        :param name: Attribute name, e.g. ABS_ORBIT or first_line_time
+        """
+        values = []
+        data_type = None
+        for acquisition in self:
+            idx = acquisition._layout.positions.get(name)
+            if idx is None:
+                values.append(None)
+                continue
+            values.append(acquisition._values[idx])
+            data_type = data_type or acquisition._layout.types[idx]
+        return convert_values(values, data_type)
+
+    def _load_acquisition(self, name):
+        element = self._elements[name]
+        with phase('slave_metadata.acquisition', element):
+            attributes = [x for x in element if x.tag == 'MDATTR']
+
+            # Reuse the layout of a previous acquisition when the attribute names match
+            names = tuple(x.attrib.get('name') for x in attributes)
+            layout = self._layouts.get(names)
+            if layout is None:
+                layout = AttributeLayout(attributes)
+                self._layouts[names] = layout
+
+            return SecondaryAcquisition(name, element, layout, [x.text for x in attributes])
@@ -0,0 +1,126 @@
+import numpy as np
+
+from .utils import parse_utc
+
+
+class SrgrCoefficients:
+
+    def __init__(self, element):
+        """
+        Class containing the slant range to ground range (SRGR) polynomials of a `SRGR_Coefficients` metadata element.
+        The slant range of a ground range value is given by sum(c_i * (ground_range - ground_range_origin) ** i).
+
+        :param element: `SRGR_Coefficients` MDElem element
+        """
+        self._times, self._origins, self._coefficients = self._load_srgr_coefficients(element)
+
+    def __len__(self):
+        return len(self._times)
+
+    @property
+    def times(self) -> np.ndarray:
+        """
+        Zero doppler time of each coefficient set
+        """
+        return self._times
+
+    @property
+    def ground_range_origins(self) -> np.ndarray:
+        """
+        Ground range origin of each coefficient set in metres
+        """
+        return self._origins
+
+    @property
+    def coefficients(self) -> np.ndarray:
+        """
+        Array of shape (coefficient sets, polynomial degree + 1) containing the polynomial coefficients in increasing
+        order. Coefficient sets with a lower degree are padded with zeros.
+        """
+        return self._coefficients
+
+    def ground_to_slant(self, azimuth_time, ground_range) -> np.ndarray:
+        """
+        Convert ground range to slant range. The coefficients are linearly interpolated in time between the two
+        nearest coefficient sets.
+
+        :param azimuth_time: Array of zero doppler azimuth times, broadcastable against ground_range
+        :param ground_range: Array of ground range values in metres
+        """
+        coefficients, origins = self._interpolate(azimuth_time)
+        ground_range = np.asarray(ground_range, dtype='float64')
+        return _polyval(coefficients, ground_range - origins)
+
+    def slant_to_ground(self, azimuth_time, slant_range, iterations=10, tolerance=1e-6) -> np.ndarray:
+        """
+        Convert slant range to ground range by inverting the SRGR polynomial with vectorized Newton iterations
+
+        :param azimuth_time: Array of zero doppler azimuth times, broadcastable against slant_range
+        :param slant_range: Array of slant range values in metres
+        :param iterations: Maximum number of Newton iterations
+        :param tolerance: Stop when the largest slant range error in metres is below this value
+        """
+        coefficients, origins = self._interpolate(azimuth_time)
+        slant_range = np.asarray(slant_range, dtype='float64')
+        derivative = coefficients[..., 1:] * np.arange(1, coefficients.shape[-1])
+
+        # Start from the linear part of the polynomial
+        x = (slant_range - coefficients[..., 0]) / coefficients[..., 1]
+        for _ in range(iterations):
+            error = _polyval(coefficients, x) - slant_range
+            x = x - error / _polyval(derivative, x)
+            if np.nanmax(np.abs(error), initial=0) < tolerance:
+                break
+
+        return x + origins
+
+    def _interpolate(self, azimuth_time):
+        if len(self) == 0:
+            raise ValueError('No SRGR coefficients available')
+
+        azimuth_time = np.asarray(azimuth_time, dtype='datetime64[us]')
+        if len(self) == 1:
+            shape = azimuth_time.shape
+            return np.broadcast_to(self._coefficients[0], shape + self._coefficients.shape[1:]), \
+                np.broadcast_to(self._origins[0], shape)
+
+        times = self._times.astype('int64').astype('float64')
+        query = azimuth_time.astype('int64').astype('float64')
+        upper = np.clip(np.searchsorted(times, query), 1, len(times) - 1)
+        lower = upper - 1
+        weight = np.clip((query - times[lower]) / (times[upper] - times[lower]), 0, 1)
+
+        coefficients = self._coefficients[lower] + weight[..., None] * \
+            (self._coefficients[upper] - self._coefficients[lower])
+        origins = self._origins[lower] + weight * (self._origins[upper] - self._origins[lower])
+        return coefficients, origins
+
+    @staticmethod
+    def _load_srgr_coefficients(element):
+        coef_lists = [] if element is None else element.findall('MDElem')
+        times = []
+        origins = []
+        coefficients = []
+        for coef_list in coef_lists:
+            attributes = {x.attrib['name']: x.text for x in coef_list.findall('MDATTR')}
+            times.append(attributes.get('zero_doppler_time'))
+            origins.append(float(attributes.get('ground_range_origin') or 0))
+            coefficients.append([float(x.text) for x in coef_list.findall('MDElem/MDATTR[@name="srgr_coef"]')])
+
+        degree = max([len(x) for x in coefficients], default=0)
+        coefficient_array = np.zeros((len(coefficients), degree))
+        for idx, values in enumerate(coefficients):
+            coefficient_array[idx, :len(values)] = values
+
+        # Coefficient sets are interpolated in time so they are kept sorted
+        times = parse_utc(times)
+        order = np.argsort(times, kind='stable')
+        return times[order], np.array(origins, dtype='float64')[order], coefficient_array[order]
+
+
+def _polyval(coefficients, x):
+    # Horner evaluation with one coefficient set per value
+    output = np.zeros(np.broadcast(coefficients[..., 0], x).shape)
+    for idx in range(coefficients.shape[-1] - 1, -1, -1):
+        output = output * x + coefficients[..., idx]
+    return output
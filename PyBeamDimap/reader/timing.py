@@ -0,0 +1,163 @@
+import numpy as np
+
+from .utils import METADATA_XPATH, parse_utc
+
+SPEED_OF_LIGHT = 299792458.0
+
+SUBSET_INFO_XPATH = f'{METADATA_XPATH}/MDElem[@name="history"]/MDElem[@name="SubsetInfo"]'
+
+
+class RadarTiming:
+
+    def __init__(self, abstracted_metadata):
+        """
+        Timing model of a Sentinel-1 raster. Converts image lines and pixels into zero doppler azimuth time and slant
+        range (time) and back. The timing attributes are parsed once when the object is created.
+
+        Lines and pixels are positions in the product raster. Multilooking and subsetting are taken into account with
+        :func:`to_source` and :func:`from_source` which map product positions to the source image the product was
+        created from.
+
+        :param abstracted_metadata: AbstractedMetadata object of the product
+        """
+        get_attribute = abstracted_metadata.get_attribute
+
+        self.first_line_time = parse_utc([get_attribute('first_line_time')])[0].astype('datetime64[ns]')
+        self.last_line_time = parse_utc([get_attribute('last_line_time')])[0].astype('datetime64[ns]')
+        self.line_time_interval = float(get_attribute('line_time_interval'))
+        self.slant_range_to_first_pixel = float(get_attribute('slant_range_to_first_pixel'))
+        self.range_spacing = float(get_attribute('range_spacing'))
+        self.range_sampling_rate = float(get_attribute('range_sampling_rate')) * 1e6
+        self.num_lines = int(get_attribute('num_output_lines'))
+        self.num_samples = int(get_attribute('num_samples_per_line'))
+        self.azimuth_looks = float(get_attribute('azimuth_looks'))
+        self.range_looks = float(get_attribute('range_looks'))
+        self.subset_offset_x = int(get_attribute('subset_offset_x'))
+        self.subset_offset_y = int(get_attribute('subset_offset_y'))
+        self.subsampling_x, self.subsampling_y = abstracted_metadata._get_subsampling()
+
+        # Ground range products map pixels to slant range through the SRGR polynomials
+        srgr = abstracted_metadata.srgr
+        if get_attribute('srgr_flag') == '1' and srgr is not None and len(srgr) > 0:
+            self.srgr = srgr
+        else:
+            self.srgr = None
+
+    @property
+    def ground_range(self) -> bool:
+        """
+        True if pixels are converted to slant range using the SRGR polynomials
+        """
+        return self.srgr is not None
+
+    def line_to_time(self, lines) -> np.ndarray:
+        """
+        Convert image lines into zero doppler azimuth times. Returns datetime64[ns] values.
+
+        :param lines: Array of (fractional) line numbers
+        """
+        nanoseconds = np.round(np.asarray(lines, dtype='float64') * self.line_time_interval * 1e9).astype('int64')
+        return self.first_line_time + nanoseconds.astype('timedelta64[ns]')
+
+    def time_to_line(self, times) -> np.ndarray:
+        """
+        Convert zero doppler azimuth times into fractional image lines
+
+        :param times: Array of azimuth times. Anything accepted by numpy as datetime64 can be used.
+        """
+        delta = np.asarray(times, dtype='datetime64[ns]') - self.first_line_time
+        return delta.astype('int64') / 1e9 / self.line_time_interval
+
+    def pixel_to_slant_range(self, pixels, lines=None) -> np.ndarray:
+        """
+        Convert image pixels into one-way slant range in metres
+
+        :param pixels: Array of (fractional) pixel numbers
+        :param lines: Array of line numbers. Only required for ground range products where the SRGR polynomials
+            change with azimuth time.
+        """
+        pixels = np.asarray(pixels, dtype='float64')
+        if self.srgr is None:
+            return self.slant_range_to_first_pixel + pixels * self.range_spacing
+        return self.srgr.ground_to_slant(self._srgr_times(lines, pixels), pixels * self.range_spacing)
+
+    def slant_range_to_pixel(self, slant_range, lines=None) -> np.ndarray:
+        """
+        Convert one-way slant range in metres into fractional image pixels
+
+        :param slant_range: Array of slant range values in metres
+        :param lines: Array of line numbers. Only required for ground range products.
+        """
+        slant_range = np.asarray(slant_range, dtype='float64')
+        if self.srgr is None:
+            return (slant_range - self.slant_range_to_first_pixel) / self.range_spacing
+        return self.srgr.slant_to_ground(self._srgr_times(lines, slant_range), slant_range) / self.range_spacing
+
+    def pixel_to_range_time(self, pixels, lines=None) -> np.ndarray:
+        """
+        Convert image pixels into two-way slant range time in seconds
+
+        :param pixels: Array of (fractional) pixel numbers
+        :param lines: Array of line numbers. Only required for ground range products.
+        """
+        return self.pixel_to_slant_range(pixels, lines) * 2 / SPEED_OF_LIGHT
+
+    def range_time_to_pixel(self, range_time, lines=None) -> np.ndarray:
+        """
+        Convert two-way slant range time in seconds into fractional image pixels
+
+        :param range_time: Array of two-way slant range times in seconds
+        :param lines: Array of line numbers. Only required for ground range products.
+        """
+        return self.slant_range_to_pixel(np.asarray(range_time, dtype='float64') * SPEED_OF_LIGHT / 2, lines)
+
+    def to_source(self, lines, pixels) -> tuple:
+        """
+        Convert product positions into positions of the source image before subsetting and multilooking. A
+        multilooked pixel maps to the centre of the source pixels it was averaged from. Returns a tuple of
+        (lines, pixels) arrays.
+
+        :param lines: Array of product line numbers
+        :param pixels: Array of product pixel numbers
+        """
+        line_step = self.azimuth_looks * self.subsampling_y
+        pixel_step = self.range_looks * self.subsampling_x
+        source_lines = self.subset_offset_y + np.asarray(lines, dtype='float64') * line_step + (line_step - 1) / 2
+        source_pixels = self.subset_offset_x + np.asarray(pixels, dtype='float64') * pixel_step + (pixel_step - 1) / 2
+        return source_lines, source_pixels
+
+    def from_source(self, lines, pixels) -> tuple:
+        """
+        Convert positions of the source image before subsetting and multilooking into product positions. Returns a
+        tuple of (lines, pixels) arrays.
+
+        :param lines: Array of source line numbers
+        :param pixels: Array of source pixel numbers
+        """
+        line_step = self.azimuth_looks * self.subsampling_y
+        pixel_step = self.range_looks * self.subsampling_x
+        product_lines = (np.asarray(lines, dtype='float64') - self.subset_offset_y - (line_step - 1) / 2) / line_step
+        product_pixels = (np.asarray(pixels, dtype='float64') - self.subset_offset_x - (pixel_step - 1) / 2) / \
+            pixel_step
+        return product_lines, product_pixels
+
+    def _srgr_times(self, lines, values):
+        if lines is None:
+            if len(self.srgr) > 1:
+                raise ValueError('Lines are required to select the SRGR polynomials of a ground range product')
+            lines = np.zeros(np.shape(values))
+        return self.line_to_time(lines)
+
+
+def load_subsampling(metadata) -> tuple:
+    """
+    Load the subsampling of a subset from the processing history, e.g. SubSampling.x = 2 keeps every second pixel.
+    Returns a tuple of (x, y) subsampling factors.
+
+    :param metadata: ElementTree object containing parsed .dim data
+    """
+    subset_info = metadata.find(SUBSET_INFO_XPATH)
+    if subset_info is None:
+        return 1, 1
+    values = {x.attrib.get('name'): x.text for x in subset_info.findall('MDATTR')}
+    return int(values.get('SubSampling.x') or 1), int(values.get('SubSampling.y') or 1)
@@ -0,0 +1,196 @@
+# Compact read-only representation of parsed BEAM-DIMAP XML
+import sys
+import xml.etree.ElementPath as ElementPath
+import xml.etree.ElementTree as ET
+
+# Attribute values that repeat across most elements of a DIMAP file and are interned when parsed
+INTERNED_ATTRIBUTES = {'name', 'type', 'unit', 'mode', 'desc'}
+
+# Texts up to this length are shared between elements. This covers the indentation whitespace and short repeated
+# values such as 0.0 or 99999.
+SHARED_TEXT_LENGTH = 32
+
+_EMPTY = ()
+
+
+class Node:
+    __slots__ = ('tag', 'text', '_keys', '_values', '_children')
+
+    def __init__(self, tag, keys, values, text, children):
+        """
+        Read-only XML element. Nodes support the subset of the ElementTree Element interface used by the readers,
+        including `find` and `findall` with ElementPath expressions, so they can replace the parsed ElementTree.
+
+        Attribute names of nodes with the same attribute layout share one tuple and the attribute values are stored in
+        a tuple instead of a dict.
+
+        :param tag: Element tag
+        :param keys: Tuple of attribute names
+        :param values: Tuple of attribute values ordered as `keys`
+        :param text: Element text
+        :param children: Tuple of child nodes
+        """
+        self.tag = tag
+        self.text = text
+        self._keys = keys
+        self._values = values
+        self._children = children
+
+    def __repr__(self):
+        return f'<Node {self.tag!r} {dict(zip(self._keys, self._values))}>'
+
+    def __len__(self):
+        return len(self._children)
+
+    def __iter__(self):
+        return iter(self._children)
+
+    def __getitem__(self, index):
+        return self._children[index]
+
+    @property
+    def attrib(self) -> dict:
+        """
+        Dict containing the attributes of the node. Changing the dict does not change the node.
+        """
+        return dict(zip(self._keys, self._values))
+
+    def get(self, key, default=None):
+        """
+        Load an attribute of the node
+
+        :param key: Attribute name
+        :param default: Value returned when the attribute is missing
+        """
+        for idx, name in enumerate(self._keys):
+            if name == key:
+                return self._values[idx]
+        return default
+
+    def keys(self) -> tuple:
+        return self._keys
+
+    def items(self) -> list:
+        return list(zip(self._keys, self._values))
+
+    def iter(self, tag=None):
+        """
+        Iterate over the node and all its descendants in document order
+
+        :param tag: Only return nodes with this tag. Default None or `*` returns all nodes.
+        """
+        if tag == '*':
+            tag = None
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            if tag is None or node.tag == tag:
+                yield node
+            stack.extend(reversed(node._children))
+
+    def itertext(self):
+        # Tails are not stored. DIMAP elements never mix text and child elements.
+        for node in self.iter():
+            if node.text:
+                yield node.text
+
+    def find(self, path):
+        return ElementPath.find(self, path)
+
+    def findall(self, path) -> list:
+        return ElementPath.findall(self, path)
+
+    def iterfind(self, path):
+        return ElementPath.iterfind(self, path)
+
+    def findtext(self, path, default=None):
+        return ElementPath.findtext(self, path, default)
+
+
+def parse_compact(source) -> Node:
+    """
+    Parse a BEAM-DIMAP file into a tree of compact nodes. Nodes are built directly from the parser events so the full
+    ElementTree is never held in memory. Returns the root node.
+
+    :param source: Path or binary file object of the .dim file
+    """
+    parser = ET.XMLParser(target=_NodeBuilder())
+    if hasattr(source, 'read'):
+        return _feed(parser, source)
+    with open(source, 'rb') as f:
+        return _feed(parser, f)
+
+
+def from_element(element) -> Node:
+    """
+    Convert a parsed ElementTree element and its descendants into compact nodes
+
+    :param element: ElementTree element
+    """
+    layouts = {}
+    texts = {}
+
+    def convert(elem):
+        children = tuple(convert(x) for x in elem) if len(elem) else _EMPTY
+        return _make_node(elem.tag, elem.attrib, elem.text, children, layouts, texts)
+
+    return convert(element)
+
+
+class _NodeBuilder:
+    # Parser target that builds nodes from the start, data and end events of the parser
+
+    def __init__(self):
+        self._layouts = {}
+        self._texts = {}
+        self._stack = []
+        self._data = []
+        self._root = None
+
+    def start(self, tag, attrib):
+        # Text of an element is the data before its first child
+        if self._stack and self._data:
+            parent = self._stack[-1]
+            if parent[3] is None and not parent[2]:
+                parent[3] = ''.join(self._data)
+        self._data = []
+        self._stack.append([tag, attrib, [], None])
+
+    def data(self, data):
+        self._data.append(data)
+
+    def end(self, tag):
+        tag, attrib, children, text = self._stack.pop()
+        if text is None and not children and self._data:
+            text = ''.join(self._data)
+        self._data = []
+
+        node = _make_node(tag, attrib, text, tuple(children) if children else _EMPTY, self._layouts, self._texts)
+        if self._stack:
+            self._stack[-1][2].append(node)
+        else:
+            self._root = node
+
+    def close(self):
+        return self._root
+
+
+def _feed(parser, f):
+    while True:
+        chunk = f.read(1 << 20)
+        if not chunk:
+            return parser.close()
+        parser.feed(chunk)
+
+
+def _make_node(tag, attrib, text, children, layouts, texts):
+    keys = tuple(attrib)
+    layout = layouts.get(keys)
+    if layout is None:
+        layout = tuple(sys.intern(x) for x in keys)
+        layouts[keys] = layout
+    values = tuple(sys.intern(value) if key in INTERNED_ATTRIBUTES else value for key, value in attrib.items())
+
+    if text is not None and len(text) <= SHARED_TEXT_LENGTH:
+        text = texts.setdefault(text, text)
+    return Node(sys.intern(tag), layout, values, text, children)
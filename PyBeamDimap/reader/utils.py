@@ -0,0 +1,302 @@
+# Helper functions shared by the BEAM-DIMAP section readers
+from datetime import datetime
+
+import numpy as np
+
+# SNAP stores several times (e.g. burst boundary line times) as seconds since 2000-01-01 00:00:00 UTC (MJD2000)
+MJD2000_EPOCH = np.datetime64('2000-01-01T00:00:00', 'us')
+
+# Format of the `utc` typed MDATTR values, e.g. 02-SEP-2019 07:57:47.909601
+DIMAP_TIME_FORMAT = '%d-%b-%Y %H:%M:%S.%f'
+DIMAP_TIME_LENGTH = 27
+DIMAP_TIME_SEPARATOR_POSITIONS = [2, 6, 11, 14, 17, 20]
+DIMAP_TIME_SEPARATORS = np.array([ord(x) for x in '-- ::.'], dtype=np.uint32)
+
+# Month names of DIMAP times packed into integers by `_month_number`, sorted for binary search
+_MONTHS = ['JAN', 'FEB', 'MAR', 'APR', 'MAY', 'JUN', 'JUL', 'AUG', 'SEP', 'OCT', 'NOV', 'DEC']
+_MONTH_KEYS, _MONTH_NUMBERS = (np.array(x, dtype='int64') for x in zip(*sorted(
+    ((ord(x[0]) << 16) | (ord(x[1]) << 8) | ord(x[2]), idx + 1) for idx, x in enumerate(_MONTHS))))
+
+# Location of the metadata sections. These are anchored at the document root so that nested copies of a section,
+# such as the per-acquisition copies in Slave_Metadata, are never matched.
+METADATA_XPATH = './Dataset_Sources/MDElem[@name="metadata"]'
+ABSTRACTED_METADATA_XPATH = f'{METADATA_XPATH}/MDElem[@name="Abstracted_Metadata"]'
+SLAVE_METADATA_XPATH = f'{METADATA_XPATH}/MDElem[@name="Slave_Metadata"]'
+
+# Numpy dtypes of the MDATTR types. Integer types are widened so missing values do not overflow.
+MDATTR_DTYPES = {
+    'float64': 'float64',
+    'float32': 'float64',
+    'int8': 'int64',
+    'int16': 'int64',
+    'int32': 'int64',
+    'int64': 'int64',
+    'uint8': 'int64',
+    'uint16': 'int64',
+    'uint32': 'int64',
+}
+
+
+def import_pandas():
+    """
+    Import pandas when a dataframe is first requested. pandas is an optional dependency and is slow to import, so the
+    readers only import it when needed.
+    """
+    try:
+        import pandas
+    except ImportError:
+        raise ImportError('The pandas package is required for dataframes. Install it with `pip install pandas`.')
+    return pandas
+
+
+def mjd2000_to_datetime64(seconds) -> np.ndarray:
+    """
+    Convert seconds since 2000-01-01 (MJD2000 seconds) into datetime64[us] values
+
+    :param seconds: Scalar or array of MJD2000 seconds
+    """
+    microseconds = np.round(np.asarray(seconds, dtype='float64') * 1e6).astype('int64')
+    return MJD2000_EPOCH + microseconds.astype('timedelta64[us]')
+
+
+def parse_utc(values) -> np.ndarray:
+    """
+    Convert DIMAP (`02-SEP-2019 07:57:47.909601`) or ISO (`2019-09-02T07:57:47.909601`) time strings into
+    datetime64[us] values. Missing values are returned as NaT. DIMAP times are parsed in bulk from the fixed character
+    positions of their fields, ISO times are parsed by numpy and only other layouts, e.g. with a shorter fraction, are
+    parsed one by one.
+
+    :param values: List of time strings
+    """
+    texts = ['' if x is None else x.strip() for x in values]
+    output = np.full(len(texts), np.datetime64('NaT'), dtype='datetime64[us]')
+    if not texts:
+        return output
+
+    pending = np.array([bool(x) for x in texts])
+    array = np.array(texts, dtype=str)
+    if array.dtype.itemsize // 4 >= DIMAP_TIME_LENGTH:
+        candidates = np.flatnonzero(np.char.str_len(array) == DIMAP_TIME_LENGTH)
+        chars = array.view(np.uint32).reshape(len(texts), -1)[candidates, :DIMAP_TIME_LENGTH]
+        times, valid = _parse_dimap_times(chars)
+        output[candidates[valid]] = times[valid]
+        pending[candidates[valid]] = False
+
+    # ISO times have the date/time separator right after the date. DIMAP month names can contain a T (OCT).
+    remaining = np.flatnonzero(pending)
+    iso = [idx for idx in remaining if texts[idx][10:11] == 'T']
+    if iso:
+        output[iso] = np.array([texts[idx] for idx in iso], dtype='datetime64[us]')
+    for idx in remaining:
+        if texts[idx][10:11] != 'T':
+            output[idx] = datetime.strptime(texts[idx], DIMAP_TIME_FORMAT)
+    return output
+
+
+def parse_date(values) -> np.ndarray:
+    """
+    Convert DIMAP (`02Sep2019`) or ISO (`2019-09-02`) date strings into datetime64[D] values. DIMAP dates are parsed in
+    bulk from the fixed character positions of their fields.
+
+    :param values: List of date strings
+    """
+    output = np.full(len(values), np.datetime64('NaT'), dtype='datetime64[D]')
+    if not len(values):
+        return output
+
+    array = np.array([str(x) for x in values], dtype=str)
+    pending = np.ones(len(values), dtype=bool)
+    if array.dtype.itemsize // 4 >= 9:
+        candidates = np.flatnonzero(np.char.str_len(array) == 9)
+        chars = array.view(np.uint32).reshape(len(values), -1)[candidates, :9]
+        day, valid = _fixed_width_number(chars, 0, 2)
+        month, valid_month = _month_number(chars[:, 2:5])
+        year, valid_year = _fixed_width_number(chars, 5, 9)
+        dates, valid_date = _to_date(year, month, day)
+        valid &= valid_month & valid_year & valid_date
+        output[candidates[valid]] = dates[valid]
+        pending[candidates[valid]] = False
+
+    for idx in np.flatnonzero(pending):
+        output[idx] = np.datetime64(values[idx], 'D')
+    return output
+
+
+def _parse_dimap_times(chars):
+    # Fields of `02-SEP-2019 07:57:47.909601` at fixed character positions. Returns times and a mask of valid rows.
+    day, valid = _fixed_width_number(chars, 0, 2)
+    month, valid_month = _month_number(chars[:, 3:6])
+    year, valid_year = _fixed_width_number(chars, 7, 11)
+    hour, valid_hour = _fixed_width_number(chars, 12, 14)
+    minute, valid_minute = _fixed_width_number(chars, 15, 17)
+    second, valid_second = _fixed_width_number(chars, 18, 20)
+    microsecond, valid_microsecond = _fixed_width_number(chars, 21, 27)
+    dates, valid_date = _to_date(year, month, day)
+
+    valid &= valid_month & valid_year & valid_hour & valid_minute & valid_second & valid_microsecond & valid_date
+    valid &= (chars[:, DIMAP_TIME_SEPARATOR_POSITIONS] == DIMAP_TIME_SEPARATORS).all(axis=1)
+    valid &= (hour < 24) & (minute < 60) & (second < 60)
+
+    microseconds = ((hour * 60 + minute) * 60 + second) * 1000000 + microsecond
+    times = dates.astype('datetime64[us]') + microseconds.astype('timedelta64[us]')
+    return times, valid
+
+
+def _fixed_width_number(chars, start, stop):
+    digits = chars[:, start:stop].astype('int64') - ord('0')
+    valid = ((digits >= 0) & (digits <= 9)).all(axis=1)
+    return digits @ 10 ** np.arange(stop - start - 1, -1, -1, dtype='int64'), valid
+
+
+def _month_number(chars):
+    # Month names are matched case insensitive by packing the upper case letters into one integer
+    upper = np.where((chars >= ord('a')) & (chars <= ord('z')), chars - 32, chars).astype('int64')
+    keys = (upper[:, 0] << 16) | (upper[:, 1] << 8) | upper[:, 2]
+    positions = np.searchsorted(_MONTH_KEYS, keys).clip(max=len(_MONTH_KEYS) - 1)
+    valid = (_MONTH_KEYS[positions] == keys) & (chars < 128).all(axis=1)
+    return _MONTH_NUMBERS[positions], valid
+
+
+def _to_date(year, month, day):
+    # Invalid fields are replaced so the date arithmetic cannot overflow. Their rows are marked as invalid.
+    valid = (month >= 1) & (month <= 12) & (day >= 1)
+    months = np.where(valid, (year - 1970) * 12 + month - 1, 0).astype('datetime64[M]')
+    start = months.astype('datetime64[D]')
+    days_in_month = ((months + 1).astype('datetime64[D]') - start).astype('int64')
+    valid &= day <= days_in_month
+    return start + np.where(valid, day - 1, 0).astype('timedelta64[D]'), valid
+
+
+def convert_scalars(values, data_types) -> list:
+    """
+    Convert MDATTR texts into Python values using their MDATTR types. Integers and floats become int and float, utc
+    times become datetime64[us] scalars and other types are returned unchanged. Missing values are returned as None and
+    values that cannot be converted are returned unchanged. All times are parsed in one call.
+
+    :param values: List of MDATTR texts
+    :param data_types: List of MDATTR types such as float64, int32, utc or ascii
+    """
+    output = list(values)
+    times = []
+    for idx, (text, data_type) in enumerate(zip(values, data_types)):
+        if text is None or not text.strip():
+            output[idx] = None
+            continue
+        dtype = MDATTR_DTYPES.get(data_type)
+        try:
+            if dtype == 'float64':
+                output[idx] = float(text)
+            elif dtype == 'int64':
+                output[idx] = int(text)
+            elif data_type == 'utc':
+                times.append(idx)
+        except ValueError:
+            pass
+
+    if times:
+        try:
+            parsed = list(parse_utc([values[x] for x in times]))
+        except ValueError:
+            parsed = [_parse_time(values[x]) for x in times]
+        for idx, value in zip(times, parsed):
+            output[idx] = value
+    return output
+
+
+def _parse_time(value):
+    try:
+        return parse_utc([value])[0]
+    except ValueError:
+        return value
+
+
+def expand_ranges(start, count) -> np.ndarray:
+    """
+    Concatenate arange(s, s + c) for all ranges without a Python loop
+
+    :param start: Array of range starts
+    :param count: Array of range lengths
+    """
+    start = np.asarray(start, dtype='int64')
+    count = np.asarray(count, dtype='int64')
+    total = int(count.sum())
+    if total == 0:
+        return np.array([], dtype='int64')
+    offsets = np.repeat(start - np.cumsum(count) + count, count)
+    return offsets + np.arange(total)
+
+
+def indent_xml(element, space='    ', level=0):
+    """
+    Indent an ElementTree element and its descendants in place so the written XML has one element per line. Produces
+    the same layout as `xml.etree.ElementTree.indent`, which requires Python 3.9.
+
+    :param element: ElementTree element
+    :param space: Whitespace added per nesting level
+    :param level: Nesting level of the element
+    """
+    if not len(element):
+        return
+    indentation = '\n' + space * (level + 1)
+    if not element.text or not element.text.strip():
+        element.text = indentation
+    for child in element:
+        indent_xml(child, space, level + 1)
+        if not child.tail or not child.tail.strip():
+            child.tail = indentation
+    # The last child is followed by the end tag of the element
+    if not child.tail.strip():
+        child.tail = '\n' + space * level
+
+
+def points_in_polygon(x, y, polygon) -> np.ndarray:
+    """
+    Test which points are inside a polygon using vectorized even-odd ray casting over the polygon edges
+
+    :param x: Array of x coordinates (e.g. longitude)
+    :param y: Array of y coordinates (e.g. latitude)
+    :param polygon: Array of shape (vertices, 2) containing a closed ring
+    """
+    x = np.asarray(x, dtype='float64')
+    y = np.asarray(y, dtype='float64')
+    inside = np.zeros(np.broadcast(x, y).shape, dtype=bool)
+    x1, y1 = polygon[:-1, 0], polygon[:-1, 1]
+    x2, y2 = polygon[1:, 0], polygon[1:, 1]
+    for ax, ay, bx, by in zip(x1, y1, x2, y2):
+        if ay == by:
+            continue
+        crosses = (ay > y) != (by > y)
+        x_intersect = ax + (y - ay) * (bx - ax) / (by - ay)
+        inside ^= crosses & (x < x_intersect)
+    return inside
+
+
+def to_float_array(values) -> np.ndarray:
+    """
+    Convert a list of MDATTR text values into a float64 array. Missing values are returned as NaN.
+
+    :param values: List of numeric strings
+    """
+    return np.array([np.nan if x is None or not x.strip() else float(x) for x in values], dtype='float64')
+
+
+def convert_values(values, data_type) -> np.ndarray:
+    """
+    Convert a list of MDATTR text values into a typed array using the MDATTR `type` attribute. Values with the `utc`
+    type are converted into datetime64[us] and unknown types are returned as strings.
+
+    :param values: List of MDATTR text values
+    :param data_type: MDATTR type such as float64, int32, utc or ascii
+    """
+    if data_type == 'utc':
+        return parse_utc(values)
+    dtype = MDATTR_DTYPES.get(data_type)
+    if dtype == 'float64':
+        return to_float_array(values)
+    if dtype == 'int64':
+        try:
+            return np.array([int(x) for x in values], dtype='int64')
+        except (TypeError, ValueError):
+            # Missing integer values can only be represented as floats
+            return to_float_array(values)
+    return np.array(['' if x is None else x for x in values], dtype=str)
@@ -0,0 +1,195 @@
+# Handoff of parsed metadata arrays between processes through shared memory
+import os
+
+import numpy as np
+
+from .columnar import columns
+from .missions import Sentinel1
+
+# Tables shared by default. The geolocation grid, orbit and bursts are the largest numeric sections.
+DEFAULT_TABLES = ['orbit_state_vectors', 'doppler_centroid_coeffs', 'look_directions', 'baselines', 'bursts',
+                  'geolocation_grid']
+
+# Arrays start at multiples of this many bytes in the shared block
+ALIGNMENT = 64
+
+try:
+    from multiprocessing import resource_tracker, shared_memory
+except ImportError:
+    # multiprocessing.shared_memory was added in Python 3.8
+    resource_tracker = shared_memory = None
+
+
+class SharedArrays:
+    __slots__ = ('name', 'layout', 'size', '_shm', '_owner')
+
+    def __init__(self, name, layout, size, owner=False):
+        """
+        Handle of numpy arrays stored in one shared memory block. Handles are small and are pickled instead of the
+        arrays, e.g. when they are returned from a multiprocessing worker. The receiving process maps the arrays
+        without copying them with :func:`attach`.
+
+        One handle owns the block. Pickling an owning handle hands the block over to the process that loads it. The
+        owner frees the block with :func:`release` (or by using the handle as a context manager). Blocks of owning
+        handles that are garbage collected without being released are freed as well, and the multiprocessing resource
+        tracker frees them if the owning process ends first.
+
+        Requires Python 3.8 or newer. Handing blocks between processes requires a POSIX system. On Windows a block is
+        destroyed as soon as no process maps it, which happens when the worker returns the handle.
+
+        :param name: Name of the shared memory block
+        :param layout: Tuple of (key, dtype, shape, offset) of each array
+        :param size: Size of the block in bytes
+        :param owner: If True, this handle frees the block
+        """
+        self.name = name
+        self.layout = layout
+        self.size = size
+        self._shm = None
+        self._owner = owner
+
+    def __reduce__(self):
+        # The process that loads the handle becomes the owner, so this process must not free the block
+        if self._owner:
+            self._owner = False
+            _untrack(self.name)
+        return _receive, (self.name, self.layout, self.size)
+
+    def __del__(self):
+        if self._owner:
+            try:
+                self.release()
+            except (OSError, BufferError):
+                pass
+
+    def __repr__(self):
+        return f'SharedArrays(name={self.name!r}, arrays={len(self.layout)}, size={self.size})'
+
+    def __enter__(self) -> dict:
+        return self.attach()
+
+    def __exit__(self, *args):
+        self.release()
+
+    def keys(self) -> list:
+        return [x[0] for x in self.layout]
+
+    def attach(self) -> dict:
+        """
+        Map the shared block and return a dict of key and numpy array. The arrays are views of the shared memory and
+        are not copied. Copy arrays that must be kept after the block is released.
+        """
+        if self._shm is None:
+            self._shm = shared_memory.SharedMemory(name=self.name)
+        buffer = self._shm.buf
+        return {key: np.ndarray(shape, dtype=np.dtype(dtype), buffer=buffer, offset=offset)
+                for key, dtype, shape, offset in self.layout}
+
+    def close(self):
+        """
+        Unmap the shared block in this process. All arrays returned by :func:`attach` must be deleted first.
+        """
+        if self._shm is not None:
+            self._shm.close()
+            self._shm = None
+
+    def release(self):
+        """
+        Free the shared block and unmap it in this process. All arrays returned by :func:`attach` must be deleted
+        first.
+        """
+        if self._shm is None:
+            self._shm = shared_memory.SharedMemory(name=self.name)
+        self._owner = False
+        self._shm.unlink()
+        self.close()
+
+
+def share_arrays(arrays) -> SharedArrays:
+    """
+    Copy numpy arrays into a new shared memory block and return the handle that owns it. The block is unmapped in
+    the calling process but stays allocated until the owner of the handle releases it.
+
+    :param arrays: Dict of key and numpy array. Object arrays are not supported.
+    """
+    if shared_memory is None:
+        raise ImportError('Sharing arrays between processes requires Python 3.8 or newer')
+    layout = []
+    offset = 0
+    prepared = []
+    for key, values in arrays.items():
+        values = np.ascontiguousarray(values)
+        if values.dtype.hasobject:
+            raise ValueError(f'Array "{key}" has object dtype and cannot be shared')
+        offset = -(-offset // ALIGNMENT) * ALIGNMENT
+        layout.append((key, values.dtype.str, values.shape, offset))
+        prepared.append((values, offset))
+        offset += values.nbytes
+
+    shm = shared_memory.SharedMemory(create=True, size=max(offset, 1))
+    try:
+        for values, start in prepared:
+            target = np.ndarray(values.shape, dtype=values.dtype, buffer=shm.buf, offset=start)
+            target[...] = values
+            del target
+        handle = SharedArrays(shm.name, tuple(layout), shm.size, owner=True)
+    except BaseException:
+        shm.close()
+        shm.unlink()
+        raise
+    shm.close()
+    return handle
+
+
+def share_product(product, tables=None) -> SharedArrays:
+    """
+    Store the long format metadata tables of a Sentinel-1 product in shared memory. The arrays are keyed by
+    `table/column`, e.g. `orbit_state_vectors/x_pos`. See :func:`PyBeamDimap.columnar.columns` for the tables.
+
+    :param product: Sentinel1 object
+    :param tables: List of table names. Default None shares all tables of DEFAULT_TABLES.
+    """
+    arrays = {}
+    for table in DEFAULT_TABLES if tables is None else tables:
+        for column, values in columns(product, table).items():
+            arrays[f'{table}/{column}'] = values
+    return share_arrays(arrays)
+
+
+def load_shared(path, product='SLC', tables=None) -> SharedArrays:
+    """
+    Open a Sentinel-1 product and store its metadata tables in shared memory. This is meant to be mapped over paths in
+    worker processes, e.g. ``pool.map(load_shared, paths)``, so only the handles are sent back to the parent.
+
+    :param path: Path of .dim file
+    :param product: Sentinel-1 product type [SLC, GRD, OCN]
+    :param tables: List of table names. Default None shares all tables of DEFAULT_TABLES.
+    """
+    return share_product(Sentinel1(path, product), tables)
+
+
+def tables(arrays) -> dict:
+    """
+    Group attached arrays by table. Returns a dict of table name and dict of column arrays.
+
+    :param arrays: Dict returned by :func:`SharedArrays.attach`
+    """
+    grouped = {}
+    for key, values in arrays.items():
+        table, column = key.split('/', 1)
+        grouped.setdefault(table, {})[column] = values
+    return grouped
+
+
+def _receive(name, layout, size):
+    # Loads pickled handles. The block is registered with the resource tracker of the new owner, which frees it if
+    # this process ends without releasing it.
+    if os.name == 'posix':
+        resource_tracker.register(f'/{name}', 'shared_memory')
+    return SharedArrays(name, layout, size, owner=True)
+
+
+def _untrack(name):
+    # Python registers blocks with the resource tracker of the process that created them, which frees them at exit
+    if os.name == 'posix':
+        resource_tracker.unregister(f'/{name}', 'shared_memory')
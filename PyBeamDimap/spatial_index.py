@@ -0,0 +1,160 @@
+# In-memory spatial index over product footprints. No GIS dependency is required.
+import numpy as np
+
+from .reader.utils import expand_ranges
+
+
+class STRtree:
+
+    def __init__(self, bounds, node_capacity=16):
+        """
+        Static R-tree packed with the Sort-Tile-Recursive (STR) algorithm. Each level of the tree is stored as flat
+        arrays so queries descend the tree level by level with vectorized box tests instead of visiting nodes one by
+        one.
+
+        :param bounds: Array of shape (items, 4) containing (min_x, min_y, max_x, max_y) of each item
+        :param node_capacity: Maximum number of children of each node
+        """
+        bounds = np.asarray(bounds, dtype='float64').reshape(-1, 4)
+        if node_capacity < 2:
+            raise ValueError('Node capacity must be at least 2')
+
+        self.node_capacity = node_capacity
+        self._size = len(bounds)
+        self._levels = []
+        self._items = np.array([], dtype='int64')
+        if self._size:
+            self._build(bounds)
+
+    def __len__(self):
+        return self._size
+
+    @property
+    def depth(self) -> int:
+        """
+        Number of node levels in the tree
+        """
+        return len(self._levels)
+
+    def query_bbox(self, bbox) -> np.ndarray:
+        """
+        Find all items whose bounds intersect a bounding box. Returns the sorted item indices.
+
+        :param bbox: Bounding box as (min_x, min_y, max_x, max_y)
+        """
+        min_x, min_y, max_x, max_y = bbox
+        if not self._levels:
+            return np.array([], dtype='int64')
+
+        # Start at the root and keep the children of every node that intersects the query
+        candidates = np.arange(len(self._levels[-1][0]))
+        for boxes, start, count in reversed(self._levels):
+            box = boxes[candidates]
+            hits = candidates[(box[:, 0] <= max_x) & (box[:, 2] >= min_x) & (box[:, 1] <= max_y) &
+                              (box[:, 3] >= min_y)]
+            candidates = expand_ranges(start[hits], count[hits])
+
+        # Candidates are now positions in the packed item order
+        box = self._item_bounds[candidates]
+        hits = candidates[(box[:, 0] <= max_x) & (box[:, 2] >= min_x) & (box[:, 1] <= max_y) & (box[:, 3] >= min_y)]
+        return np.sort(self._items[hits])
+
+    def query_point(self, x, y) -> np.ndarray:
+        """
+        Find all items whose bounds contain a point. Returns the sorted item indices.
+
+        :param x: X coordinate (e.g. longitude)
+        :param y: Y coordinate (e.g. latitude)
+        """
+        return self.query_bbox((x, y, x, y))
+
+    def _build(self, bounds):
+        order = _str_order(bounds, self.node_capacity)
+        self._items = order
+        self._item_bounds = bounds[order]
+
+        # Group consecutive packed entries into nodes and repeat on the nodes until one root remains
+        boxes = self._item_bounds
+        while True:
+            node_start = np.arange(0, len(boxes), self.node_capacity, dtype='int64')
+            node_count = np.diff(np.append(node_start, len(boxes)))
+            node_boxes = np.column_stack([
+                np.minimum.reduceat(boxes[:, 0], node_start),
+                np.minimum.reduceat(boxes[:, 1], node_start),
+                np.maximum.reduceat(boxes[:, 2], node_start),
+                np.maximum.reduceat(boxes[:, 3], node_start),
+            ])
+            self._levels.append((node_boxes, node_start, node_count))
+            if len(node_boxes) <= self.node_capacity:
+                break
+
+            # Tile the nodes of this level before grouping them into parents. The nodes keep their child ranges
+            # so they can be reordered freely.
+            order = _str_order(node_boxes, self.node_capacity)
+            self._levels[-1] = (node_boxes[order], node_start[order], node_count[order])
+            boxes = self._levels[-1][0]
+
+
+class FootprintIndex:
+
+    def __init__(self, footprints, names=None, node_capacity=16):
+        """
+        Spatial index over product footprints. Candidates are found with an STR-packed R-tree over the footprint bounds
+        and refined with the exact footprint polygons.
+
+        :param footprints: List of Footprint objects
+        :param names: Optional list of product names returned by the queries instead of positions
+        :param node_capacity: Maximum number of children of each R-tree node
+        """
+        self._footprints = list(footprints)
+        if names is not None and len(names) != len(self._footprints):
+            raise ValueError('Number of names does not match the number of footprints')
+        self._names = None if names is None else list(names)
+        self._tree = STRtree([x.bounds for x in self._footprints], node_capacity)
+
+    def __len__(self):
+        return len(self._footprints)
+
+    def intersects(self, bbox, exact=True) -> list:
+        """
+        Find the products whose footprint intersects a bounding box
+
+        :param bbox: Bounding box as (min_lon, min_lat, max_lon, max_lat)
+        :param exact: If False, only the footprint bounds are compared
+        """
+        hits = self._tree.query_bbox(bbox)
+        if exact:
+            hits = [x for x in hits if self._footprints[x].intersects_bbox(bbox)]
+        return self._output(hits)
+
+    def contains(self, lon, lat, exact=True) -> list:
+        """
+        Find the products whose footprint contains a point
+
+        :param lon: Longitude of the point
+        :param lat: Latitude of the point
+        :param exact: If False, only the footprint bounds are compared
+        """
+        hits = self._tree.query_point(lon, lat)
+        if exact:
+            hits = [x for x in hits if self._footprints[x].contains(lon, lat)]
+        return self._output(hits)
+
+    def _output(self, hits):
+        if self._names is None:
+            return [int(x) for x in hits]
+        return [self._names[x] for x in hits]
+
+
+def _str_order(bounds, capacity):
+    # Sort-Tile-Recursive order: sort by x centre, cut into vertical slices and sort each slice by y centre
+    size = len(bounds)
+    leaves = int(np.ceil(size / capacity))
+    slices = int(np.ceil(np.sqrt(leaves)))
+    center_x = bounds[:, 0] + bounds[:, 2]
+    center_y = bounds[:, 1] + bounds[:, 3]
+
+    order = np.argsort(center_x, kind='stable')
+    slice_id = np.arange(size) // (slices * capacity)
+    return order[np.lexsort((center_y[order], slice_id))]
+
@@ -0,0 +1,319 @@
+# Generator of synthetic Sentinel-1 BEAM-DIMAP metadata files used for benchmarks and scaling tests
+import xml.etree.ElementTree as ET
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from .reader.utils import DIMAP_TIME_FORMAT, MJD2000_EPOCH, indent_xml
+
+# Scalar attributes of the generated abstracted metadata as (name, type, unit, description, value). Values that depend
+# on the generator parameters are filled in by `generate_dimap`.
+ABSTRACTED_ATTRIBUTES = [
+    ('PRODUCT', 'ascii', '', 'Product name', None),
+    ('PRODUCT_TYPE', 'ascii', '', 'Product type', 'SLC'),
+    ('SPH_DESCRIPTOR', 'ascii', '', 'Description', 'Sentinel-1 IW Level-1 SLC Product'),
+    ('MISSION', 'ascii', '', 'Satellite mission', 'SENTINEL-1B'),
+    ('ACQUISITION_MODE', 'ascii', '', 'Acquisition mode', 'IW'),
+    ('antenna_pointing', 'ascii', '', 'Right or left facing', 'right'),
+    ('SWATH', 'ascii', '', 'Swath name', 'IW2'),
+    ('REL_ORBIT', 'int32', '', 'Track', '155'),
+    ('ABS_ORBIT', 'int32', '', 'Orbit', None),
+    ('slice_num', 'int32', '', 'Slice number', '3'),
+    ('first_line_time', 'utc', 'utc', 'First zero doppler azimuth time', None),
+    ('last_line_time', 'utc', 'utc', 'Last zero doppler azimuth time', None),
+    ('first_near_lat', 'float64', 'deg', '', '64.27'),
+    ('first_near_long', 'float64', 'deg', '', '-23.81'),
+    ('first_far_lat', 'float64', 'deg', '', '64.27'),
+    ('first_far_long', 'float64', 'deg', '', '-21.82'),
+    ('last_near_lat', 'float64', 'deg', '', '63.74'),
+    ('last_near_long', 'float64', 'deg', '', '-23.81'),
+    ('last_far_lat', 'float64', 'deg', '', '63.74'),
+    ('last_far_long', 'float64', 'deg', '', '-21.82'),
+    ('PASS', 'ascii', '', 'ASCENDING or DESCENDING', 'DESCENDING'),
+    ('SAMPLE_TYPE', 'ascii', '', 'DETECTED or COMPLEX', 'COMPLEX'),
+    ('mds1_tx_rx_polar', 'ascii', '', 'Polarization', 'VV'),
+    ('azimuth_looks', 'float64', '', '', '1.0'),
+    ('range_looks', 'float64', '', '', '1.0'),
+    ('range_spacing', 'float64', 'm', 'Range sample spacing', '2.329562'),
+    ('azimuth_spacing', 'float64', 'm', 'Azimuth sample spacing', '13.94'),
+    ('pulse_repetition_frequency', 'float64', 'Hz', 'PRF', '1717.128973878037'),
+    ('radar_frequency', 'float64', 'MHz', 'Radar frequency', '5405.000454334349'),
+    ('line_time_interval', 'float64', 's', '', '0.002055556299999998'),
+    ('num_output_lines', 'uint32', 'lines', 'Raster height', None),
+    ('num_samples_per_line', 'uint32', 'samples', 'Raster width', None),
+    ('subset_offset_x', 'uint32', 'samples', 'X coordinate of UL corner of subset in original image', '0'),
+    ('subset_offset_y', 'uint32', 'samples', 'Y coordinate of UL corner of subset in original image', '0'),
+    ('srgr_flag', 'uint8', 'flag', 'SRGR applied', '0'),
+    ('avg_scene_height', 'float64', 'm', 'Average scene height ellipsoid', '100.0'),
+    ('slant_range_to_first_pixel', 'float64', 'm', 'Slant range to 1st data sample', '850539.3959360173'),
+    ('range_sampling_rate', 'float64', 'MHz', 'Range Sampling Rate', '64.34523812571427'),
+    ('multilook_flag', 'uint8', 'flag', 'Multilook applied', '0'),
+    ('coregistered_stack', 'uint8', 'flag', 'Coregistration applied', None),
+    ('metadata_version', 'ascii', '', 'AbsMetadata version', '6.0'),
+]
+
+# Circular orbit used for the generated state vectors. At the first line time the satellite is above the nadir point
+# and moves along the heading, so the right-looking swath covers the generated corner coordinates.
+ORBIT_RADIUS = 7071000.0
+ORBIT_SPEED = 7500.0
+ORBIT_NADIR = (63.35, -13.6)
+ORBIT_HEADING = 195.0
+
+REPEAT_CYCLE_DAYS = 12
+
+
+def generate_dimap(bands=4, orbit_vectors=17, graph_nodes=6, secondaries=1, annotation_points=210, bursts=2,
+                   lines=1500, samples=5000, seed=0) -> str:
+    """
+    Generate the XML text of a synthetic Sentinel-1 IW SLC stack in BEAM-DIMAP format. The size of every section that
+    the readers parse can be scaled independently. Values are deterministic for a given seed.
+
+    :param bands: Number of bands in Data_Access and Image_Interpretation
+    :param orbit_vectors: Number of orbit state vectors of each acquisition
+    :param graph_nodes: Number of Processing_Graph nodes
+    :param secondaries: Number of secondary acquisitions in Slave_Metadata and the Baselines section
+    :param annotation_points: Number of geolocation grid points in the original product annotation
+    :param bursts: Number of bursts in the BurstBoundary section
+    :param lines: Raster height
+    :param samples: Raster width
+    :param seed: Seed of the random values
+    """
+    rng = np.random.default_rng(seed)
+    first_line_time = datetime(2019, 9, 2, 7, 57, 57, 910628)
+    dates = [first_line_time + timedelta(days=REPEAT_CYCLE_DAYS * x) for x in range(secondaries + 1)]
+    perpendicular = np.concatenate([[0.0], rng.normal(0, 80, secondaries)])
+    name = f'{dates[0]:%Y%m%d}_{dates[-1]:%Y%m%d}_Stack'
+
+    root = ET.Element('Dimap_Document', name=f'{name}.dim')
+    _add_header(root, name, dates[0], bands, lines, samples)
+
+    sources = ET.SubElement(root, 'Dataset_Sources')
+    metadata = _mdelem(sources, 'metadata')
+    abstracted = _add_abstracted_metadata(metadata, dates[0], 17856, lines, samples, orbit_vectors, secondaries)
+    _add_baselines(abstracted, dates, perpendicular)
+    _add_burst_boundary(abstracted, dates[0], bursts, lines, rng)
+    _add_annotation(metadata, dates[0], annotation_points, lines, samples, rng)
+    _add_processing_graph(metadata, graph_nodes)
+
+    slaves = _mdelem(metadata, 'Slave_Metadata')
+    _mdattr(slaves, 'Master_bands', 'ascii', ' '.join(_band_name(x) for x in range(bands)))
+    for idx, date in enumerate(dates[1:], start=1):
+        _add_abstracted_metadata(slaves, date, 17856 + idx * 175, lines, samples, orbit_vectors, 0,
+                                 perpendicular[idx], name=f'{date:%Y%m%d}_Orb_{date:%d%b%Y}')
+
+    indent_xml(root)
+    return '<?xml version="1.0" encoding="ISO-8859-1"?>\n' + ET.tostring(root, encoding='unicode')
+
+
+def write_dimap(path, **kwargs) -> str:
+    """
+    Write a synthetic BEAM-DIMAP file. Accepts the same keyword arguments as :func:`generate_dimap`. Returns the path.
+
+    :param path: Output .dim path
+    """
+    with open(path, 'w', encoding='ISO-8859-1') as f:
+        f.write(generate_dimap(**kwargs))
+    return str(path)
+
+
+def _mdelem(parent, name):
+    return ET.SubElement(parent, 'MDElem', name=name)
+
+
+def _mdattr(parent, name, data_type, value, unit=None, desc=None):
+    attrib = {'name': name}
+    if desc is not None:
+        attrib['desc'] = desc
+    if unit is not None:
+        attrib['unit'] = unit
+    attrib['type'] = data_type
+    attrib['mode'] = 'rw'
+    element = ET.SubElement(parent, 'MDATTR', attrib)
+    element.text = str(value)
+    return element
+
+
+def _format_time(value):
+    return value.strftime(DIMAP_TIME_FORMAT).upper()
+
+
+def _band_name(idx):
+    return f'band_{idx}_VV'
+
+
+def _add_header(root, name, start, bands, lines, samples):
+    metadata_id = ET.SubElement(root, 'Metadata_Id')
+    ET.SubElement(metadata_id, 'METADATA_FORMAT', version='2.12.1').text = 'DIMAP'
+    ET.SubElement(metadata_id, 'METADATA_PROFILE').text = 'BEAM-DATAMODEL-V1'
+    dataset_id = ET.SubElement(root, 'Dataset_Id')
+    ET.SubElement(dataset_id, 'DATASET_SERIES').text = 'BEAM-PRODUCT'
+    ET.SubElement(dataset_id, 'DATASET_NAME').text = name
+    production = ET.SubElement(root, 'Production')
+    ET.SubElement(production, 'PRODUCT_TYPE').text = 'SLC'
+    ET.SubElement(production, 'PRODUCT_SCENE_RASTER_START_TIME').text = _format_time(start)
+
+    crs = ET.SubElement(root, 'Coordinate_Reference_System')
+    ET.SubElement(crs, 'WKT').text = 'GEOGCS["WGS84(DD)", DATUM["WGS84", SPHEROID["WGS84", 6378137.0, 298.257223563]]]'
+    geoposition = ET.SubElement(root, 'Geoposition')
+    ET.SubElement(geoposition, 'IMAGE_TO_MODEL_TRANSFORM').text = '3.77E-4,0.0,0.0,-3.77E-4,-23.81,64.27'
+
+    dimensions = ET.SubElement(root, 'Raster_Dimensions')
+    ET.SubElement(dimensions, 'NCOLS').text = str(samples)
+    ET.SubElement(dimensions, 'NROWS').text = str(lines)
+    ET.SubElement(dimensions, 'NBANDS').text = str(bands)
+
+    access = ET.SubElement(root, 'Data_Access')
+    ET.SubElement(access, 'DATA_FILE_FORMAT').text = 'ENVI'
+    ET.SubElement(access, 'DATA_FILE_FORMAT_DESC').text = 'ENVI File Format'
+    ET.SubElement(access, 'DATA_FILE_ORGANISATION').text = 'BAND_SEPARATE'
+    for idx in range(bands):
+        data_file = ET.SubElement(access, 'Data_File')
+        ET.SubElement(data_file, 'DATA_FILE_PATH', href=f'{name}.data/{_band_name(idx)}.hdr')
+        ET.SubElement(data_file, 'BAND_INDEX').text = str(idx)
+
+    interpretation = ET.SubElement(root, 'Image_Interpretation')
+    for idx in range(bands):
+        band = ET.SubElement(interpretation, 'Spectral_Band_Info')
+        for tag, value in [('BAND_INDEX', idx), ('BAND_DESCRIPTION', ''), ('BAND_NAME', _band_name(idx)),
+                           ('BAND_RASTER_WIDTH', samples), ('BAND_RASTER_HEIGHT', lines), ('DATA_TYPE', 'float32'),
+                           ('PHYSICAL_UNIT', 'intensity'), ('SOLAR_FLUX', 0.0), ('BAND_WAVELEN', 0.0),
+                           ('BANDWIDTH', 0.0), ('SCALING_FACTOR', 1.0), ('SCALING_OFFSET', 0.0),
+                           ('LOG10_SCALED', 'false'), ('NO_DATA_VALUE_USED', 'true'), ('NO_DATA_VALUE', 0.0)]:
+            ET.SubElement(band, tag).text = str(value)
+
+
+def _add_abstracted_metadata(parent, first_line_time, abs_orbit, lines, samples, orbit_vectors, secondaries,
+                             baseline=0.0, name='Abstracted_Metadata'):
+    element = _mdelem(parent, name)
+    line_time_interval = 0.002055556299999998
+    values = {
+        'PRODUCT': f'S1B_IW_SLC__1SDV_{first_line_time:%Y%m%dT%H%M%S}_{abs_orbit:06d}',
+        'ABS_ORBIT': abs_orbit,
+        'first_line_time': _format_time(first_line_time),
+        'last_line_time': _format_time(first_line_time + timedelta(seconds=(lines - 1) * line_time_interval)),
+        'num_output_lines': lines,
+        'num_samples_per_line': samples,
+        'coregistered_stack': 1 if secondaries else 0,
+    }
+    for attr_name, data_type, unit, desc, value in ABSTRACTED_ATTRIBUTES:
+        _mdattr(element, attr_name, data_type, values.get(attr_name, value), unit, desc)
+
+    _add_orbit_state_vectors(element, first_line_time, orbit_vectors, baseline)
+    _mdelem(element, 'SRGR_Coefficients')
+    doppler = _mdelem(element, 'Doppler_Centroid_Coefficients')
+    coefficients = _mdelem(doppler, 'dop_coef_list.1')
+    _mdattr(coefficients, 'zero_doppler_time', 'utc', _format_time(first_line_time))
+    _mdattr(coefficients, 'slant_range_time', 'float64', '5369435.814441947', 'ns', 'Slant Range Time')
+    for idx, value in enumerate([1.498285, -663.2895, 144938.1], start=1):
+        _mdattr(_mdelem(coefficients, f'coefficient.{idx}'), 'dop_coef', 'float64', value)
+    return element
+
+
+def _add_orbit_state_vectors(parent, first_line_time, orbit_vectors, baseline):
+    # Vectors are spaced by one second and centred on the first line time. Secondary orbits are shifted across track
+    # by their perpendicular baseline.
+    element = _mdelem(parent, 'Orbit_State_Vectors')
+    offsets = np.arange(orbit_vectors) - orbit_vectors // 2
+    angle = offsets * ORBIT_SPEED / ORBIT_RADIUS
+    lat, lon = np.radians(ORBIT_NADIR)
+    heading = np.radians(ORBIT_HEADING)
+    u = np.array([np.cos(lat) * np.cos(lon), np.cos(lat) * np.sin(lon), np.sin(lat)])
+    north = np.array([-np.sin(lat) * np.cos(lon), -np.sin(lat) * np.sin(lon), np.cos(lat)])
+    east = np.array([-np.sin(lon), np.cos(lon), 0.0])
+    w = np.cos(heading) * north + np.sin(heading) * east
+    positions = ORBIT_RADIUS * (np.cos(angle)[:, None] * u + np.sin(angle)[:, None] * w) + baseline * np.cross(w, u)
+    velocities = ORBIT_SPEED * (-np.sin(angle)[:, None] * u + np.cos(angle)[:, None] * w)
+
+    for idx, offset in enumerate(offsets):
+        vector = _mdelem(element, f'orbit_vector{idx + 1}')
+        _mdattr(vector, 'time', 'utc', _format_time(first_line_time + timedelta(seconds=int(offset))))
+        for axis, position in zip('xyz', positions[idx]):
+            _mdattr(vector, f'{axis}_pos', 'float64', repr(float(position)))
+        for axis, velocity in zip('xyz', velocities[idx]):
+            _mdattr(vector, f'{axis}_vel', 'float64', repr(float(velocity)))
+
+
+def _add_baselines(parent, dates, perpendicular):
+    element = _mdelem(parent, 'Baselines')
+    for i, reference in enumerate(dates):
+        master = _mdelem(element, f'Master: {reference:%d%b%Y}')
+        for j, secondary in enumerate(dates):
+            slave = _mdelem(master, f'Slave: {secondary:%d%b%Y}')
+            temporal = (reference - secondary).days
+            _mdattr(slave, 'Perp Baseline', 'float64', repr(float(perpendicular[j] - perpendicular[i])))
+            _mdattr(slave, 'Temp Baseline', 'float64', repr(float(temporal)))
+            _mdattr(slave, 'Modelled Coherence', 'float64', repr(float(np.exp(-abs(temporal) / 48))))
+            _mdattr(slave, 'Height of Ambiguity', 'float64', 'Infinity' if i == j else '-1000.0')
+            _mdattr(slave, 'Doppler Difference', 'float64', '0.0')
+
+
+def _add_burst_boundary(parent, first_line_time, bursts, lines, rng):
+    element = _mdelem(parent, 'BurstBoundary')
+    swath = _mdelem(element, 'IW2')
+    _mdattr(swath, 'count', 'int16', bursts)
+    lines_per_burst = lines / max(bursts, 1)
+    start = float((np.datetime64(first_line_time, 'us') - MJD2000_EPOCH).astype('int64') / 1e6)
+    for idx in range(bursts):
+        burst = _mdelem(swath, f'Burst{idx}')
+        _mdattr(burst, 'FirstLineDeburst', 'float64', repr(idx * lines_per_burst))
+        _mdattr(burst, 'LastLineDeburst', 'float64', repr((idx + 1) * lines_per_burst))
+        _mdattr(burst, 'FirstLineTime', 'float64', repr(start + idx * 2.758))
+        _mdattr(burst, 'LastLineTime', 'float64', repr(start + idx * 2.758 + 3.11))
+        _mdattr(burst, 'FirstPixelTime', 'float64', '0.0028370746139017855')
+        _mdattr(burst, 'LastPixelTime', 'float64', '0.0030275626710362983')
+        _mdattr(burst, 'FirstValidPixelTime', 'float64', '0.002837579701758265')
+        _mdattr(burst, 'LastValidPixelTime', 'float64', '0.003026031866302044')
+        top = 64.27 - idx * 0.25
+        for boundary, lat in [('FirstLineBoundaryPoints', top), ('LastLineBoundaryPoints', top - 0.27)]:
+            points = _mdelem(burst, boundary)
+            for lon in np.linspace(-21.82, -23.81, 6):
+                point = _mdelem(points, 'BoundaryPoint')
+                _mdattr(point, 'lat', 'float32', repr(float(lat + rng.normal(0, 1e-3))))
+                _mdattr(point, 'lon', 'float32', repr(float(lon)))
+
+
+def _add_annotation(parent, first_line_time, annotation_points, lines, samples, rng):
+    original = _mdelem(parent, 'Original_Product_Metadata')
+    annotation = _mdelem(original, 'annotation')
+    product = _mdelem(_mdelem(annotation, 's1b-iw2-slc-vv-synthetic-005.xml'), 'product')
+    header = _mdelem(product, 'adsHeader')
+    _mdattr(header, 'swath', 'ascii', 'IW2')
+    grid = _mdelem(_mdelem(product, 'geolocationGrid'), 'geolocationGridPointList')
+    _mdattr(grid, 'count', 'uint32', annotation_points)
+
+    columns = max(int(np.sqrt(annotation_points)), 1)
+    for idx in range(annotation_points):
+        row, col = divmod(idx, columns)
+        line = row * lines // max(annotation_points // columns, 1)
+        pixel = col * samples // columns
+        point = _mdelem(grid, 'geolocationGridPoint')
+        azimuth_time = first_line_time + timedelta(seconds=line * 0.002055556299999998)
+        _mdattr(point, 'azimuthTime', 'utc', azimuth_time.isoformat())
+        _mdattr(point, 'slantRangeTime', 'float64', repr(0.0056 + pixel * 1.554e-8))
+        _mdattr(point, 'line', 'uint32', line)
+        _mdattr(point, 'pixel', 'uint32', pixel)
+        _mdattr(point, 'latitude', 'float64', repr(float(64.27 - line * 3.5e-4 + rng.normal(0, 1e-4))))
+        _mdattr(point, 'longitude', 'float64', repr(float(-21.82 - pixel * 4e-4 + rng.normal(0, 1e-4))))
+        _mdattr(point, 'height', 'float64', repr(float(rng.uniform(0, 500))))
+
+
+def _add_processing_graph(parent, graph_nodes):
+    graph = _mdelem(parent, 'Processing_Graph')
+    for idx in range(graph_nodes):
+        node = _mdelem(graph, f'node.{idx}')
+        operator = 'Read' if idx == 0 else ('Write' if idx == graph_nodes - 1 else f'Operator-{idx}')
+        _mdattr(node, 'id', 'ascii', f'{operator} (Initial)')
+        _mdattr(node, 'operator', 'ascii', operator)
+        _mdattr(node, 'moduleName', 'ascii', 'SNAP Graph Processing Framework (GPF)')
+        _mdattr(node, 'moduleVersion', 'ascii', '8.0.3')
+        _mdattr(node, 'purpose', 'ascii', f'Synthetic processing step {idx}')
+        _mdattr(node, 'authors', 'ascii', 'PyBeamDimap')
+        _mdattr(node, 'version', 'ascii', '1.0')
+        _mdattr(node, 'copyright', 'ascii', '-')
+        _mdattr(node, 'processingTime', 'ascii', f'2021-07-03T18:41:{idx % 60:02d}.000Z')
+        sources = _mdelem(node, 'sources')
+        if idx > 0:
+            _mdattr(sources, 'sourceProduct', 'ascii', f'file:/data/step_{idx - 1}.dim')
+        parameters = _mdelem(node, 'parameters')
+        _mdattr(parameters, 'selectedPolarisations', 'ascii', 'VV')
+        _mdattr(parameters, 'index', 'ascii', idx)
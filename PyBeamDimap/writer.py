@@ -0,0 +1,356 @@
+# Writer of derived products in BEAM-DIMAP format with ENVI band files
+import os
+import xml.etree.ElementTree as ET
+from datetime import datetime, timezone
+
+import numpy as np
+
+from .reader.utils import METADATA_XPATH, indent_xml
+
+# ENVI `data type` codes of the supported band dtypes. The dtype names are used as DIMAP DATA_TYPE.
+ENVI_DATA_TYPES = {
+    'int8': 1,
+    'uint8': 1,
+    'int16': 2,
+    'uint16': 12,
+    'int32': 3,
+    'uint32': 13,
+    'float32': 4,
+    'float64': 5,
+}
+
+# Sections of the source product that are copied unchanged. Geocoding sections are only copied when the raster size
+# of the written product is equal to the size of the source product and the geocoding does not depend on tie point
+# grids or bands of the source.
+COPIED_SECTIONS = ['Dataset_Use', 'Production']
+GEOCODING_SECTIONS = ['Coordinate_Reference_System', 'Geoposition']
+
+# Geoposition elements of tie point and pixel geocodings. They name latitude and longitude grids or bands, which are
+# not copied.
+GRID_GEOPOSITION_TAGS = ['LATITUDE_BAND', 'LONGITUDE_BAND']
+
+
+class DimapWriter:
+
+    def __init__(self, path, source=None, width=None, height=None, operator='PyBeamDimap', parameters=None):
+        """
+        Writes a BEAM-DIMAP product that can be opened in SNAP. Each band is an ENVI .img file in the .data directory
+        next to the .dim file. Band data is written tile by tile straight to the band files, so full rasters are never
+        held in memory. The .dim file is written by :func:`close`.
+
+        When a source product is given, its metadata section is copied and its processing graph is extended with a
+        node describing this step. Tie point grids and other band files of the source are not copied, so the geocoding
+        of the source is only copied when it does not refer to them, e.g. for map projected products.
+
+        :param path: Path of the .dim file
+        :param source: Optional product the bands are derived from, e.g. a Sentinel1 object
+        :param width: Raster width. Default None uses the width of the source product.
+        :param height: Raster height. Default None uses the height of the source product.
+        :param operator: Operator name of the processing graph node
+        :param parameters: Optional dict of parameters stored in the processing graph node
+        """
+        self._source = None
+        self._source_path = None
+        if source is not None:
+            if source._metadata is None:
+                raise ValueError('Products cannot be used as source after the XML tree was released')
+            self._source = source._metadata
+            self._source_path = getattr(source, '_path', None)
+        if width is None or height is None:
+            if self._source is None:
+                raise ValueError('The raster size is required when no source product is given')
+            width = int(self._source.findtext('Raster_Dimensions/NCOLS')) if width is None else width
+            height = int(self._source.findtext('Raster_Dimensions/NROWS')) if height is None else height
+
+        self.path = str(path)
+        self.name = os.path.splitext(os.path.basename(self.path))[0]
+        self.data_dir = os.path.join(os.path.dirname(os.path.abspath(self.path)), f'{self.name}.data')
+        self.width = width
+        self.height = height
+        self.operator = operator
+        self.parameters = parameters or {}
+        self._bands = {}
+        self._closed = False
+        os.makedirs(self.data_dir, exist_ok=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        # The .dim file is only written when all bands were written without errors
+        if exc_type is None:
+            self.close()
+        else:
+            self._close_bands()
+
+    @property
+    def bands(self) -> list:
+        """
+        List of band writers in band index order
+        """
+        return list(self._bands.values())
+
+    def add_band(self, name, dtype='float32', unit=None, description=None, no_data_value=None, scaling_factor=1.0,
+                 scaling_offset=0.0) -> 'BandWriter':
+        """
+        Add a band and create its .img file. Pixels that are not written are zero.
+
+        :param name: Band name
+        :param dtype: Numpy dtype of the band, one of int8, uint8, int16, uint16, int32, uint32, float32 or float64
+        :param unit: Optional physical unit, e.g. intensity or dB
+        :param description: Optional band description
+        :param no_data_value: Optional no-data value of the band
+        :param scaling_factor: Factor applied by SNAP to the stored values
+        :param scaling_offset: Offset applied by SNAP to the stored values
+        """
+        if self._closed:
+            raise ValueError('Bands cannot be added after the writer was closed')
+        if name in self._bands:
+            raise ValueError(f'Band "{name}" already exists')
+        band = BandWriter(os.path.join(self.data_dir, name), name, dtype, self.width, self.height, len(self._bands),
+                          unit, description, no_data_value, scaling_factor, scaling_offset)
+        self._bands[name] = band
+        return band
+
+    def write_tile(self, band, data, x=0, y=0):
+        """
+        Write a tile of a band. See :func:`BandWriter.write_tile`.
+
+        :param band: Band name
+        :param data: 2D array of the tile
+        :param x: Column of the upper left pixel of the tile
+        :param y: Row of the upper left pixel of the tile
+        """
+        if band not in self._bands:
+            raise ValueError(f'Band "{band}" not found. Available bands are {list(self._bands)}')
+        self._bands[band].write_tile(data, x, y)
+
+    def close(self):
+        """
+        Close the band files and write the ENVI headers and the .dim file
+        """
+        if self._closed:
+            return
+        self._close_bands()
+        for band in self._bands.values():
+            band.write_header(self._description())
+        root = self._build_document()
+        indent_xml(root)
+        with open(self.path, 'w', encoding='ISO-8859-1', errors='xmlcharrefreplace') as f:
+            f.write('<?xml version="1.0" encoding="ISO-8859-1"?>\n')
+            f.write(ET.tostring(root, encoding='unicode'))
+
+    def _close_bands(self):
+        self._closed = True
+        for band in self._bands.values():
+            band.close()
+
+    def _description(self):
+        if self._source is None:
+            return ''
+        return self._source.findtext('Dataset_Use/DATASET_COMMENTS') or ''
+
+    def _build_document(self):
+        root = ET.Element('Dimap_Document', name=f'{self.name}.dim')
+        source = self._source
+
+        metadata_id = _copy_section(source, 'Metadata_Id')
+        if metadata_id is None:
+            metadata_id = ET.Element('Metadata_Id')
+            ET.SubElement(metadata_id, 'METADATA_FORMAT', version='2.12.1').text = 'DIMAP'
+            ET.SubElement(metadata_id, 'METADATA_PROFILE').text = 'BEAM-DATAMODEL-V1'
+        root.append(metadata_id)
+        dataset_id = ET.SubElement(root, 'Dataset_Id')
+        ET.SubElement(dataset_id, 'DATASET_SERIES').text = 'BEAM-PRODUCT'
+        ET.SubElement(dataset_id, 'DATASET_NAME').text = self.name
+
+        sections = list(COPIED_SECTIONS)
+        if source is not None:
+            size = (source.findtext('Raster_Dimensions/NCOLS'), source.findtext('Raster_Dimensions/NROWS'))
+            if size == (str(self.width), str(self.height)) and not _uses_grids(source.find('Geoposition')):
+                sections += GEOCODING_SECTIONS
+        for tag in sections:
+            section = _copy_section(source, tag)
+            if section is not None:
+                root.append(section)
+
+        dimensions = ET.SubElement(root, 'Raster_Dimensions')
+        ET.SubElement(dimensions, 'NCOLS').text = str(self.width)
+        ET.SubElement(dimensions, 'NROWS').text = str(self.height)
+        ET.SubElement(dimensions, 'NBANDS').text = str(len(self._bands))
+
+        access = ET.SubElement(root, 'Data_Access')
+        ET.SubElement(access, 'DATA_FILE_FORMAT').text = 'ENVI'
+        ET.SubElement(access, 'DATA_FILE_FORMAT_DESC').text = 'ENVI File Format'
+        ET.SubElement(access, 'DATA_FILE_ORGANISATION').text = 'BAND_SEPARATE'
+        for band in self._bands.values():
+            data_file = ET.SubElement(access, 'Data_File')
+            ET.SubElement(data_file, 'DATA_FILE_PATH', href=f'{self.name}.data/{band.name}.hdr')
+            ET.SubElement(data_file, 'BAND_INDEX').text = str(band.index)
+
+        interpretation = ET.SubElement(root, 'Image_Interpretation')
+        for band in self._bands.values():
+            band_info = ET.SubElement(interpretation, 'Spectral_Band_Info')
+            for tag, value in band.band_info():
+                ET.SubElement(band_info, tag).text = value
+
+        sources = ET.SubElement(root, 'Dataset_Sources')
+        metadata = None if source is None else source.find(METADATA_XPATH)
+        metadata = ET.Element('MDElem', name='metadata') if metadata is None else _copy_element(metadata)
+        sources.append(metadata)
+        self._add_graph_node(metadata)
+        return root
+
+    def _add_graph_node(self, metadata):
+        graph = metadata.find('MDElem[@name="Processing_Graph"]')
+        if graph is None:
+            graph = ET.SubElement(metadata, 'MDElem', name='Processing_Graph')
+        node = ET.SubElement(graph, 'MDElem', name=f'node.{len(graph)}')
+        processing_time = datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3] + 'Z'
+        for name, value in [('id', self.operator), ('operator', self.operator), ('moduleName', 'PyBeamDimap'),
+                            ('purpose', 'Write derived bands'), ('processingTime', processing_time)]:
+            _mdattr(node, name, value)
+        sources = ET.SubElement(node, 'MDElem', name='sources')
+        if isinstance(self._source_path, (str, os.PathLike)):
+            _mdattr(sources, 'sourceProduct', f'file:{os.path.abspath(self._source_path)}')
+        parameters = ET.SubElement(node, 'MDElem', name='parameters')
+        for name, value in self.parameters.items():
+            _mdattr(parameters, name, value)
+
+
+class BandWriter:
+
+    def __init__(self, path, name, dtype, width, height, index, unit=None, description=None, no_data_value=None,
+                 scaling_factor=1.0, scaling_offset=0.0):
+        """
+        Writes one band of a :class:`DimapWriter` into an ENVI .img file. Values are stored in big endian byte order
+        like the band files written by SNAP. This class is not designed to be directly used by the user. Bands are
+        created by :func:`DimapWriter.add_band`.
+
+        :param path: Path of the band files without extension
+        :param name: Band name
+        :param dtype: Numpy dtype of the band
+        :param width: Raster width
+        :param height: Raster height
+        :param index: Band index
+        """
+        dtype = np.dtype(dtype)
+        if dtype.name not in ENVI_DATA_TYPES:
+            raise ValueError(f'Band dtype "{dtype}" is not supported. Supported dtypes are {list(ENVI_DATA_TYPES)}')
+        self.path = path
+        self.name = name
+        self.dtype = dtype
+        self.width = width
+        self.height = height
+        self.index = index
+        self.unit = unit
+        self.description = description
+        self.no_data_value = no_data_value
+        self.scaling_factor = scaling_factor
+        self.scaling_offset = scaling_offset
+        self._stored_dtype = dtype.newbyteorder('>')
+        self._file = open(f'{path}.img', 'wb')
+        # The file has the full raster size from the start so tiles can be written in any order
+        self._file.truncate(width * height * dtype.itemsize)
+
+    def write_tile(self, data, x=0, y=0):
+        """
+        Write a tile of the band. Tiles can be written in any order. Tiles that span the full raster width are
+        written with a single write, other tiles with one write per row.
+
+        :param data: 2D array of the tile. Values are converted to the band dtype.
+        :param x: Column of the upper left pixel of the tile
+        :param y: Row of the upper left pixel of the tile
+        """
+        if self._file is None:
+            raise ValueError(f'Band "{self.name}" is closed')
+        data = np.asarray(data)
+        if data.ndim == 1:
+            data = data[np.newaxis]
+        rows, cols = data.shape
+        if x < 0 or y < 0 or x + cols > self.width or y + rows > self.height:
+            raise ValueError(f'Tile of shape {data.shape} at ({x}, {y}) is outside the raster of band "{self.name}" '
+                             f'with size {self.width}x{self.height}')
+        data = np.ascontiguousarray(data, dtype=self._stored_dtype)
+
+        itemsize = self.dtype.itemsize
+        if cols == self.width:
+            self._file.seek(y * self.width * itemsize)
+            self._file.write(data.data)
+            return
+        for row in range(rows):
+            self._file.seek(((y + row) * self.width + x) * itemsize)
+            self._file.write(data[row].data)
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def write_header(self, description=''):
+        """
+        Write the ENVI header of the band
+
+        :param description: Product description written into the header
+        """
+        unit = f' - Unit: {self.unit}' if self.unit else ''
+        lines = [
+            'ENVI',
+            f'description = {{{description}{unit}}}',
+            f'samples = {self.width}',
+            f'lines = {self.height}',
+            'bands = 1',
+            'header offset = 0',
+            'file type = ENVI Standard',
+            f'data type = {ENVI_DATA_TYPES[self.dtype.name]}',
+            'interleave = bsq',
+            'byte order = 1',
+            f'band names = {{ {self.name} }}',
+            f'data gain values = {{{float(self.scaling_factor)}}}',
+            f'data offset values = {{{float(self.scaling_offset)}}}',
+        ]
+        with open(f'{self.path}.hdr', 'w') as f:
+            f.write('\n'.join(lines) + '\n')
+
+    def band_info(self) -> list:
+        """
+        List of tag and text of the Spectral_Band_Info element of the band
+        """
+        info = [('BAND_INDEX', str(self.index)), ('BAND_DESCRIPTION', self.description or ''),
+                ('BAND_NAME', self.name), ('BAND_RASTER_WIDTH', str(self.width)),
+                ('BAND_RASTER_HEIGHT', str(self.height)), ('DATA_TYPE', self.dtype.name)]
+        if self.unit:
+            info.append(('PHYSICAL_UNIT', self.unit))
+        info += [('SOLAR_FLUX', '0.0'), ('BAND_WAVELEN', '0.0'), ('BANDWIDTH', '0.0'),
+                 ('SCALING_FACTOR', str(float(self.scaling_factor))),
+                 ('SCALING_OFFSET', str(float(self.scaling_offset))), ('LOG10_SCALED', 'false'),
+                 ('NO_DATA_VALUE_USED', 'false' if self.no_data_value is None else 'true'),
+                 ('NO_DATA_VALUE', str(0.0 if self.no_data_value is None else self.no_data_value))]
+        return info
+
+
+def _uses_grids(geoposition):
+    if geoposition is None:
+        return False
+    return any(geoposition.find(f'.//{x}') is not None for x in GRID_GEOPOSITION_TAGS)
+
+
+def _copy_section(source, tag):
+    if source is None:
+        return None
+    section = source.find(tag)
+    return None if section is None else _copy_element(section)
+
+
+def _copy_element(element):
+    # Copies ElementTree elements and compact read-only nodes into new ElementTree elements
+    copied = ET.Element(element.tag, element.attrib)
+    copied.text = element.text
+    copied.extend(_copy_element(x) for x in element)
+    return copied
+
+
+def _mdattr(parent, name, value):
+    element = ET.SubElement(parent, 'MDATTR', name=name, type='ascii', mode='rw')
+    element.text = str(value)
+    return element
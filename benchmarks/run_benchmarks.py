@@ -0,0 +1,188 @@
+# Benchmark suite of the BEAM-DIMAP readers on synthetic products
+#
+# Run from the project root:
+#     python benchmarks/run_benchmarks.py --output results.json
+#     python benchmarks/run_benchmarks.py --output new.json --compare results.json
+import argparse
+import importlib
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+import xml.etree.ElementTree as ET
+from datetime import datetime, timezone
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from PyBeamDimap.missions import Sentinel1  # noqa: E402
+from PyBeamDimap.reader.abstracted_metadata import AbstractedMetadata  # noqa: E402
+from PyBeamDimap.reader.core import ImageInterpretation  # noqa: E402
+from PyBeamDimap.reader.processing_graph import ProcessingGraph  # noqa: E402
+from PyBeamDimap.reader.slave_metadata import SlaveMetadata  # noqa: E402
+from PyBeamDimap.synthetic import write_dimap  # noqa: E402
+
+# Version of the output format. Increase when fields are renamed or their meaning changes.
+SCHEMA_VERSION = 1
+
+# Generator parameters of each scenario. Every scenario scales one section of the default product.
+SCENARIOS = {
+    'default': {},
+    'bands': {'bands': 200},
+    'orbit_vectors': {'orbit_vectors': 2000},
+    'graph_nodes': {'graph_nodes': 500},
+    'secondaries': {'secondaries': 60},
+    'annotation': {'annotation_points': 20000},
+    'bursts': {'bursts': 300},
+}
+
+
+def _sections(root):
+    # Section builders timed individually. Each one is given the already parsed tree.
+    return {
+        'image_interpretation': lambda: ImageInterpretation(root).get_band_info(),
+        'abstracted_metadata': lambda: AbstractedMetadata(root, 'SLC'),
+        'processing_graph': lambda: ProcessingGraph(root, 'SLC').get_processing_graph(),
+        'slave_metadata': lambda: [x.orbit_state_vectors for x in SlaveMetadata(root)],
+    }
+
+
+def _version(module):
+    # Optional packages that are not installed are recorded as None
+    try:
+        return importlib.import_module(module).__version__
+    except ImportError:
+        return None
+
+
+def _time(function, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return {'min': min(timings), 'median': statistics.median(timings)}
+
+
+def _peak_memory(function):
+    tracemalloc.start()
+    try:
+        function()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run_scenario(name, parameters, directory, repeat=5, scale=1.0):
+    """
+    Benchmark one scenario. Returns a dict with the parse time, the build time of each section, the total load time
+    of a Sentinel1 object and its peak traced memory.
+
+    :param name: Scenario name
+    :param parameters: Keyword arguments of the synthetic generator
+    :param directory: Directory where the synthetic product is written
+    :param repeat: Number of timed repetitions
+    :param scale: Factor applied to the size parameters of the scenario
+    """
+    parameters = {key: max(int(value * scale), 1) for key, value in parameters.items()}
+    path = write_dimap(os.path.join(directory, f'{name}.dim'), **parameters)
+    root = ET.parse(path).getroot()
+
+    return {
+        'scenario': name,
+        'parameters': parameters,
+        'file_size': os.path.getsize(path),
+        'parse': _time(lambda: ET.parse(path), repeat),
+        'sections': {key: _time(function, repeat) for key, function in _sections(root).items()},
+        'total': _time(lambda: Sentinel1(path, 'SLC'), repeat),
+        'peak_memory': _peak_memory(lambda: Sentinel1(path, 'SLC')),
+    }
+
+
+def run(scenarios=None, repeat=5, scale=1.0) -> dict:
+    """
+    Run the benchmark suite and return the machine readable results
+
+    :param scenarios: List of scenario names. Default None runs all scenarios.
+    :param repeat: Number of timed repetitions
+    :param scale: Factor applied to the size parameters of every scenario
+    """
+    names = list(SCENARIOS) if scenarios is None else scenarios
+    with tempfile.TemporaryDirectory() as directory:
+        results = [run_scenario(x, SCENARIOS[x], directory, repeat, scale) for x in names]
+    return {
+        'schema_version': SCHEMA_VERSION,
+        'created': datetime.now(timezone.utc).isoformat(),
+        'environment': {
+            'python': platform.python_version(),
+            'implementation': platform.python_implementation(),
+            'platform': platform.platform(),
+            'machine': platform.machine(),
+            'numpy': np.__version__,
+            'pandas': _version('pandas'),
+        },
+        'repeat': repeat,
+        'scale': scale,
+        'results': results,
+    }
+
+
+def compare(current, reference) -> list:
+    """
+    Compare the median timings and peak memory of two benchmark outputs. Returns rows of
+    (scenario, metric, reference, current, ratio) for the scenarios present in both outputs.
+
+    :param current: Benchmark output dict
+    :param reference: Benchmark output dict used as reference
+    """
+    reference = {x['scenario']: x for x in reference['results']}
+    rows = []
+    for result in current['results']:
+        other = reference.get(result['scenario'])
+        if other is None:
+            continue
+        metrics = [('parse', result['parse']['median'], other['parse']['median']),
+                   ('total', result['total']['median'], other['total']['median']),
+                   ('peak_memory', result['peak_memory'], other['peak_memory'])]
+        for section, timing in result['sections'].items():
+            if section in other['sections']:
+                metrics.append((section, timing['median'], other['sections'][section]['median']))
+        for metric, value, reference_value in metrics:
+            ratio = value / reference_value if reference_value else float('nan')
+            rows.append((result['scenario'], metric, reference_value, value, ratio))
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the BEAM-DIMAP readers on synthetic products')
+    parser.add_argument('--output', help='Path of the JSON output. Printed to stdout if not given.')
+    parser.add_argument('--scenario', action='append', choices=list(SCENARIOS),
+                        help='Scenario to run. Can be given multiple times. Default runs all scenarios.')
+    parser.add_argument('--repeat', type=int, default=5, help='Number of timed repetitions')
+    parser.add_argument('--scale', type=float, default=1.0, help='Factor applied to the scenario sizes')
+    parser.add_argument('--compare', help='Previous JSON output to compare against')
+    args = parser.parse_args(argv)
+
+    results = run(args.scenario, args.repeat, args.scale)
+    text = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text)
+    else:
+        print(text)
+
+    if args.compare:
+        with open(args.compare) as f:
+            reference = json.load(f)
+        for scenario, metric, reference_value, value, ratio in compare(results, reference):
+            print(f'{scenario:<15} {metric:<22} {reference_value:>14.6g} {value:>14.6g} {ratio:>8.2f}x',
+                  file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
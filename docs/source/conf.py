@@ -36,7 +36,7 @@ extensions = [
     'sphinx.ext.autodoc',
     'sphinx.ext.autosectionlabel'
 ]
-autodoc_mock_imports = ['pandas']
+autodoc_mock_imports = ['numpy', 'pandas']
 
 # Add any paths that contain templates here, relative to this directory.
 templates_path = ['_templates']
@@ -9,9 +9,14 @@ setup(
     packages=find_packages(),
     include_package_data=True,
     install_requires=[
-        'pandas',
+        'numpy',
         'pytest'
     ],
+    extras_require={
+        'pandas': ['pandas'],
+        'msgpack': ['msgpack'],
+        'arrow': ['pyarrow'],
+    },
     classifiers=[
         "Intended Audience :: Science/Research",
         "License :: OSI Approved :: Apache Software License",
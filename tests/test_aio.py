@@ -0,0 +1,113 @@
+import asyncio
+import os
+import threading
+
+import pytest
+
+from PyBeamDimap import aio
+from PyBeamDimap.aio import AsyncLoader
+from PyBeamDimap.missions import Sentinel1
+
+TEST_DIR = os.path.abspath('tests')
+data1 = os.path.join(TEST_DIR, 'S1_IW_SLC_coherance.dim')
+data2 = os.path.join(TEST_DIR, 'S1_IW_SLC_DInSARStack_20190902_20190914.dim')
+
+
+def assert_error(expected, actual):
+    return f'Error with extracted XML value. Expecting {expected}. Got {actual}.'
+
+
+def run_async(coroutine):
+    # asyncio.run requires Python 3.7
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+class CountingSentinel1(Sentinel1):
+    calls = 0
+
+    def __init__(self, *args, **kwargs):
+        CountingSentinel1.calls += 1
+        super().__init__(*args, **kwargs)
+
+
+def test_concurrent_requests_share_parse():
+
+    CountingSentinel1.calls = 0
+
+    async def run():
+        async with AsyncLoader(max_workers=2) as loader:
+            products = await asyncio.gather(*[loader.open(CountingSentinel1, data2, 'SLC') for _ in range(8)])
+            cached = await loader.open(CountingSentinel1, data2, 'SLC')
+            return products, cached, loader.cache_info()
+
+    products, cached, info = run_async(run())
+
+    actual = (CountingSentinel1.calls, len({id(x) for x in products}), cached is products[0])
+    expected = (1, 1, True)
+    assert actual == expected, assert_error(expected, actual)
+
+    actual = (info['hits'], info['misses'], info['size'], info['pending'])
+    expected = (1, 1, 1, 0)
+    assert actual == expected, assert_error(expected, actual)
+
+
+def test_cache_key_off_event_loop(monkeypatch):
+
+    threads = []
+    cache_key = aio._cache_key
+
+    def recording_cache_key(*args):
+        threads.append(threading.current_thread())
+        return cache_key(*args)
+
+    monkeypatch.setattr(aio, '_cache_key', recording_cache_key)
+
+    async def run():
+        async with AsyncLoader() as loader:
+            await loader.open_sentinel1(data2, 'SLC')
+            await loader.open_sentinel1(data2, 'SLC')
+            return threading.current_thread()
+
+    loop_thread = run_async(run())
+
+    # The file is resolved and checked outside the event loop thread for misses and hits
+    actual = [x is loop_thread for x in threads]
+    expected = [False, False]
+    assert actual == expected, assert_error(expected, actual)
+
+
+def test_cache_eviction():
+
+    async def run():
+        async with AsyncLoader(cache_size=1) as loader:
+            first = await loader.open_sentinel1(data2, 'SLC')
+            await loader.open_sentinel1(data1, 'SLC')
+            again = await loader.open_sentinel1(data2, 'SLC')
+            compact = await loader.open_sentinel1(data2, 'SLC', compact=True)
+            return first, again, compact
+
+    first, again, compact = run_async(run())
+
+    actual = (first is again, again is compact, first.dataset_name == again.dataset_name)
+    expected = (False, False, True)
+    assert actual == expected, assert_error(expected, actual)
+
+
+def test_failed_parse_is_not_cached():
+
+    async def run():
+        loader = AsyncLoader()
+        try:
+            with pytest.raises(FileNotFoundError):
+                await loader.open_sentinel1(os.path.join(TEST_DIR, 'missing.dim'), 'SLC')
+            return loader.cache_info()
+        finally:
+            loader.close()
+
+    actual = run_async(run())['size']
+    expected = 0
+    assert actual == expected, assert_error(expected, actual)
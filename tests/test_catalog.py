@@ -0,0 +1,98 @@
+import os
+
+import numpy as np
+import pytest
+
+from PyBeamDimap.catalog import Catalog, read_catalog_record
+
+TEST_DIR = os.path.abspath('tests')
+data1 = os.path.join(TEST_DIR, 'S1_IW_SLC_coherance.dim')
+data2 = os.path.join(TEST_DIR, 'S1_IW_SLC_DInSARStack_20190902_20190914.dim')
+data3 = os.path.join(TEST_DIR, 'S2_1C_ndwi.dim')
+
+
+def assert_error(expected, actual):
+    return f'Error with extracted XML value. Expecting {expected}. Got {actual}.'
+
+
+@pytest.fixture
+def catalog():
+    """
+    Catalog of the test products
+    """
+    yield Catalog.from_files([data3, data2, data1])
+
+
+def test_catalog_record():
+
+    record = read_catalog_record(data2)
+
+    actual = [record['mission'], record['pass'], record['rel_orbit'], record['abs_orbit']]
+    expected = ['SENTINEL-1B', 'DESCENDING', 155, 17856]
+    assert actual == expected, assert_error(expected, actual)
+
+    actual = str(record['start_time'])
+    expected = '2019-09-02T07:57:57.910628'
+    assert actual == expected, assert_error(expected, actual)
+
+    # Sentinel-2 mission is taken from the product name
+    actual = read_catalog_record(data3)['mission']
+    expected = 'SENTINEL-2B'
+    assert actual == expected, assert_error(expected, actual)
+
+
+def test_catalog_sorted_by_time(catalog):
+
+    actual = [os.path.basename(x) for x in catalog['path']]
+    expected = ['S1_IW_SLC_coherance.dim', 'S1_IW_SLC_DInSARStack_20190902_20190914.dim', 'S2_1C_ndwi.dim']
+    assert actual == expected, assert_error(expected, actual)
+
+    actual = catalog['rel_orbit'].tolist()
+    expected = [155, 155, -1]
+    assert actual == expected, assert_error(expected, actual)
+
+
+def test_catalog_queries(catalog):
+
+    actual = catalog.query(start='2019-09-01', stop='2019-09-30').tolist()
+    expected = [1]
+    assert actual == expected, assert_error(expected, actual)
+
+    actual = catalog.query(rel_orbit=155, pass_direction='DESCENDING').tolist()
+    expected = [0, 1]
+    assert actual == expected, assert_error(expected, actual)
+
+    actual = catalog.query(abs_orbit=(17000, 17600)).tolist()
+    expected = [0]
+    assert actual == expected, assert_error(expected, actual)
+
+    actual = catalog.query(bbox=(120, 15, 121, 16)).tolist()
+    expected = [2]
+    assert actual == expected, assert_error(expected, actual)
+
+    actual = catalog.between('stop_time', high=np.datetime64('2019-08-10')).tolist()
+    expected = [0]
+    assert actual == expected, assert_error(expected, actual)
+
+    actual = {key: value.tolist() for key, value in catalog.tracks().items()}
+    expected = {('SENTINEL-1B', 'DESCENDING', 155): [0, 1], ('SENTINEL-2B', '', -1): [2]}
+    assert actual == expected, assert_error(expected, actual)
+
+    actual = {key: value.tolist() for key, value in catalog.frames().items()}
+    expected = {('SENTINEL-1B', 'DESCENDING', 155, 64.0): [0, 1], ('SENTINEL-2B', '', -1, 15.0): [2]}
+    assert actual == expected, assert_error(expected, actual)
+
+
+def test_catalog_save_load(catalog, tmp_path):
+
+    path = os.path.join(tmp_path, 'catalog.npz')
+    catalog.save(path)
+    loaded = Catalog.load(path)
+
+    actual = loaded.dataframe()
+    expected = catalog.dataframe()
+    assert actual.equals(expected), assert_error(expected, actual)
+
+    actual = loaded.query(rel_orbit=155, start='2019-09-01').tolist()
+    expected = [1]
+    assert actual == expected, assert_error(expected, actual)
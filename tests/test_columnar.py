@@ -0,0 +1,128 @@
+import os
+import xml.etree.ElementTree as ET
+
+import numpy as np
+import pytest
+
+from PyBeamDimap import columnar
+from PyBeamDimap.missions import Sentinel1
+
+TEST_DIR = os.path.abspath('tests')
+data1 = os.path.join(TEST_DIR, 'S1_IW_SLC_coherance.dim')
+data2 = os.path.join(TEST_DIR, 'S1_IW_SLC_DInSARStack_20190902_20190914.dim')
+
+
+def assert_error(expected, actual):
+    return f'Error with extracted XML value. Expecting {expected}. Got {actual}.'
+
+
+@pytest.fixture
+def dimap():
+    """
+    Load an instance of BEAM-DIMAP reader with multiband SLC data
+    """
+    yield Sentinel1(metadata=data2, product='SLC')
+
+
+def test_orbit_state_vectors(dimap):
+
+    data = columnar.columns(dimap, 'orbit_state_vectors')
+
+    actual = {key: str(value.dtype) for key, value in data.items()}
+    expected = {'time': 'datetime64[us]', 'x_pos': 'float64', 'y_pos': 'float64', 'z_pos': 'float64',
+                'x_vel': 'float64', 'y_vel': 'float64', 'z_vel': 'float64'}
+    assert actual == expected, assert_error(expected, actual)
+
+    actual = data['x_pos'][0]
+    expected = float(dimap.AbstractedMetadata.orbit_state_vectors['orbit_vector1']['x_pos'])
+    assert actual == expected, assert_error(expected, actual)
+
+
+def test_doppler_centroid_coeffs(dimap):
+
+    data = columnar.columns(dimap, 'doppler_centroid_coeffs')
+
+    actual = (len(data['value']), data['coefficient'][:3].tolist(), data['value'][:3].tolist())
+    expected = (33, [1, 2, 3], [1.498285, -663.2895, 144938.1])
+    assert actual == expected, assert_error(expected, actual)
+
+    actual = str(data['zero_doppler_time'][0])
+    expected = '2019-09-02T07:57:40.166470'
+    assert actual == expected, assert_error(expected, actual)
+
+
+def test_baselines(dimap):
+
+    data = columnar.columns(dimap, 'baselines')
+
+    actual = (data['reference_date'].astype(str).tolist(), data['secondary_date'].astype(str).tolist())
+    expected = (['2019-09-02', '2019-09-14'], ['2019-09-14', '2019-09-02'])
+    assert actual == expected, assert_error(expected, actual)
+
+    actual = np.round(data['temporal'], 3).tolist()
+    expected = [-12.0, 12.0]
+    assert actual == expected, assert_error(expected, actual)
+
+    with pytest.raises(ValueError):
+        columnar.columns(dimap, 'missing')
+
+
+def test_to_arrow(dimap):
+
+    pa = pytest.importorskip('pyarrow')
+    products = [dimap, Sentinel1(metadata=data1, product='SLC')]
+    table = columnar.to_arrow(products, 'orbit_state_vectors')
+
+    actual = (table.num_rows, table.column('product').num_chunks, table.schema.field('time').type)
+    expected = (50, 2, pa.timestamp('us'))
+    assert actual == expected, assert_error(expected, actual)
+
+    actual = table.column('product').to_pylist()[::25]
+    expected = [dimap.dataset_name, products[1].dataset_name]
+    assert actual == expected, assert_error(expected, actual)
+
+
+def test_geolocation_grid(dimap):
+
+    data = columnar.columns(dimap, 'geolocation_grid')
+
+    actual = len({len(x) for x in data.values()})
+    expected = 1
+    assert actual == expected, assert_error(expected, actual)
+
+    actual = (str(data['azimuth_time'].dtype), str(data['line'].dtype), str(data['latitude'].dtype))
+    expected = ('datetime64[us]', 'int64', 'float64')
+    assert actual == expected, assert_error(expected, actual)
+
+    actual = round(data['latitude'][0], 6)
+    expected = 65.087503
+    assert actual == expected, assert_error(expected, actual)
+
+
+def test_geolocation_grid_missing_fields(dimap, tmp_path):
+
+    # Remove the latitude and line of the second grid point
+    tree = ET.parse(data2)
+    point = tree.getroot().findall('.//MDElem[@name="geolocationGridPoint"]')[1]
+    for name in ['latitude', 'line']:
+        point.remove(point.find(f'MDATTR[@name="{name}"]'))
+    path = str(tmp_path / 'missing.dim')
+    tree.write(path)
+
+    original = columnar.columns(dimap, 'geolocation_grid')
+    data = columnar.columns(Sentinel1(metadata=path, product='SLC'), 'geolocation_grid')
+
+    actual = {len(x) for x in data.values()}
+    expected = {len(original['latitude'])}
+    assert actual == expected, assert_error(expected, actual)
+
+    actual = (np.isnan(data['latitude'][1]), np.isnan(data['line'][1]), str(data['line'].dtype))
+    expected = (True, True, 'float64')
+    assert actual == expected, assert_error(expected, actual)
+
+    # The other points keep their values
+    mask = np.arange(len(original['latitude'])) != 1
+    for column in ['latitude', 'line']:
+        actual = data[column][mask]
+        expected = original[column][mask]
+        assert np.array_equal(actual, expected), assert_error(expected, actual)
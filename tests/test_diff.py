@@ -0,0 +1,84 @@
+import os
+import xml.etree.ElementTree as ET
+
+import pytest
+
+from PyBeamDimap.missions import Sentinel1
+from PyBeamDimap.reader.diff import Difference, diff_elements, hash_subtrees
+from PyBeamDimap.reader.utils import ABSTRACTED_METADATA_XPATH
+
+TEST_DIR = os.path.abspath('tests')
+data2 = os.path.join(TEST_DIR, 'S1_IW_SLC_DInSARStack_20190902_20190914.dim')
+coherence = os.path.join(TEST_DIR, 'S1_IW_SLC_coherance.dim')
+
+
+def assert_error(expected, actual):
+    return f'Error with extracted XML value. Expecting {expected}. Got {actual}.'
+
+
+@pytest.fixture
+def modified(tmp_path):
+    """
+    Copy of the multiband SLC data with one changed, one removed and one added attribute
+    """
+    tree = ET.parse(data2)
+    metadata = tree.getroot().find(ABSTRACTED_METADATA_XPATH)
+    metadata.find('MDATTR[@name="radar_frequency"]').text = '5405.5'
+    metadata.remove(metadata.find('MDATTR[@name="PASS"]'))
+    added = ET.SubElement(metadata, 'MDATTR', {'name': 'new_attribute', 'type': 'ascii'})
+    added.text = 'value'
+    path = os.path.join(tmp_path, 'modified.dim')
+    tree.write(path)
+    yield path
+
+
+def test_diff_identical():
+
+    dimap = Sentinel1(metadata=data2, product='SLC')
+    actual = dimap.diff(Sentinel1(metadata=data2, product='SLC', compact=True))
+    expected = []
+    assert actual == expected, assert_error(expected, actual)
+
+
+def test_diff_changes(modified):
+
+    prefix = 'Dataset_Sources/metadata/Abstracted_Metadata'
+    actual = Sentinel1(metadata=data2, product='SLC').diff(Sentinel1(metadata=modified, product='SLC'))
+    expected = [Difference(f'{prefix}/PASS', 'removed', 'DESCENDING', None),
+                Difference(f'{prefix}/radar_frequency', 'changed', '5405.000454334349', '5405.5'),
+                Difference(f'{prefix}/new_attribute', 'added', None, 'value')]
+    assert actual == expected, assert_error(expected, actual)
+
+
+def test_diff_xpath():
+
+    old = Sentinel1(metadata=data2, product='SLC')
+    new = Sentinel1(metadata=coherence, product='SLC')
+    differences = old.diff(new, xpath=ABSTRACTED_METADATA_XPATH)
+
+    actual = next(x for x in differences if x.path == 'PRODUCT').to_dict()
+    expected = {'path': 'PRODUCT', 'change': 'changed',
+                'old': 'S1B_IW_SLC__1SDV_20190902T075741_20190902T075808_017856_0219A5_70FA',
+                'new': 'S1B_IW_SLC__1SDV_20190809T075740_20190809T075807_017506_020EC0_4DA0'}
+    assert actual == expected, assert_error(expected, actual)
+
+    with pytest.raises(ValueError):
+        old.diff(new, xpath='./Missing')
+
+
+def test_hash_subtrees():
+
+    root = ET.parse(data2).getroot()
+    hashes = hash_subtrees(root)
+
+    actual = len(hashes)
+    expected = sum(1 for _ in root.iter())
+    assert actual == expected, assert_error(expected, actual)
+
+    # Repeated band elements are matched by their index
+    bands = root.find('Image_Interpretation')
+    other = ET.fromstring(ET.tostring(bands))
+    other[1].find('BAND_NAME').text = 'renamed'
+    actual = [x.path for x in diff_elements(bands, other)]
+    expected = ['Spectral_Band_Info[1]/BAND_NAME']
+    assert actual == expected, assert_error(expected, actual)
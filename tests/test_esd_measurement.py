@@ -0,0 +1,99 @@
+import xml.etree.ElementTree as ET
+
+import numpy as np
+import pytest
+
+from PyBeamDimap.reader.abstracted_metadata import EsdMeasurement
+
+
+def assert_error(expected, actual):
+    return f'Error with extracted XML value. Expecting {expected}. Got {actual}.'
+
+
+ESD_XML = """
+<Dimap_Document>
+    <Dataset_Sources>
+        <MDElem name="metadata">
+            <MDElem name="Abstracted_Metadata">
+                <MDElem name="ESD Measurement">
+                    <MDElem name="IW1_VV_mst_02Sep2019_IW1_VV_slv1_14Sep2019">
+                        <MDElem name="Overall_Range_Azimuth_Shift">
+                            <MDElem name="IW1">
+                                <MDATTR name="rangeShift" type="float32">0.25</MDATTR>
+                                <MDATTR name="azimuthShift" type="float32">-0.5</MDATTR>
+                            </MDElem>
+                        </MDElem>
+                        <MDElem name="Azimuth_Shift_Per_Burst">
+                            <MDElem name="IW1">
+                                <MDElem name="Burst0">
+                                    <MDATTR name="azimuthShift" type="float32">0.1</MDATTR>
+                                </MDElem>
+                                <MDElem name="Burst1">
+                                    <MDATTR name="azimuthShift" type="float32">0.2</MDATTR>
+                                </MDElem>
+                            </MDElem>
+                        </MDElem>
+                    </MDElem>
+                    <MDElem name="IW1_VV_mst_02Sep2019_IW1_VV_slv2_26Sep2019">
+                        <MDElem name="Overall_Range_Azimuth_Shift">
+                            <MDElem name="IW1">
+                                <MDATTR name="rangeShift" type="float32">0.75</MDATTR>
+                                <MDATTR name="azimuthShift" type="float32">1.5</MDATTR>
+                            </MDElem>
+                        </MDElem>
+                    </MDElem>
+                </MDElem>
+            </MDElem>
+        </MDElem>
+    </Dataset_Sources>
+</Dimap_Document>
+"""
+
+
+@pytest.fixture
+def esd():
+    yield EsdMeasurement(ET.fromstring(ESD_XML), 'SLC')
+
+
+def test_all_parameters_loaded(esd):
+
+    actual = esd.parameters
+    expected = ['Overall_Range_Azimuth_Shift', 'Azimuth_Shift_Per_Burst']
+    assert actual == expected, assert_error(expected, actual)
+
+    actual = esd.dataframe(param='Overall_Range_Azimuth_Shift', verbose=False).loc['azimuthShift']['IW1']
+    expected = '-0.5'
+    assert actual == expected, assert_error(expected, actual)
+
+    actual = esd.dataframe(param='Azimuth_Shift_Per_Burst', verbose=False).loc['azimuthShift']['Burst1_IW1']
+    expected = '0.2'
+    assert actual == expected, assert_error(expected, actual)
+
+
+def test_shift_arrays(esd):
+
+    shifts = esd.shifts()
+    actual = len(shifts['value'])
+    expected = 6
+    assert actual == expected, assert_error(expected, actual)
+
+    actual = esd.bursts.tolist()
+    expected = [-1, 0, 1]
+    assert actual == expected, assert_error(expected, actual)
+
+    azimuth = esd.get_array('azimuthShift')
+    actual = azimuth.shape
+    expected = (2, 2, 1, 3)
+    assert actual == expected, assert_error(expected, actual)
+
+    actual = azimuth[:, 0, 0, 0].tolist()
+    expected = [-0.5, 1.5]
+    assert actual == expected, assert_error(expected, actual)
+
+    actual = azimuth[0, 1, 0, 1:].tolist()
+    expected = pytest.approx([0.1, 0.2])
+    assert actual == expected, assert_error(expected, actual)
+
+    actual = np.isnan(azimuth[1, 1]).all()
+    expected = True
+    assert actual == expected, assert_error(expected, actual)
@@ -0,0 +1,126 @@
+import io
+import json
+import os
+
+import pytest
+
+from PyBeamDimap import export
+from PyBeamDimap.missions import Sentinel1
+
+TEST_DIR = os.path.abspath('tests')
+data2 = os.path.join(TEST_DIR, 'S1_IW_SLC_DInSARStack_20190902_20190914.dim')
+
+
+def assert_error(expected, actual):
+    return f'Error with extracted XML value. Expecting {expected}. Got {actual}.'
+
+
+class EndCounter:
+    # Parser target counting the end events it received
+
+    def __init__(self):
+        self.ends = 0
+
+    def start(self, tag, attrib):
+        pass
+
+    def data(self, data):
+        pass
+
+    def end(self, tag):
+        self.ends += 1
+
+
+def abstracted_metadata(data):
+    return data['Dimap_Document']['Dataset_Sources']['metadata']['Abstracted_Metadata']
+
+
+def test_to_dict():
+
+    data = export.to_dict(data2)
+
+    actual = data['Dimap_Document']['Dataset_Id']['DATASET_NAME']
+    expected = '20190902_20190914_DInSARStack'
+    assert actual == expected, assert_error(expected, actual)
+
+    actual = abstracted_metadata(data)['radar_frequency']
+    expected = {'value': '5405.000454334349', 'type': 'float64', 'unit': 'MHz'}
+    assert actual == expected, assert_error(expected, actual)
+
+    # Repeated elements are collected in a list
+    actual = len(data['Dimap_Document']['Image_Interpretation']['Spectral_Band_Info'])
+    expected = 6
+    assert actual == expected, assert_error(expected, actual)
+
+
+def test_to_dict_typed():
+
+    metadata = abstracted_metadata(export.to_dict(data2, typed=True))
+
+    actual = metadata['radar_frequency']['value']
+    expected = 5405.000454334349
+    assert actual == expected, assert_error(expected, actual)
+
+    actual = metadata['first_line_time']['value']
+    expected = '2019-09-02T07:57:57.910628'
+    assert actual == expected, assert_error(expected, actual)
+
+    actual = metadata['ABS_ORBIT']['value']
+    expected = 17856
+    assert actual == expected, assert_error(expected, actual)
+
+
+def test_to_dict_product():
+
+    dimap = Sentinel1(metadata=data2, product='SLC')
+    actual = dimap.to_dict(typed=True) == export.to_dict(data2, typed=True)
+    expected = True
+    assert actual == expected, assert_error(expected, actual)
+
+
+def test_to_json():
+
+    f = io.StringIO()
+    export.to_json(data2, f, typed=True)
+    actual = json.loads(f.getvalue()) == json.loads(export.to_json(data2, typed=True))
+    expected = True
+    assert actual == expected, assert_error(expected, actual)
+
+
+def test_iter_records():
+
+    records = list(export.iter_records(data2, typed=True))
+    record = next(x for x in records if x['path'].endswith('Abstracted_Metadata/radar_frequency'))
+
+    actual = record
+    expected = {'path': 'Dimap_Document/Dataset_Sources/metadata/Abstracted_Metadata/radar_frequency',
+                'value': 5405.000454334349, 'type': 'float64', 'unit': 'MHz'}
+    assert actual == expected, assert_error(expected, actual)
+
+    f = io.StringIO()
+    actual = export.write_records(data2, f)
+    expected = len(records)
+    assert actual == expected, assert_error(expected, actual)
+
+    with pytest.raises(ValueError):
+        export.write_records(data2, f, output_format='csv')
+
+    # Products are replayed element by element and yield the same records
+    dimap = Sentinel1(metadata=data2, product='SLC')
+    actual = list(export.iter_records(dimap, typed=True)) == records
+    expected = True
+    assert actual == expected, assert_error(expected, actual)
+
+    target = EndCounter()
+    next(export.parse_events(dimap, target))
+    actual = target.ends
+    expected = 1
+    assert actual == expected, assert_error(expected, actual)
+
+
+def test_to_msgpack():
+
+    msgpack = pytest.importorskip('msgpack')
+    actual = msgpack.unpackb(export.to_msgpack(data2, typed=True))
+    expected = export.to_dict(data2, typed=True)
+    assert actual == expected, assert_error(expected, actual)
@@ -0,0 +1,88 @@
+import os
+import xml.etree.ElementTree as ET
+
+from PyBeamDimap.catalog import Catalog, read_catalog_record
+from PyBeamDimap.fingerprint import fingerprint
+from PyBeamDimap.missions import Sentinel1
+
+TEST_DIR = os.path.abspath('tests')
+data1 = os.path.join(TEST_DIR, 'S1_IW_SLC_coherance.dim')
+data2 = os.path.join(TEST_DIR, 'S1_IW_SLC_DInSARStack_20190902_20190914.dim')
+
+
+def assert_error(expected, actual):
+    return f'Error with extracted XML value. Expecting {expected}. Got {actual}.'
+
+
+def write_copy(directory, name, modify):
+    tree = ET.parse(data2)
+    modify(tree.getroot())
+    path = os.path.join(directory, f'{name}.dim')
+    tree.write(path)
+    return path
+
+
+def rename(root):
+    # Copy of the product that was renamed and processed again on another machine
+    root.find('Dataset_Id/DATASET_NAME').text = 'renamed_copy'
+    root.find('Production/DATASET_PRODUCER_NAME').text = 'archive'
+    for element in root.iter('MDATTR'):
+        if element.get('name') in ('PROC_TIME', 'processingTime'):
+            element.text = '01-JAN-2022 00:00:00.000000'
+        elif element.get('name') == 'file':
+            element.text = '/archive/copies/renamed_copy.dim'
+    for element in root.iter('DATA_FILE_PATH'):
+        element.set('href', 'renamed_copy.data/' + element.get('href').split('/')[-1])
+
+
+def change(root):
+    root.find('.//MDATTR[@name="radar_frequency"]').text = '5405.5'
+
+
+def test_fingerprint_ignores_volatile_fields(tmp_path):
+
+    actual = fingerprint(write_copy(tmp_path, 'copy', rename))
+    expected = fingerprint(data2)
+    assert actual == expected, assert_error(expected, actual)
+
+    actual = fingerprint(write_copy(tmp_path, 'changed', change)) == expected
+    expected = False
+    assert actual == expected, assert_error(expected, actual)
+
+
+def test_fingerprint_sources():
+
+    expected = fingerprint(data2)
+
+    actual = fingerprint(ET.parse(data2).getroot())
+    assert actual == expected, assert_error(expected, actual)
+
+    actual = Sentinel1(metadata=data2, product='SLC', compact=True).fingerprint()
+    assert actual == expected, assert_error(expected, actual)
+
+    actual = read_catalog_record(data2, fingerprint=True)['fingerprint']
+    assert actual == expected, assert_error(expected, actual)
+
+    # The fingerprint is kept when the tree is released
+    actual = Sentinel1(metadata=data2, product='SLC', keep_tree=False).fingerprint()
+    assert actual == expected, assert_error(expected, actual)
+
+
+def test_catalog_duplicates(tmp_path):
+
+    copy = write_copy(tmp_path, 'copy', rename)
+    catalog = Catalog.from_files([data1, data2, copy], fingerprint=True)
+
+    actual = sorted(catalog['path'][x] for x in catalog.duplicates()[fingerprint(data2)])
+    expected = sorted([data2, copy])
+    assert actual == expected, assert_error(expected, actual)
+
+    archive = Catalog.from_files([data1, data2])
+    actual = len(catalog.join(archive)[0])
+    expected = 0
+    assert actual == expected, assert_error(expected, actual)
+
+    left, right = catalog.join(Catalog.from_files([data2], fingerprint=True))
+    actual = (sorted(catalog['path'][left]), right.tolist())
+    expected = (sorted([data2, copy]), [0, 0])
+    assert actual == expected, assert_error(expected, actual)
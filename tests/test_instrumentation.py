@@ -0,0 +1,122 @@
+import os
+import threading
+
+import pytest
+
+from PyBeamDimap import instrumentation
+from PyBeamDimap.missions import Sentinel1
+
+TEST_DIR = os.path.abspath('tests')
+data2 = os.path.join(TEST_DIR, 'S1_IW_SLC_DInSARStack_20190902_20190914.dim')
+
+
+def assert_error(expected, actual):
+    return f'Error with extracted XML value. Expecting {expected}. Got {actual}.'
+
+
+@pytest.fixture
+def report():
+    """
+    Record the phases of opening a multiband SLC stack and loading its processing graph
+    """
+    with instrumentation.record() as report:
+        Sentinel1(metadata=data2, product='SLC').ProcessingGraph.get_processing_graph()
+    yield report
+
+
+def test_phases(report):
+
+    names = [x.name for x in report.records]
+    for expected in ['parse', 'abstracted_metadata', 'abstracted_metadata.burst_boundary', 'burst_index',
+                     'abstracted_metadata.esd_measurement', 'slave_metadata', 'processing_graph']:
+        assert expected in names, assert_error(expected, names)
+
+    actual = report.records[0].name
+    expected = 'parse'
+    assert actual == expected, assert_error(expected, actual)
+
+    actual = report.records[0].elements
+    expected = 7872
+    assert actual == expected, assert_error(expected, actual)
+
+    # Section loaders run inside the abstracted metadata phase
+    record = report.records[names.index('abstracted_metadata.burst_boundary')]
+    actual = record.depth
+    expected = 1
+    assert actual == expected, assert_error(expected, actual)
+
+    actual = record.elements
+    expected = 97
+    assert actual == expected, assert_error(expected, actual)
+
+
+def test_acquisition_elements():
+
+    dimap = Sentinel1(metadata=data2, product='SLC')
+    with instrumentation.record() as report:
+        list(dimap.SlaveMetadata)
+
+    # Only the elements of each acquisition are counted
+    actual = [x.elements for x in report.records if x.name == 'slave_metadata.acquisition']
+    expected = [len(list(x._element.iter())) for x in dimap.SlaveMetadata]
+    assert actual == expected, assert_error(expected, actual)
+
+
+def test_threads():
+
+    with instrumentation.record() as report:
+        threads = [threading.Thread(target=Sentinel1, args=(data2, 'SLC')) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    # Phases of other threads do not change the nesting depth
+    actual = sorted({(x.name, x.depth) for x in report.records if x.name in ('parse', 'burst_index')})
+    expected = [('burst_index', 1), ('parse', 0)]
+    assert actual == expected, assert_error(expected, actual)
+
+    actual = report.totals()['parse']['calls']
+    expected = 4
+    assert actual == expected, assert_error(expected, actual)
+
+
+def test_callback():
+
+    records = []
+    with instrumentation.record(callback=records.append) as report:
+        Sentinel1(metadata=data2, product='SLC')
+
+    # Callbacks receive the records as the phases finish
+    actual = sorted(x.name for x in records)
+    expected = sorted(x.name for x in report.records)
+    assert actual == expected, assert_error(expected, actual)
+
+
+def test_report_output(report):
+
+    totals = report.totals()
+    actual = totals['image_interpretation']['calls']
+    expected = 2
+    assert actual == expected, assert_error(expected, actual)
+
+    output = report.to_dict()
+    actual = len(output['records'])
+    expected = len(report)
+    assert actual == expected, assert_error(expected, actual)
+
+    actual = list(report.dataframe().columns)
+    expected = ['name', 'depth', 'wall_time', 'elements', 'allocated']
+    assert actual == expected, assert_error(expected, actual)
+
+
+def test_disabled():
+
+    report = instrumentation.enable(memory=True)
+    instrumentation.disable(report)
+    assert not instrumentation.is_enabled()
+
+    Sentinel1(metadata=data2, product='SLC')
+    actual = len(report)
+    expected = 0
+    assert actual == expected, assert_error(expected, actual)
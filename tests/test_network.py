@@ -0,0 +1,85 @@
+import os
+
+import numpy as np
+import pytest
+
+from PyBeamDimap.missions import Sentinel1
+from PyBeamDimap.network import PairNetwork
+
+TEST_DIR = os.path.abspath('tests')
+data2 = os.path.join(TEST_DIR, 'S1_IW_SLC_DInSARStack_20190902_20190914.dim')
+
+
+def assert_error(expected, actual):
+    return f'Error with extracted XML value. Expecting {expected}. Got {actual}.'
+
+
+@pytest.fixture
+def network():
+    """
+    Six acquisitions with a 12 day repeat cycle and a gap of 60 days after the third acquisition
+    """
+    days = np.array([0, 12, 24, 84, 96, 108])
+    times = np.datetime64('2019-01-01', 'us') + days.astype('timedelta64[D]')
+    yield PairNetwork(times, [0.0, 40.0, -30.0, 10.0, 150.0, 20.0])
+
+
+def test_select_pairs(network):
+
+    actual = network.select(max_temporal=24, max_perpendicular=100, connected=False).tolist()
+    expected = [[0, 1], [0, 2], [1, 2], [3, 5]]
+    assert actual == expected, assert_error(expected, actual)
+
+    actual = network.temporal_baselines([[0, 2], [2, 3]]).tolist()
+    expected = [24.0, 60.0]
+    assert actual == expected, assert_error(expected, actual)
+
+    actual = network.perpendicular_baselines([[0, 2], [3, 4]]).tolist()
+    expected = [-30.0, 140.0]
+    assert actual == expected, assert_error(expected, actual)
+
+    actual = network.select(max_neighbours=1, connected=False).tolist()
+    expected = [[0, 1], [1, 2], [2, 3], [3, 4], [4, 5]]
+    assert actual == expected, assert_error(expected, actual)
+
+
+def test_connected_network(network):
+
+    pairs = network.select(max_temporal=24, max_perpendicular=100, connected=False)
+    actual = network.components(pairs).tolist()
+    expected = [0, 0, 0, 3, 4, 3]
+    assert actual == expected, assert_error(expected, actual)
+
+    # The gap and the isolated acquisition are bridged with consecutive pairs
+    pairs = network.select(max_temporal=24, max_perpendicular=100)
+    actual = pairs.tolist()
+    expected = [[0, 1], [0, 2], [1, 2], [2, 3], [3, 4], [3, 5]]
+    assert actual == expected, assert_error(expected, actual)
+
+    actual = np.unique(network.components(pairs)).tolist()
+    expected = [0]
+    assert actual == expected, assert_error(expected, actual)
+
+
+def test_network_from_stack():
+
+    product = Sentinel1(metadata=data2, product='SLC')
+
+    network = PairNetwork.from_baseline_matrix(product.AbstractedMetadata.baseline_matrix)
+    actual = network.perpendicular.tolist()
+    expected = [0.0, 10.542634010314941]
+    assert actual == expected, assert_error(expected, actual)
+
+    # Baselines computed from the orbits agree with the SNAP Baselines section at near range
+    network = PairNetwork.from_stack(product, pixel=0)
+    actual = network.names
+    expected = ['S1B_IW_SLC__1SDV_20190902T075741_20190902T075808_017856_0219A5_70FA', '20190914_Orb_14Sep2019']
+    assert actual == expected, assert_error(expected, actual)
+
+    actual = network.perpendicular[1]
+    expected = 10.542634010314941
+    assert abs(actual - expected) < 0.1, assert_error(expected, actual)
+
+    actual = network.select(max_temporal=12.5, max_perpendicular=50).tolist()
+    expected = [[0, 1]]
+    assert actual == expected, assert_error(expected, actual)
@@ -0,0 +1,85 @@
+import os
+import shutil
+
+import pytest
+
+from PyBeamDimap.missions import Sentinel1
+from PyBeamDimap.patch import patch
+
+TEST_DIR = os.path.abspath('tests')
+data1 = os.path.join(TEST_DIR, 'S1_IW_SLC_DInSARStack_20190902_20190914.dim')
+
+
+def assert_error(expected, actual):
+    return f'Error with extracted XML value. Expecting {expected}. Got {actual}.'
+
+
+@pytest.fixture
+def path(tmp_path):
+    """
+    Copy of the multiband SLC product that can be patched
+    """
+    yield shutil.copy(data1, tmp_path / 'patched.dim')
+
+
+def test_patch_values(path):
+
+    dimap = Sentinel1(path, 'SLC')
+    descriptions = [f'band {x}' for x in range(len(dimap.ImageInterpretation.band_data))]
+    actual = dimap.patch({'Abstracted_Metadata/PASS': 'ASCENDING <&>',
+                          'Image_Interpretation/Spectral_Band_Info/BAND_DESCRIPTION': descriptions,
+                          'Abstracted_Metadata/Orbit_State_Vectors/*/x_pos': 1.5})
+    expected = {'Abstracted_Metadata/PASS': 1, 'Image_Interpretation/Spectral_Band_Info/BAND_DESCRIPTION': 6,
+                'Abstracted_Metadata/Orbit_State_Vectors/*/x_pos': 25}
+    assert actual == expected, assert_error(expected, actual)
+
+    patched = Sentinel1(path, 'SLC')
+    actual = patched.AbstractedMetadata.get_attribute('PASS')
+    expected = 'ASCENDING <&>'
+    assert actual == expected, assert_error(expected, actual)
+
+    actual = list(patched.ImageInterpretation.get_band_info(attribute='BAND_DESCRIPTION').values())
+    expected = descriptions
+    assert actual == expected, assert_error(expected, actual)
+
+    actual = set(patched.query('Abstracted_Metadata/Orbit_State_Vectors/*/x_pos').tolist())
+    expected = {1.5}
+    assert actual == expected, assert_error(expected, actual)
+
+    # Secondary copies of the abstracted metadata are not matched
+    actual = patched.query('Slave_Metadata/*/PASS').tolist()
+    expected = ['DESCENDING', 'DESCENDING']
+    assert actual == expected, assert_error(expected, actual)
+
+
+def test_patch_copies_other_bytes(path, tmp_path):
+
+    output = tmp_path / 'output.dim'
+    patch(path, {'Abstracted_Metadata/PASS': 'ASCENDING'}, output)
+
+    with open(data1, 'rb') as f:
+        original = f.read().splitlines()
+    with open(output, 'rb') as f:
+        patched = f.read().splitlines()
+
+    actual = [(x, y) for x, y in zip(original, patched) if x != y]
+    expected = [(original[214], original[214].replace(b'>DESCENDING<', b'>ASCENDING<'))]
+    assert actual == expected, assert_error(expected, actual)
+    assert len(original) == len(patched), assert_error(len(original), len(patched))
+
+
+def test_patch_invalid_path(path, tmp_path):
+
+    with open(path, 'rb') as f:
+        expected = f.read()
+
+    with pytest.raises(ValueError):
+        patch(path, {'Abstracted_Metadata/PASS': 'ASCENDING', 'Abstracted_Metadata/NOT_AN_ATTRIBUTE': 1})
+
+    with open(path, 'rb') as f:
+        actual = f.read()
+    assert actual == expected, 'Failed patch changed the source file'
+
+    actual = sorted(os.listdir(tmp_path))
+    expected = ['patched.dim']
+    assert actual == expected, assert_error(expected, actual)
@@ -0,0 +1,94 @@
+import os
+
+import numpy as np
+import pytest
+
+from PyBeamDimap.missions import Sentinel1, Sentinel2
+from PyBeamDimap.reader.query import compile_path
+
+TEST_DIR = os.path.abspath('tests')
+data2 = os.path.join(TEST_DIR, 'S1_IW_SLC_DInSARStack_20190902_20190914.dim')
+s2_data = os.path.join(TEST_DIR, 'S2_1C_ndwi.dim')
+
+
+def assert_error(expected, actual):
+    return f'Error with extracted XML value. Expecting {expected}. Got {actual}.'
+
+
+@pytest.fixture
+def dimap():
+    """
+    Load an instance of BEAM-DIMAP reader with multiband SLC data
+    """
+    yield Sentinel1(metadata=data2, product='SLC')
+
+
+def test_query_values(dimap):
+
+    latitude = dimap.query('Original_Product_Metadata/annotation/*/product/geolocationGrid/**/latitude')
+    actual = (latitude.dtype, latitude.shape)
+    expected = (np.dtype('float64'), (210,))
+    assert actual == expected, assert_error(expected, actual)
+
+    actual = round(float(latitude[0]), 6)
+    expected = 65.087503
+    assert actual == expected, assert_error(expected, actual)
+
+    actual = dimap.query('**/geolocationGridPoint/line').dtype
+    expected = np.dtype('int64')
+    assert actual == expected, assert_error(expected, actual)
+
+    actual = dimap.query('Abstracted_Metadata/first_line_time')[0]
+    expected = np.datetime64('2019-09-02T07:57:57.910628')
+    assert actual == expected, assert_error(expected, actual)
+
+    actual = dimap.query('Abstracted_Metadata/Orbit_State_Vectors/orbit_vector*/x_pos')
+    expected = dimap.AbstractedMetadata.orbit.positions[:, 0]
+    assert np.array_equal(actual, expected), assert_error(expected, actual)
+
+    actual = dimap.query('Abstracted_Metadata/MISSION').tolist()
+    expected = ['SENTINEL-1B']
+    assert actual == expected, assert_error(expected, actual)
+
+    actual = dimap.query('**/geolocationGridPoint/latitude', infer=False).dtype.kind
+    expected = 'U'
+    assert actual == expected, assert_error(expected, actual)
+
+
+def test_query_paths(dimap):
+
+    # The Baselines section repeats the reference acquisition element
+    paths = dimap.query_paths('Abstracted_Metadata/Baselines/Master: 02Sep2019/*/Perp Baseline')
+    actual = (len(paths), paths[:2])
+    expected = (6, ['Abstracted_Metadata/Baselines/Master: 02Sep2019/Slave: 02Sep2019/Perp Baseline',
+                    'Abstracted_Metadata/Baselines/Master: 02Sep2019/Slave: 14Sep2019/Perp Baseline'])
+    assert actual == expected, assert_error(expected, actual)
+
+    actual = dimap.query_paths('Abstracted_Metadata/does_not_exist')
+    expected = []
+    assert actual == expected, assert_error(expected, actual)
+
+
+def test_compiled_paths():
+
+    assert compile_path('a/**/b') is compile_path('a/**/b')
+
+    regex = compile_path('a/**/b').regex
+    for path, expected in [('a\x1fb', True), ('a\x1fx\x1fy\x1fb', True), ('a\x1fxb', False), ('xa\x1fb', False)]:
+        actual = regex.fullmatch(path) is not None
+        assert actual == expected, assert_error(expected, actual)
+
+    regex = compile_path('orbit_vector?/*_pos').regex
+    assert regex.fullmatch('orbit_vector1\x1fx_pos')
+    assert not regex.fullmatch('orbit_vector10\x1fx_pos')
+
+    with pytest.raises(ValueError):
+        compile_path('/')
+
+
+def test_query_sentinel2():
+
+    dimap = Sentinel2(metadata=s2_data, product_type='1C')
+    actual = dimap.query('Processing_Graph/node.0/operator').tolist()
+    expected = ['NdwiOp']
+    assert actual == expected, assert_error(expected, actual)
@@ -1,9 +1,18 @@
 import os
+import pickle
+import subprocess
+import sys
+import xml.etree.ElementTree as ET
 
+import numpy as np
 import pytest
 
 # from PyBeamDimap.reader import BeamDimap
+from PyBeamDimap.geocoding import RangeDopplerGeocoder, ecef_to_geodetic
 from PyBeamDimap.missions import Sentinel1
+from PyBeamDimap.reader.burst_index import BurstIndex
+from PyBeamDimap.reader.timing import SPEED_OF_LIGHT
+from PyBeamDimap.reader.utils import parse_utc
 
 TEST_DIR = os.path.abspath('tests')
 data2 = os.path.join(TEST_DIR, 'S1_IW_SLC_DInSARStack_20190902_20190914.dim')
@@ -136,6 +145,74 @@ def test_data2_abstracted_metadata_dataframe(dimap):
     assert actual == expected, assert_error(expected, actual)
 
 
+def test_data2_abstracted_metadata_attributes(dimap):
+
+    actual = dimap.AbstractedMetadata.attributes['antenna_pointing']
+    expected = 'right'
+    assert actual == expected, assert_error(expected, actual)
+
+    # Dataframes are only created when accessed
+    actual = dimap.AbstractedMetadata._dataframes
+    expected = {}
+    assert actual == expected, assert_error(expected, actual)
+
+
+def test_data2_abstracted_metadata_get_attributes(dimap):
+
+    actual = dimap.AbstractedMetadata.get_attributes(['radar_frequency', 'ABS_ORBIT', 'first_line_time', 'PASS'])
+    expected = {'radar_frequency': 5405.000454334349, 'ABS_ORBIT': 17856,
+                'first_line_time': np.datetime64('2019-09-02T07:57:57.910628'), 'PASS': 'DESCENDING'}
+    assert actual == expected, assert_error(expected, actual)
+
+    actual = dimap.AbstractedMetadata.get_attributes(['ABS_ORBIT'], typed=False)
+    expected = {'ABS_ORBIT': '17856'}
+    assert actual == expected, assert_error(expected, actual)
+
+    with pytest.raises(ValueError):
+        dimap.AbstractedMetadata.get_attributes(['ABS_ORBIT', 'missing'])
+
+
+def test_data2_abstracted_metadata_get_section(dimap):
+
+    section = dimap.AbstractedMetadata.get_section('look_directions')
+    actual = section['look_direction1']
+    expected = {'time': '02-SEP-2019 07:57:57.910628', 'head_lat': '64.26755881338691',
+                'head_lon': '-23.65814095401453', 'tail_lat': '64.10826110839844', 'tail_lon': '-21.819546983779553'}
+    assert actual == expected, assert_error(expected, actual)
+
+    actual = dimap.AbstractedMetadata.get_section('srgr_coeffs')
+    expected = None
+    assert actual == expected, assert_error(expected, actual)
+
+    with pytest.raises(ValueError):
+        dimap.AbstractedMetadata.get_section('dataframe')
+
+
+def test_data2_abstracted_metadata_record(dimap):
+
+    record = pickle.loads(pickle.dumps(dimap.AbstractedMetadata.record))
+
+    actual = (record.radar_frequency, record['ABS_ORBIT'], record.get_unit('radar_frequency'), record.get('missing'))
+    expected = (5405.000454334349, 17856, 'MHz', None)
+    assert actual == expected, assert_error(expected, actual)
+
+    actual = len(record)
+    expected = len(set(dimap.AbstractedMetadata.dataframe['Name']))
+    assert actual == expected, assert_error(expected, actual)
+
+    with pytest.raises(AttributeError):
+        record.missing
+
+
+def test_import_without_pandas():
+
+    code = 'import sys, PyBeamDimap.missions; print("pandas" in sys.modules)'
+    actual = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True,
+                            cwd=os.path.dirname(TEST_DIR)).stdout.strip()
+    expected = 'False'
+    assert actual == expected, assert_error(expected, actual)
+
+
 def test_nested_abstracted_metadata_sections(dimap):
 
     # Orbit state vectors
@@ -240,3 +317,234 @@ def test_data2_processing_graph_with_nonetypes(dimap):
                 'sources': {'sourceProduct': 'product:S1B_IW_SLC__1SDV_20190902T075741_20190902T075808_017856_0219A5_70FA'},
                 'parameters': {'orbitType': 'Sentinel Precise (Auto Download)', 'continueOnFail': 'true', 'polyDegree': '3'}}
     assert actual == expected, assert_error(expected, actual)
+
+
+def test_data2_burst_index(dimap):
+
+    burst_index = dimap.AbstractedMetadata.burst_index
+
+    actual = len(burst_index)
+    expected = 2
+    assert actual == expected, assert_error(expected, actual)
+
+    actual = burst_index.swaths
+    expected = ['IW2']
+    assert actual == expected, assert_error(expected, actual)
+
+    actual = str(burst_index.azimuth_start[0])
+    expected = '2019-09-02T07:57:57.909601'
+    assert actual == expected, assert_error(expected, actual)
+
+    # DIMAP month names can contain the ISO date/time separator
+    actual = parse_utc(['02-OCT-2019 07:57:57.909601', '2019-10-02T07:57:57.909601']).astype(str).tolist()
+    expected = ['2019-10-02T07:57:57.909601', '2019-10-02T07:57:57.909601']
+    assert actual == expected, assert_error(expected, actual)
+
+    actual = burst_index.polygons[1, 0].tolist()
+    expected = [-21.90974, 63.9351]
+    assert actual == expected, assert_error(expected, actual)
+
+    actual = burst_index.debursted
+    expected = True
+    assert actual == expected, assert_error(expected, actual)
+
+    actual = burst_index.find_lines([0, 1426.5, 2852, 3000], 'IW2').tolist()
+    expected = [0, 1, 1, -1]
+    assert actual == expected, assert_error(expected, actual)
+
+    actual = burst_index.find_times(['2019-09-02T07:57:58', '2019-09-02T07:58:02', '2019-09-02T07:59:00'],
+                                    'IW2').tolist()
+    expected = [0, 1, -1]
+    assert actual == expected, assert_error(expected, actual)
+
+    actual = burst_index.find_points([-22.5, -22.5, -22.5], [64.1, 63.85, 63.5]).tolist()
+    expected = [0, 1, -1]
+    assert actual == expected, assert_error(expected, actual)
+
+
+def test_data2_burst_index_without_boundary():
+
+    # Without the BurstBoundary section the lines of the original SLC swath are used. The stack is debursted, so
+    # a burst list with 1500 lines per burst is added to its annotation.
+    root = ET.parse(data2).getroot()
+    abstracted = root.find('.//MDElem[@name="Abstracted_Metadata"]')
+    abstracted.remove(abstracted.find('MDElem[@name="BurstBoundary"]'))
+    timing = root.find('.//MDElem[@name="swathTiming"]')
+    timing.find('MDATTR[@name="linesPerBurst"]').text = '1500'
+    burst_list = timing.find('MDElem[@name="burstList"]')
+    for time in ['2019-09-02T07:57:57.909601', '2019-09-02T07:58:00.667612']:
+        burst = ET.SubElement(burst_list, 'MDElem', name='burst')
+        ET.SubElement(burst, 'MDATTR', name='azimuthTime').text = time
+        ET.SubElement(burst, 'MDATTR', name='firstValidSample').text = '-1 10 10 -1'
+        ET.SubElement(burst, 'MDATTR', name='lastValidSample').text = '-1 20000 20000 -1'
+    burst_index = BurstIndex(root)
+
+    actual = burst_index.debursted
+    expected = False
+    assert actual == expected, assert_error(expected, actual)
+
+    actual = (burst_index.first_line.tolist(), burst_index.last_line.tolist())
+    expected = ([0.0, 1500.0], [1499.0, 2999.0])
+    assert actual == expected, assert_error(expected, actual)
+
+    actual = burst_index.find_lines([1499, 1500], 'IW2').tolist()
+    expected = [0, 1]
+    assert actual == expected, assert_error(expected, actual)
+
+
+def test_data2_slave_metadata(dimap):
+
+    actual = dimap.SlaveMetadata.acquisitions
+    expected = ['20190914_Orb_14Sep2019', '20190902_20190914_disp_TC_02Sep2019']
+    assert actual == expected, assert_error(expected, actual)
+
+    acquisition = dimap.SlaveMetadata.get_acquisition('20190914_Orb_14Sep2019')
+    actual = acquisition.get_attribute('PRODUCT')
+    expected = 'S1B_IW_SLC__1SDV_20190914T075741_20190914T075808_018031_021F1C_CC9C'
+    assert actual == expected, assert_error(expected, actual)
+
+    actual = str(acquisition.first_line_time)
+    expected = '2019-09-14T07:57:58.519331'
+    assert actual == expected, assert_error(expected, actual)
+
+    actual = acquisition.orbit_state_vectors.positions.shape
+    expected = (25, 3)
+    assert actual == expected, assert_error(expected, actual)
+
+    actual = dimap.SlaveMetadata.get_column('ABS_ORBIT').tolist()
+    expected = [18031, 17856]
+    assert actual == expected, assert_error(expected, actual)
+
+    # Primary orbit state vectors are not taken from the secondary copies
+    actual = dimap.AbstractedMetadata.orbit.positions[0, 0]
+    expected = 3085342.723941803
+    assert actual == expected, assert_error(expected, actual)
+
+
+def test_data2_baseline_matrix(dimap):
+
+    baselines = dimap.AbstractedMetadata.baseline_matrix
+
+    actual = [str(x) for x in baselines.dates]
+    expected = ['2019-09-02', '2019-09-14']
+    assert actual == expected, assert_error(expected, actual)
+
+    actual = baselines.perpendicular[0, 1]
+    expected = 10.542634010314941
+    assert actual == expected, assert_error(expected, actual)
+
+    actual = baselines.perpendicular[1, 0]
+    expected = -10.542579650878906
+    assert actual == expected, assert_error(expected, actual)
+
+    actual = baselines.get_matrix('Modelled Coherence')[baselines.get_index('14Sep2019'), 0]
+    expected = 0.9797642827033997
+    assert actual == expected, assert_error(expected, actual)
+
+    actual = baselines.select_pairs(max_perpendicular=50, max_temporal=12.5).tolist()
+    expected = [[0, 1]]
+    assert actual == expected, assert_error(expected, actual)
+
+    actual = baselines.select_pairs(max_perpendicular=5).tolist()
+    expected = []
+    assert actual == expected, assert_error(expected, actual)
+
+
+def test_data2_geocoding(dimap):
+
+    geocoder = RangeDopplerGeocoder(dimap.AbstractedMetadata)
+
+    # Compare against the annotation geolocation grid. The last grid row is skipped as its azimuth time is not
+    # consistent with the other rows.
+    points = dimap._metadata.findall('.//MDElem[@name="geolocationGridPoint"]')
+    rows = [{x.attrib['name']: x.text for x in point} for point in points]
+    rows = [x for x in rows if x['line'] != '13625']
+    times = np.array([x['azimuthTime'] for x in rows], dtype='datetime64[us]')
+    slant_range = np.array([float(x['slantRangeTime']) for x in rows]) * SPEED_OF_LIGHT / 2
+    heights = np.array([float(x['height']) for x in rows])
+    lat, lon, _ = ecef_to_geodetic(geocoder.time_range_to_ecef(times, slant_range, heights))
+
+    # The first grid rows are older than the first orbit state vector and are not geolocated
+    inside = (times >= geocoder._orbit.times[0]) & (times <= geocoder._orbit.times[-1])
+    actual = int(inside.sum())
+    expected = 126
+    assert actual == expected, assert_error(expected, actual)
+    assert np.isnan(lat[~inside]).all(), assert_error(np.nan, lat[~inside])
+
+    actual = np.abs(lat - np.array([float(x['latitude']) for x in rows]))[inside].max()
+    expected = 0.0005
+    assert actual < expected, assert_error(expected, actual)
+
+    actual = np.abs(lon - np.array([float(x['longitude']) for x in rows]))[inside].max()
+    expected = 0.005
+    assert actual < expected, assert_error(expected, actual)
+
+    # Orbit interpolation does not extrapolate either
+    positions, velocities = geocoder._orbit.interpolate(times[[0, -1]])
+    actual = [np.isnan(positions).all(axis=-1).tolist(), np.isnan(velocities).all(axis=-1).tolist()]
+    expected = [[True, False], [True, False]]
+    assert actual == expected, assert_error(expected, actual)
+
+    # Pixel to geodetic to pixel round trip
+    lines = np.array([0, 100, 1389])
+    pixels = np.array([0, 2000, 5281])
+    lat, lon, heights = geocoder.pixel_to_geodetic(lines, pixels, 150.0)
+    actual_lines, actual_pixels = geocoder.geodetic_to_pixel(lat, lon, heights)
+    assert np.allclose(actual_lines, lines, atol=1e-3), assert_error(lines, actual_lines)
+    assert np.allclose(actual_pixels, pixels, atol=1e-3), assert_error(pixels, actual_pixels)
+
+    # Chunked solving in a thread pool gives the same result
+    chunked = RangeDopplerGeocoder(dimap.AbstractedMetadata, workers=4, chunk_size=7)
+    lines, pixels = np.meshgrid(np.arange(0, 1390, 100), np.arange(0, 5282, 500))
+    actual = chunked.pixel_to_ecef(lines, pixels)
+    expected = geocoder.pixel_to_ecef(lines, pixels)
+    assert np.array_equal(actual, expected), assert_error(expected, actual)
+
+
+def test_data2_radar_timing(dimap):
+
+    timing = dimap.AbstractedMetadata.timing
+
+    actual = str(timing.line_to_time(0))
+    expected = '2019-09-02T07:57:57.910628000'
+    assert actual == expected, assert_error(expected, actual)
+
+    actual = str(timing.line_to_time(1000))
+    expected = '2019-09-02T07:58:02.021740561'
+    assert actual == expected, assert_error(expected, actual)
+
+    lines = np.array([0.0, 10.5, 1389.0])
+    actual = timing.time_to_line(timing.line_to_time(lines))
+    assert np.allclose(actual, lines, atol=1e-6), assert_error(lines, actual)
+
+    actual = timing.pixel_to_slant_range(2.0)
+    expected = 850539.3959360173 + 2 * 41.85918195208061
+    assert actual == expected, assert_error(expected, actual)
+
+    pixels = np.array([0.0, 100.25, 5281.0])
+    actual = timing.range_time_to_pixel(timing.pixel_to_range_time(pixels))
+    assert np.allclose(actual, pixels, atol=1e-6), assert_error(pixels, actual)
+
+    # Product is a 2 x 6 multilook of a subset starting at line 9084 of the source image
+    actual = [x.tolist() for x in timing.to_source([0, 1], [0, 1])]
+    expected = [[9084.5, 9086.5], [2.5, 8.5]]
+    assert actual == expected, assert_error(expected, actual)
+
+    actual = [x.tolist() for x in timing.from_source(*timing.to_source([0, 1], [0, 1]))]
+    expected = [[0.0, 1.0], [0.0, 1.0]]
+    assert actual == expected, assert_error(expected, actual)
+
+
+def test_data2_footprint(dimap):
+
+    actual = dimap.footprint.bounds
+    expected = (-23.81305948122161, 63.743583455954365, -21.82057821473883, 64.26764262640401)
+    assert actual == expected, assert_error(expected, actual)
+
+    actual = dimap.footprint.intersects_bbox((-24.0, 64.0, -23.5, 65.0))
+    expected = True
+    assert actual == expected, assert_error(expected, actual)
+
+    actual = dimap.footprint.intersects_bbox((-21.0, 64.0, -20.0, 65.0))
+    expected = False
+    assert actual == expected, assert_error(expected, actual)
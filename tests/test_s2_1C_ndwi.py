@@ -88,3 +88,21 @@ def test_processing_graph_with_attributes(dimap):
     expected = 'file:/C:/Users/Angelo/Documents/PANJI/Projects/beam-dimap-reader/S2B_MSIL1C_20211203T022049_N0301_R003_T51PTS_20211203T042026_ndwi.dim'
     assert actual == expected, assert_error(expected, actual)
 
+
+
+def test_footprint(dimap):
+    """
+    Footprint is computed from the UTM raster extent
+    """
+    actual = [round(x, 4) for x in dimap.footprint.bounds]
+    expected = [120.2055, 14.3681, 121.2359, 15.3701]
+    assert actual == expected, assert_error(expected, actual)
+
+    # Upper left corner of tile T51PTS
+    actual = [round(x, 4) for x in dimap.footprint.polygon[0]]
+    expected = [120.2055, 15.3596]
+    assert actual == expected, assert_error(expected, actual)
+
+    actual = dimap.footprint.contains(120.7, 14.9)
+    expected = True
+    assert actual == expected, assert_error(expected, actual)
@@ -0,0 +1,94 @@
+import multiprocessing
+import os
+import pickle
+
+import numpy as np
+import pytest
+
+from PyBeamDimap import columnar, shared
+
+# multiprocessing.shared_memory was added in Python 3.8
+pytest.importorskip('multiprocessing.shared_memory')
+from PyBeamDimap.missions import Sentinel1
+
+TEST_DIR = os.path.abspath('tests')
+data1 = os.path.join(TEST_DIR, 'S1_IW_SLC_DInSARStack_20190902_20190914.dim')
+
+
+def assert_error(expected, actual):
+    return f'Error with extracted XML value. Expecting {expected}. Got {actual}.'
+
+
+def test_share_arrays_round_trip():
+
+    arrays = {'a': np.arange(5, dtype='int32'), 'b': np.linspace(0, 1, 3),
+              'c': np.array(['2019-09-02T07:57:47'], dtype='datetime64[us]'), 'd': np.array(['IW1', 'IW2'])}
+    handle = shared.share_arrays(arrays)
+    handle = pickle.loads(pickle.dumps(handle))
+
+    with handle as attached:
+        for key, values in arrays.items():
+            assert np.array_equal(attached[key], values), assert_error(values, attached[key])
+            assert attached[key].dtype == values.dtype, assert_error(values.dtype, attached[key].dtype)
+
+        actual = [attached[x].ctypes.data % shared.ALIGNMENT for x in arrays]
+        expected = [0] * len(arrays)
+        assert actual == expected, assert_error(expected, actual)
+        del attached
+
+
+def test_share_arrays_object_dtype():
+
+    with pytest.raises(ValueError):
+        shared.share_arrays({'a': np.array([None, 1])})
+
+
+def test_load_shared_pool():
+
+    with multiprocessing.get_context('spawn').Pool(1) as pool:
+        handle, = pool.map(shared.load_shared, [data1])
+
+    dimap = Sentinel1(data1, 'SLC')
+    with handle as attached:
+        grouped = shared.tables(attached)
+
+        actual = sorted(grouped)
+        expected = sorted(shared.DEFAULT_TABLES)
+        assert actual == expected, assert_error(expected, actual)
+
+        for table in shared.DEFAULT_TABLES:
+            for column, values in columnar.columns(dimap, table).items():
+                actual = grouped[table][column]
+                assert np.array_equal(actual, values), assert_error(values, actual)
+        del grouped, attached
+
+
+@pytest.mark.skipif(not os.path.isdir('/dev/shm'), reason='Shared memory blocks are not listed in /dev/shm')
+def test_dropped_handle_frees_block():
+
+    handle = shared.share_arrays({'a': np.arange(5)})
+    path = os.path.join('/dev/shm', handle.name)
+    assert os.path.exists(path), assert_error(True, False)
+
+    del handle
+    actual = os.path.exists(path)
+    expected = False
+    assert actual == expected, assert_error(expected, actual)
+
+
+@pytest.mark.skipif(not os.path.isdir('/dev/shm'), reason='Shared memory blocks are not listed in /dev/shm')
+def test_pool_handles_freed_by_parent():
+
+    with multiprocessing.get_context('spawn').Pool(1) as pool:
+        handles = pool.map(shared.share_arrays, [{'a': np.arange(5)}, {'b': np.arange(3)}])
+
+    # The worker has exited and the parent owns the blocks
+    paths = [os.path.join('/dev/shm', x.name) for x in handles]
+    actual = [os.path.exists(x) for x in paths]
+    expected = [True, True]
+    assert actual == expected, assert_error(expected, actual)
+
+    del handles
+    actual = [os.path.exists(x) for x in paths]
+    expected = [False, False]
+    assert actual == expected, assert_error(expected, actual)
@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+
+from PyBeamDimap.reader.footprint import Footprint
+from PyBeamDimap.spatial_index import FootprintIndex, STRtree
+
+
+def assert_error(expected, actual):
+    return f'Error with extracted XML value. Expecting {expected}. Got {actual}.'
+
+
+@pytest.fixture
+def bounds():
+    """
+    Random product bounds spread over the globe
+    """
+    rng = np.random.default_rng(0)
+    lon = rng.uniform(-180, 178, 5000)
+    lat = rng.uniform(-80, 78, 5000)
+    yield np.column_stack([lon, lat, lon + rng.uniform(0.1, 2, 5000), lat + rng.uniform(0.1, 2, 5000)])
+
+
+def brute_force(bounds, bbox):
+    return np.where((bounds[:, 0] <= bbox[2]) & (bounds[:, 2] >= bbox[0]) &
+                    (bounds[:, 1] <= bbox[3]) & (bounds[:, 3] >= bbox[1]))[0]
+
+
+def test_str_tree_matches_brute_force(bounds):
+
+    tree = STRtree(bounds, node_capacity=8)
+    for bbox in [(10, 10, 12, 11), (-180, -90, 180, 90), (179, 89, 180, 90), (-50.5, 20.5, -50.5, 20.5)]:
+        expected = brute_force(bounds, bbox).tolist()
+        actual = tree.query_bbox(bbox).tolist()
+        assert actual == expected, assert_error(expected, actual)
+
+    actual = tree.query_point(*bounds[42, :2]).tolist()
+    assert 42 in actual, assert_error(42, actual)
+
+
+def test_str_tree_small_inputs():
+
+    actual = STRtree([]).query_bbox((0, 0, 1, 1)).tolist()
+    expected = []
+    assert actual == expected, assert_error(expected, actual)
+
+    actual = STRtree([[0, 0, 1, 1]]).query_point(0.5, 0.5).tolist()
+    expected = [0]
+    assert actual == expected, assert_error(expected, actual)
+
+
+def test_footprint_index():
+
+    # A diamond and a square whose bounds overlap at (1.8, 1.8) while only the square contains it
+    footprints = [Footprint([[1, 0], [2, 1], [1, 2], [0, 1]]), Footprint([[1.5, 1.5], [3, 1.5], [3, 3], [1.5, 3]])]
+    index = FootprintIndex(footprints, names=['diamond', 'square'])
+
+    actual = index.contains(1.8, 1.8)
+    expected = ['square']
+    assert actual == expected, assert_error(expected, actual)
+
+    actual = index.contains(1.8, 1.8, exact=False)
+    expected = ['diamond', 'square']
+    assert actual == expected, assert_error(expected, actual)
+
+    actual = index.intersects((0.9, 0.9, 1.1, 1.1))
+    expected = ['diamond']
+    assert actual == expected, assert_error(expected, actual)
+
+    # Box crossing the diamond edges without containing a vertex of either shape
+    actual = index.intersects((0.4, -1, 0.6, 3))
+    expected = ['diamond']
+    assert actual == expected, assert_error(expected, actual)
@@ -0,0 +1,82 @@
+import xml.etree.ElementTree as ET
+
+import numpy as np
+import pytest
+
+from PyBeamDimap.reader.srgr import SrgrCoefficients
+
+
+def assert_error(expected, actual):
+    return f'Error with extracted XML value. Expecting {expected}. Got {actual}.'
+
+
+SRGR_XML = """
+<MDElem name="SRGR_Coefficients">
+    <MDElem name="srgr_coef_list.1">
+        <MDATTR name="zero_doppler_time" type="utc">21-DEC-2021 07:50:32.000000</MDATTR>
+        <MDATTR name="ground_range_origin" type="float64">0.0</MDATTR>
+        <MDElem name="coefficient.1">
+            <MDATTR name="srgr_coef" type="float64">800000.0</MDATTR>
+        </MDElem>
+        <MDElem name="coefficient.2">
+            <MDATTR name="srgr_coef" type="float64">0.5</MDATTR>
+        </MDElem>
+        <MDElem name="coefficient.3">
+            <MDATTR name="srgr_coef" type="float64">2.0E-7</MDATTR>
+        </MDElem>
+    </MDElem>
+    <MDElem name="srgr_coef_list.2">
+        <MDATTR name="zero_doppler_time" type="utc">21-DEC-2021 07:50:42.000000</MDATTR>
+        <MDATTR name="ground_range_origin" type="float64">0.0</MDATTR>
+        <MDElem name="coefficient.1">
+            <MDATTR name="srgr_coef" type="float64">800100.0</MDATTR>
+        </MDElem>
+        <MDElem name="coefficient.2">
+            <MDATTR name="srgr_coef" type="float64">0.6</MDATTR>
+        </MDElem>
+        <MDElem name="coefficient.3">
+            <MDATTR name="srgr_coef" type="float64">2.0E-7</MDATTR>
+        </MDElem>
+    </MDElem>
+</MDElem>
+"""
+
+
+@pytest.fixture
+def srgr():
+    yield SrgrCoefficients(ET.fromstring(SRGR_XML))
+
+
+def test_srgr_coefficients(srgr):
+
+    actual = srgr.coefficients.shape
+    expected = (2, 3)
+    assert actual == expected, assert_error(expected, actual)
+
+    actual = srgr.coefficients[1].tolist()
+    expected = [800100.0, 0.6, 2.0e-7]
+    assert actual == expected, assert_error(expected, actual)
+
+    actual = str(srgr.times[0])
+    expected = '2021-12-21T07:50:32.000000'
+    assert actual == expected, assert_error(expected, actual)
+
+
+def test_srgr_conversion(srgr):
+
+    ground_range = np.array([0.0, 1000.0, 100000.0])
+
+    actual = srgr.ground_to_slant(np.datetime64('2021-12-21T07:50:32'), ground_range).tolist()
+    expected = pytest.approx([800000.0, 800500.2, 852000.0])
+    assert actual == expected, assert_error(expected, actual)
+
+    # Halfway between the coefficient sets the coefficients are averaged
+    actual = srgr.ground_to_slant(np.datetime64('2021-12-21T07:50:37'), 1000.0)
+    expected = pytest.approx(800050.0 + 550.0 + 0.2)
+    assert actual == expected, assert_error(expected, actual)
+
+    times = np.array(['2021-12-21T07:50:30', '2021-12-21T07:50:35', '2021-12-21T07:50:45'], dtype='datetime64[us]')
+    slant_range = srgr.ground_to_slant(times, ground_range)
+    actual = srgr.slant_to_ground(times, slant_range)
+    expected = pytest.approx(ground_range, abs=1e-6)
+    assert actual == expected, assert_error(expected, actual)
@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+
+from PyBeamDimap.geocoding import RangeDopplerGeocoder
+from PyBeamDimap.missions import Sentinel1
+from PyBeamDimap.network import PairNetwork
+from PyBeamDimap.synthetic import write_dimap
+
+
+def assert_error(expected, actual):
+    return f'Error with extracted XML value. Expecting {expected}. Got {actual}.'
+
+
+@pytest.fixture
+def dimap(tmp_path):
+    """
+    Load a synthetic stack with one reference and three secondary acquisitions
+    """
+    path = write_dimap(tmp_path / 'synthetic.dim', bands=5, orbit_vectors=13, graph_nodes=4, secondaries=3,
+                       annotation_points=100, bursts=3)
+    yield Sentinel1(metadata=path, product='SLC')
+
+
+def test_section_sizes(dimap):
+
+    actual = len(dimap.ImageInterpretation.get_band_info())
+    expected = 5
+    assert actual == expected, assert_error(expected, actual)
+
+    actual = len(dimap.AbstractedMetadata.orbit_state_vectors.columns)
+    expected = 13
+    assert actual == expected, assert_error(expected, actual)
+
+    actual = [x['operator'] for x in dimap.ProcessingGraph.get_processing_graph()]
+    expected = ['Read', 'Operator-1', 'Operator-2', 'Write']
+    assert actual == expected, assert_error(expected, actual)
+
+    actual = len(dimap.SlaveMetadata)
+    expected = 3
+    assert actual == expected, assert_error(expected, actual)
+
+    actual = len(dimap.AbstractedMetadata.burst_index)
+    expected = 3
+    assert actual == expected, assert_error(expected, actual)
+
+
+def test_orbit_geometry(dimap):
+    """
+    The synthetic orbits must be consistent with the corners and the Baselines section
+    """
+    west, south, east, north = dimap.footprint.bounds
+    lat, lon, _ = RangeDopplerGeocoder(dimap.AbstractedMetadata).pixel_to_geodetic(750, 2500)
+    assert south < lat < north and west < lon < east
+
+    network = PairNetwork.from_stack(dimap)
+    actual = np.sign(network.perpendicular).tolist()
+    expected = np.sign(dimap.AbstractedMetadata.baseline_matrix.perpendicular[0]).tolist()
+    assert actual == expected, assert_error(expected, actual)
+
+
+def test_reproducible(tmp_path):
+
+    first = write_dimap(tmp_path / 'a.dim', seed=3)
+    second = write_dimap(tmp_path / 'b.dim', seed=3)
+    with open(first) as a, open(second) as b:
+        assert a.read() == b.read()
@@ -0,0 +1,77 @@
+import os
+import xml.etree.ElementTree as ET
+
+import pytest
+
+from PyBeamDimap.missions import Sentinel1, Sentinel2
+from PyBeamDimap.reader.tree import from_element, parse_compact
+
+TEST_DIR = os.path.abspath('tests')
+data2 = os.path.join(TEST_DIR, 'S1_IW_SLC_DInSARStack_20190902_20190914.dim')
+s2_data = os.path.join(TEST_DIR, 'S2_1C_ndwi.dim')
+
+
+def assert_error(expected, actual):
+    return f'Error with extracted XML value. Expecting {expected}. Got {actual}.'
+
+
+def _elements(root):
+    return [(x.tag, x.attrib, x.text) for x in root.iter()]
+
+
+@pytest.mark.parametrize('path', [data2, s2_data])
+def test_compact_tree(path):
+
+    root = ET.parse(path).getroot()
+    expected = _elements(root)
+    actual = _elements(parse_compact(path))
+    assert actual == expected, 'Compact tree does not match the parsed ElementTree'
+
+    actual = _elements(from_element(root))
+    assert actual == expected, 'Converted tree does not match the parsed ElementTree'
+
+
+def test_compact_queries():
+
+    root = ET.parse(data2).getroot()
+    node = parse_compact(data2)
+    for path in ['.//MDElem[@name="Processing_Graph"]/*', ".//Image_Interpretation/Spectral_Band_Info[BAND_INDEX='2']",
+                 './Dataset_Sources/MDElem[@name="metadata"]/MDElem[@name="Abstracted_Metadata"]/MDATTR[1]']:
+        expected = [x for e in root.findall(path) for x in _elements(e)]
+        actual = [x for e in node.findall(path) for x in _elements(e)]
+        assert actual == expected, assert_error(expected, actual)
+
+    actual = node.find('.//DATASET_NAME').text
+    expected = '20190902_20190914_DInSARStack'
+    assert actual == expected, assert_error(expected, actual)
+
+
+@pytest.mark.parametrize('options', [{'compact': True}, {'keep_tree': False}, {'compact': True, 'keep_tree': False}])
+def test_sentinel1_options(options):
+
+    expected = Sentinel1(metadata=data2, product='SLC')
+    actual = Sentinel1(metadata=data2, product='SLC', **options)
+
+    assert actual.ProcessingGraph.get_processing_graph() == expected.ProcessingGraph.get_processing_graph()
+    assert actual.ImageInterpretation.get_band_info() == expected.ImageInterpretation.get_band_info()
+    assert actual.AbstractedMetadata.dataframe.equals(expected.AbstractedMetadata.dataframe)
+    assert actual.footprint.bounds == expected.footprint.bounds
+
+    actual_orbits = [x.orbit_state_vectors.times.tolist() for x in actual.SlaveMetadata]
+    expected_orbits = [x.orbit_state_vectors.times.tolist() for x in expected.SlaveMetadata]
+    assert actual_orbits == expected_orbits, assert_error(expected_orbits, actual_orbits)
+
+    actual_lines = actual.AbstractedMetadata.timing.line_to_time(100)
+    expected_lines = expected.AbstractedMetadata.timing.line_to_time(100)
+    assert actual_lines == expected_lines, assert_error(expected_lines, actual_lines)
+
+
+def test_release_tree():
+
+    dimap = Sentinel2(metadata=s2_data, product_type='1C', keep_tree=False)
+    assert dimap._metadata is None
+    assert dimap.ProcessingGraph._metadata is None
+
+    actual = dimap.ProcessingGraph.get_processing_graph(node_index=0, operator='operator')
+    expected = 'NdwiOp'
+    assert actual == expected, assert_error(expected, actual)
@@ -0,0 +1,58 @@
+import xml.etree.ElementTree as ET
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from PyBeamDimap.reader.utils import DIMAP_TIME_FORMAT, indent_xml, parse_date, parse_utc
+
+
+def assert_error(expected, actual):
+    return f'Error with extracted XML value. Expecting {expected}. Got {actual}.'
+
+
+def test_parse_utc_formats():
+
+    values = ['02-SEP-2019 07:57:47.909601', '01-oct-2019 00:00:00.000001', ' 29-Feb-2020 23:59:59.999999 ',
+              '2019-09-14T07:57:47.909601', '14-SEP-2019 07:57:47.9', None, '']
+    actual = parse_utc(values).astype(str).tolist()
+    expected = ['2019-09-02T07:57:47.909601', '2019-10-01T00:00:00.000001', '2020-02-29T23:59:59.999999',
+                '2019-09-14T07:57:47.909601', '2019-09-14T07:57:47.900000', 'NaT', 'NaT']
+    assert actual == expected, assert_error(expected, actual)
+
+
+def test_parse_utc_matches_strptime():
+
+    rng = np.random.default_rng(0)
+    seconds = rng.integers(0, 40 * 365 * 86400, 1000)
+    microseconds = rng.integers(0, 1000000, 1000)
+    times = [datetime(1990, 1, 1) + timedelta(seconds=int(x), microseconds=int(y)) for x, y in
+             zip(seconds, microseconds)]
+
+    actual = parse_utc([x.strftime(DIMAP_TIME_FORMAT).upper() for x in times])
+    expected = np.array(times, dtype='datetime64[us]')
+    assert np.array_equal(actual, expected), assert_error(expected, actual)
+
+
+@pytest.mark.parametrize('value', ['31-SEP-2019 07:57:47.909601', '02-XYZ-2019 07:57:47.909601',
+                                   '02-SEP-2019 24:00:00.000000'])
+def test_parse_utc_invalid(value):
+
+    with pytest.raises(ValueError):
+        parse_utc([value])
+
+
+def test_parse_date():
+
+    actual = parse_date(['02Sep2019', '2019-09-14', '29feb2020']).astype(str).tolist()
+    expected = ['2019-09-02', '2019-09-14', '2020-02-29']
+    assert actual == expected, assert_error(expected, actual)
+
+
+def test_indent_xml():
+
+    root = ET.fromstring('<a><b>x</b><c/><d>\n<e> </e></d></a>')
+    indent_xml(root, '  ')
+    actual = ET.tostring(root, encoding='unicode')
+    expected = '<a>\n  <b>x</b>\n  <c />\n  <d>\n    <e> </e>\n  </d>\n</a>'
+    assert actual == expected, assert_error(expected, actual)
@@ -0,0 +1,124 @@
+import os
+import xml.etree.ElementTree as ET
+
+import numpy as np
+import pytest
+
+from PyBeamDimap.missions import Sentinel1
+from PyBeamDimap.writer import DimapWriter
+
+TEST_DIR = os.path.abspath('tests')
+data1 = os.path.join(TEST_DIR, 'S1_IW_SLC_coherance.dim')
+
+
+def assert_error(expected, actual):
+    return f'Error with extracted XML value. Expecting {expected}. Got {actual}.'
+
+
+@pytest.fixture
+def dimap():
+    """
+    Load an instance of BEAM-DIMAP reader with coherence data
+    """
+    yield Sentinel1(metadata=data1, product='SLC')
+
+
+def test_write_derived_product(dimap, tmp_path):
+
+    path = tmp_path / 'derived.dim'
+    rng = np.random.default_rng(0)
+    coherence = rng.random((1125, 2522), dtype='float32')
+    with DimapWriter(path, dimap, operator='Threshold', parameters={'threshold': 0.5}) as writer:
+        writer.add_band('coh', unit='coherence')
+        writer.add_band('mask', 'uint8', description='Coherence above 0.5', no_data_value=255)
+        for y in range(0, 1125, 256):
+            writer.write_tile('coh', coherence[y:y + 256], 0, y)
+            for x in range(0, 2522, 1000):
+                writer.write_tile('mask', coherence[y:y + 256, x:x + 1000] > 0.5, x, y)
+
+    actual = np.fromfile(tmp_path / 'derived.data' / 'coh.img', dtype='>f4').reshape(1125, 2522)
+    assert np.array_equal(actual, coherence), 'Band data of coh differs'
+    actual = np.fromfile(tmp_path / 'derived.data' / 'mask.img', dtype='uint8').reshape(1125, 2522)
+    assert np.array_equal(actual, coherence > 0.5), 'Band data of mask differs'
+
+    with open(tmp_path / 'derived.data' / 'mask.hdr') as f:
+        header = f.read().splitlines()
+    actual = [x for x in header if x.split(' = ')[0] in ('samples', 'lines', 'data type', 'byte order', 'band names')]
+    expected = ['samples = 2522', 'lines = 1125', 'data type = 1', 'byte order = 1', 'band names = { mask }']
+    assert actual == expected, assert_error(expected, actual)
+
+    derived = Sentinel1(str(path), 'SLC')
+    actual = derived.ImageInterpretation.get_band_info(attribute='BAND_NAME')
+    expected = {'0': 'coh', '1': 'mask'}
+    assert actual == expected, assert_error(expected, actual)
+
+    actual = derived.ImageInterpretation.get_band_info(1, 'NO_DATA_VALUE')
+    expected = '255'
+    assert actual == expected, assert_error(expected, actual)
+
+    actual = (derived.dataset_name, derived.crs)
+    expected = ('derived', dimap.crs)
+    assert actual == expected, assert_error(expected, actual)
+
+    actual = derived.query('Abstracted_Metadata/PRODUCT').tolist()
+    expected = dimap.query('Abstracted_Metadata/PRODUCT').tolist()
+    assert actual == expected, assert_error(expected, actual)
+
+    nodes = derived.ProcessingGraph.get_processing_graph()
+    actual = (len(nodes), nodes[-1]['operator'], nodes[-1]['parameters'], nodes[-1]['sources'])
+    expected = (len(dimap.ProcessingGraph.get_processing_graph()) + 1, 'Threshold', {'threshold': '0.5'},
+                {'sourceProduct': f'file:{data1}'})
+    assert actual == expected, assert_error(expected, actual)
+
+
+def test_write_tie_point_geocoding(tmp_path):
+
+    # Source with a tie point geocoding as written by SNAP for products in radar geometry
+    tree = ET.parse(data1)
+    geoposition = tree.getroot().find('Geoposition')
+    for child in list(geoposition):
+        geoposition.remove(child)
+    ET.SubElement(geoposition, 'LATITUDE_BAND').text = 'latitude'
+    ET.SubElement(geoposition, 'LONGITUDE_BAND').text = 'longitude'
+    source_path = str(tmp_path / 'source.dim')
+    tree.write(source_path)
+
+    path = tmp_path / 'derived.dim'
+    with DimapWriter(path, Sentinel1(source_path, 'SLC')) as writer:
+        writer.add_band('coh')
+
+    # The tie point grids are not copied so the geocoding that refers to them is left out
+    root = ET.parse(path).getroot()
+    actual = [root.find(x) is None for x in ['Geoposition', 'Coordinate_Reference_System']]
+    expected = [True, True]
+    assert actual == expected, assert_error(expected, actual)
+
+
+def test_write_without_source(tmp_path):
+
+    path = tmp_path / 'new.dim'
+    with DimapWriter(path, width=4, height=3) as writer:
+        writer.add_band('band_1', 'int16')
+        writer.write_tile('band_1', [[1, 2], [3, 4]], 2, 1)
+
+    actual = np.fromfile(tmp_path / 'new.data' / 'band_1.img', dtype='>i2').reshape(3, 4).tolist()
+    expected = [[0, 0, 0, 0], [0, 0, 1, 2], [0, 0, 3, 4]]
+    assert actual == expected, assert_error(expected, actual)
+
+    root = ET.parse(path).getroot()
+    actual = (root.findtext('Raster_Dimensions/NBANDS'),
+              root.findtext('Image_Interpretation/Spectral_Band_Info/DATA_TYPE'),
+              root.find('Data_Access/Data_File/DATA_FILE_PATH').get('href'))
+    expected = ('1', 'int16', 'new.data/band_1.hdr')
+    assert actual == expected, assert_error(expected, actual)
+
+
+def test_write_invalid_tile(tmp_path):
+
+    writer = DimapWriter(tmp_path / 'new.dim', width=4, height=3)
+    band = writer.add_band('band_1')
+    with pytest.raises(ValueError):
+        band.write_tile(np.zeros((2, 2)), 3, 0)
+    with pytest.raises(ValueError):
+        writer.add_band('band_2', 'complex64')
+    writer.close()